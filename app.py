@@ -1,9 +1,42 @@
-from dash import Dash, dcc, html, Input, Output, State
-import dash_bootstrap_components as dbc
-import plotly.express as px
+import sys
+import time
+
+# Schneller Start (Section 20): Zeitpunkte der Importphasen fürs Startprofil
+startup_marks = [('start', time.perf_counter())]
+
+from flask import jsonify, request, send_file
+from werkzeug.http import is_resource_modified
+import plotly.io as pio
 import pandas as pd
+import numpy as np
+
+from dash import Dash, dcc, html, Input, Output, State, ClientsideFunction, Patch, ctx, no_update
+from dash.exceptions import PreventUpdate
+from dash.fingerprint import check_fingerprint
+import dash_bootstrap_components as dbc
+import base64
+import contextvars
+import copy
+import functools
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import metrics
+
+
+def startup_mark(phase):
+    startup_marks.append((phase, time.perf_counter()))
+
+
+startup_mark('imports')
 
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP, '/assets/custom.css'])
+server = app.server  # WSGI-Einstiegspunkt für gunicorn (siehe gunicorn.conf.py)
 
 """
 -----------------------------------------------------------------------------------------
@@ -11,9 +44,382 @@ Section 1:
 Data Import and Preparation
 """
 
+# Clientside-Modus: Slider-Filterung der Grafiken läuft im Browser (siehe Section 6)
+CLIENTSIDE_FILTERING = os.environ.get('DASHBOARD_CLIENTSIDE_FILTERING', '0') == '1'
+
 # Data Import and Preparation
-data_path = 'assets/Zufriedenheit_raw.csv'
-df = pd.read_csv(data_path, sep=';', encoding='utf-8')
+data_path = os.environ.get('DASHBOARD_DATA_PATH', 'assets/Zufriedenheit_raw.csv')
+cache_dir = os.environ.get('DASHBOARD_CACHE_DIR', '.cache')
+DATA_CACHE = os.environ.get('DASHBOARD_DATA_CACHE', '1') == '1'
+
+# Neue Erhebungsjahre ohne Neustart nachladen (Section 15): Prüfintervall der Datendatei in
+# Sekunden (0 = aus) und Token für den Admin-Endpunkt POST /admin/reload (leer = aus)
+RELOAD_INTERVAL = float(os.environ.get('DASHBOARD_RELOAD_INTERVAL', '0'))
+ADMIN_TOKEN = os.environ.get('DASHBOARD_ADMIN_TOKEN')
+RELOAD = RELOAD_INTERVAL > 0 or bool(ADMIN_TOKEN)
+
+# Antworten ab dieser Grösse (Bytes) werden komprimiert, brotli falls installiert, sonst gzip
+# (Section 17; 0 = aus, z.B. wenn ein Reverse-Proxy bereits komprimiert)
+COMPRESS_MIN_SIZE = int(os.environ.get('DASHBOARD_COMPRESS_MIN_SIZE', '1024'))
+
+# Rechenintensive Figuren (Graph 2) in so vielen Hilfsprozessen pro Worker aufbauen, damit sie
+# die Threads für schnelle Callbacks nicht über den GIL blockieren (Section 5; 0 = im Thread)
+BUILD_PROCESSES = int(os.environ.get('DASHBOARD_BUILD_PROCESSES', '0'))
+# Antwortet ein Hilfsprozess nicht innerhalb so vieler Sekunden, baut der Worker die Figur selbst
+BUILD_TIMEOUT = float(os.environ.get('DASHBOARD_BUILD_TIMEOUT', '300'))
+
+# Startbudget in Sekunden: ist es gesetzt, wird nach dem Import ein Startprofil ausgegeben
+# (Section 20; 0 = aus)
+STARTUP_BUDGET = float(os.environ.get('DASHBOARD_STARTUP_BUDGET', '0'))
+
+# Gültigkeit der Antworten der Aggregat-API (Section 19) in Browser- und CDN-Caches, Sekunden
+API_MAX_AGE = int(os.environ.get('DASHBOARD_API_MAX_AGE', '300'))
+
+# Gemeinsamer Ergebnis-Cache aller Worker, übersteht Neustarts (Section 5, result_store.py):
+# sqlite:///.cache/results.sqlite3 oder redis://host:6379/0 (leer = nur der Cache im Prozess),
+# Ablaufzeit der Einträge in Sekunden und Grösse der SQLite-Datei in MB
+RESULT_STORE = os.environ.get('DASHBOARD_RESULT_STORE', '')
+RESULT_TTL = int(os.environ.get('DASHBOARD_RESULT_TTL', '86400'))
+RESULT_MAX_MB = float(os.environ.get('DASHBOARD_RESULT_MAX_MB', '256'))
+
+# Hintergrund-Jobs (Section 5/6): Graph 2 ab so vielen Datenpunkten (Zeilen im Jahresbereich mal
+# gewählte Teilbereiche) ausserhalb des Requests in so vielen Threads pro Worker berechnen, der
+# Browser zeigt den Fortschritt an (0 = immer direkt im Request)
+BACKGROUND_POINTS = int(os.environ.get('DASHBOARD_BACKGROUND_POINTS', '20000'))
+BACKGROUND_THREADS = int(os.environ.get('DASHBOARD_BACKGROUND_THREADS', '2'))
+
+# Level of Detail (Section 7): Linien mit mehr Punkten werden auf etwa so viele Punkte verdichtet
+# wie die Grafik Pixel breit ist (lttb oder minmax; 0 = aus), Traces ab WEBGL_THRESHOLD Punkten
+# mit WebGL (scattergl) statt SVG gezeichnet (0 = nie)
+LOD_POINTS = int(os.environ.get('DASHBOARD_LOD_POINTS', '800'))
+LOD_METHOD = os.environ.get('DASHBOARD_LOD_METHOD', 'lttb')
+WEBGL_THRESHOLD = int(os.environ.get('DASHBOARD_WEBGL_THRESHOLD', '2000'))
+
+# Mikrodaten-Modus: Befragtendaten werden blockweise zu Mittelwerten aggregiert (ingest.py)
+# und das Ergebnis anstelle von Zufriedenheit_raw.csv geladen (parallel auf allen Kernen,
+# sofern DASHBOARD_INGEST_WORKERS nichts anderes vorgibt)
+microdata_path = os.environ.get('DASHBOARD_MICRODATA_PATH')
+if microdata_path:
+    import ingest
+    data_path = ingest.ensure_aggregates(microdata_path, os.path.join(cache_dir, 'microdata'),
+                                         weight=os.environ.get('DASHBOARD_MICRODATA_WEIGHT'),
+                                         workers=int(os.environ.get('DASHBOARD_INGEST_WORKERS', os.cpu_count())))
+
+CATEGORY_COLUMNS = ['Alterskategorie', 'Geschlecht']
+
+
+def read_source(path):
+    # CSV (';' getrennt, '#NA' = fehlend) oder die bereinigte Excel-Tabelle (Blatt 'Cleaned')
+    if path.endswith('.xlsx'):
+        frame = pd.read_excel(path, sheet_name='Cleaned')
+    else:
+        frame = pd.read_csv(path, sep=';', encoding='utf-8-sig', na_values=['#NA'])
+    frame.columns = frame.columns.str.strip()
+    value_columns = frame.columns.drop(['Jahr'] + CATEGORY_COLUMNS)
+    frame[value_columns] = frame[value_columns].astype('float64')
+    frame['Jahr'] = frame['Jahr'].astype('int16')
+    for col in CATEGORY_COLUMNS:
+        frame[col] = pd.Categorical(frame[col].astype('string').to_numpy(dtype=object, na_value=None))
+    return frame
+
+
+# Spaltenweiser Cache: Beim ersten Start wird die Quelldatei typisiert (int16, float64,
+# Kategorien als int8-Codes), bereits in Würfel-Reihenfolge sortiert und pro Spalte als .npy
+# abgelegt. Spätere Starts und alle Worker laden die Spalten per Memory-Mapping: die Daten
+# liegen nur einmal im Page-Cache des Betriebssystems, egal wie viele Worker laufen.
+def load_dataset(path, directory=cache_dir):
+    stat = os.stat(path)
+    source = {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    target = os.path.join(directory, os.path.splitext(os.path.basename(path))[0])
+
+    meta = read_meta(target)
+    if meta is None or meta['source'] != source or meta.get('sorted_by') != SORT_COLUMNS:
+        meta = write_columns(sort_for_cube(read_source(path)), target,
+                             {'source': source, 'sorted_by': SORT_COLUMNS})
+
+    frame = attach_columns(target, meta)
+    frame.attrs['sorted_by'] = meta['sorted_by']
+    return frame
+
+
+def read_meta(target):
+    meta_path = os.path.join(target, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_columns(frame, target, meta):
+    # Jede Datei wird erst unter temporärem Namen geschrieben und dann atomar ersetzt, damit
+    # parallel startende Worker nie eine halb geschriebene Spalte einblenden. Bereits
+    # gemappte Dateien anderer Prozesse bleiben dabei gültig (alter Inode).
+    os.makedirs(target, exist_ok=True)
+    categories = {}
+    for col in frame.columns:
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories[col] = values.cat.categories.tolist()
+            values = values.cat.codes.astype('int8')
+        tmp_path = os.path.join(target, f'{col}.{os.getpid()}.tmp.npy')
+        np.save(tmp_path, np.asarray(values))
+        os.replace(tmp_path, os.path.join(target, col + '.npy'))
+
+    meta = dict(meta, columns=frame.columns.tolist(), categories=categories)
+    # meta.json zuletzt schreiben, damit ein abgebrochener Export nicht als gültig gilt
+    tmp_path = os.path.join(target, f'meta.{os.getpid()}.tmp.json')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(target, 'meta.json'))
+    return meta
+
+
+def attach_columns(target, meta):
+    # Read-only Memory-Mapping, pandas übernimmt die Arrays ohne Kopie
+    columns = {}
+    for col in meta['columns']:
+        values = np.load(os.path.join(target, col + '.npy'), mmap_mode='r')
+        if col in meta['categories']:
+            values = pd.Categorical.from_codes(values, meta['categories'][col])
+        columns[col] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+SORT_COLUMNS = ['Geschlecht', 'Alterskategorie', 'Jahr']
+
+
+def sort_for_cube(data):
+    return data.sort_values(SORT_COLUMNS, kind='stable').reset_index(drop=True)
+
+
+df = load_dataset(data_path) if DATA_CACHE else read_source(data_path)
+
+
+# Datenwürfel: Die Zeilen werden einmalig nach (Geschlecht, Alterskategorie, Jahr) sortiert.
+# Jede Gruppe belegt so einen zusammenhängenden Block, und ein Jahresbereich innerhalb einer
+# Gruppe ist ein Slice, der per Binärsuche gefunden wird (statt Masken über den ganzen df).
+# Kommt der df bereits sortiert aus dem Spalten-Cache, wird er ohne Kopie übernommen.
+class DataCube:
+    def __init__(self, data):
+        presorted = data.attrs.get('sorted_by') == SORT_COLUMNS
+        self.frame = data if presorted else sort_for_cube(data)
+        self.groups = {}
+        grouped = self.frame.groupby(['Geschlecht', 'Alterskategorie'], dropna=False, sort=False)
+        for key, positions in grouped.indices.items():
+            key = tuple(None if pd.isna(k) else k for k in key)
+            start, stop = positions[0], positions[-1] + 1
+            self.groups[key] = (start, self.frame['Jahr'].to_numpy()[start:stop])
+
+    def age_keys(self):
+        # Gruppen ohne Geschlecht ('#NA'), eine pro Alterskategorie
+        return [key for key in self.groups if key[0] is None and key[1] is not None]
+
+    def slice(self, key, min_year, max_year):
+        start, years = self.groups[key]
+        lo = start + np.searchsorted(years, min_year, side='left')
+        hi = start + np.searchsorted(years, max_year, side='right')
+        return lo, hi
+
+    def select(self, keys, min_year, max_year):
+        bounds = [self.slice(key, min_year, max_year) for key in keys if key in self.groups]
+        if len(bounds) == 1:
+            lo, hi = bounds[0]
+            return self.frame.iloc[lo:hi]
+        positions = np.concatenate([np.arange(lo, hi) for lo, hi in bounds]) if bounds else []
+        return self.frame.iloc[positions]
+
+
+# Histogramm-Index (Graph 4): feste Bin-Grenzen pro Teilbereich (über alle Jahre) und pro Gruppe
+# kumulierte Bin-Zählungen über die Jahre. Ein Jahresbereich kostet damit nur die Differenz
+# zweier Zeilen (cumulative[hi] - cumulative[lo]), unabhängig von der Anzahl Befragter.
+class HistogramBins:
+    def __init__(self, cube, keys, variables):
+        self.keys = list(keys)
+        self.years = np.unique(cube.frame['Jahr'].to_numpy())
+        self.edges, self.cumulative, self.year_min, self.year_max = {}, {}, {}, {}
+        rows = self._rows(cube, self.years)
+        for var in variables:
+            self._build(var, rows)
+
+    def _rows(self, cube, years):
+        rows = {}
+        for key in self.keys:
+            group = cube.select([key], years.min(), years.max())
+            rows[key] = group[np.isin(group['Jahr'].to_numpy(), years)]
+        return rows
+
+    def _edges(self, var, rows):
+        values = np.concatenate([rows[key][var].to_numpy(dtype=float) for key in self.keys])
+        return np.histogram_bin_edges(values[~np.isnan(values)], bins='auto')
+
+    def _build(self, var, rows):
+        edges = self.edges[var] = self._edges(var, rows)
+        self.year_min[var] = np.full(len(self.years), np.nan)
+        self.year_max[var] = np.full(len(self.years), np.nan)
+        for key in self.keys:
+            counts = np.zeros((len(self.years) + 1, len(edges) - 1), dtype=np.int64)
+            self._add(var, rows[key], counts)
+            self.cumulative[var, key] = np.cumsum(counts, axis=0)
+
+    def _add(self, var, rows, counts):
+        # Zeilen in counts (eine Zeile pro Jahr, versetzt um 1 für die Kumulierung) einsortieren
+        edges = self.edges[var]
+        values = rows[var].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        values = values[valid]
+        year_idx = np.searchsorted(self.years, rows['Jahr'].to_numpy()[valid])
+        # Rechter Rand gehört wie bei np.histogram zum letzten Bin
+        bin_idx = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+        np.add.at(counts, (year_idx + 1, bin_idx), 1)
+        np.fmin.at(self.year_min[var], year_idx, values)
+        np.fmax.at(self.year_max[var], year_idx, values)
+
+    def extend(self, cube, years):
+        # Neue Jahre nachtragen: Die Bin-Grenzen werden wie bei einem Neustart aus allen Jahren
+        # bestimmt (alle Worker teilen gleich ein, auch neu gestartete). Bleiben sie gleich,
+        # ergeben sich die Zählungen pro Jahr aus den Differenzen der kumulierten Werte und nur
+        # die Zeilen der neuen Jahre werden eingeteilt; sonst wird der Teilbereich neu eingeteilt
+        # (reload_data verwirft dann alle seine Figuren). Das bestehende Objekt bleibt unverändert
+        # (laufende Requests).
+        extended = copy.copy(self)
+        extended.years = np.union1d(self.years, years)
+        extended.edges, extended.cumulative, extended.year_min, extended.year_max = {}, {}, {}, {}
+        old = np.searchsorted(extended.years, self.years)
+        all_rows, rows = extended._rows(cube, extended.years), extended._rows(cube, years)
+        for var, edges in self.edges.items():
+            if not np.array_equal(extended._edges(var, all_rows), edges):
+                extended._build(var, all_rows)
+                continue
+            extended.edges[var] = edges
+            extended.year_min[var] = np.full(len(extended.years), np.nan)
+            extended.year_max[var] = np.full(len(extended.years), np.nan)
+            extended.year_min[var][old] = self.year_min[var]
+            extended.year_max[var][old] = self.year_max[var]
+            for key in self.keys:
+                counts = np.zeros((len(extended.years) + 1, len(edges) - 1), dtype=np.int64)
+                counts[old + 1] = np.diff(self.cumulative[var, key], axis=0)
+                extended._add(var, rows[key], counts)
+                extended.cumulative[var, key] = np.cumsum(counts, axis=0)
+        return extended
+
+    def year_bounds(self, min_year, max_year):
+        return (np.searchsorted(self.years, min_year, side='left'),
+                np.searchsorted(self.years, max_year, side='right'))
+
+    def counts(self, var, key, min_year, max_year):
+        lo, hi = self.year_bounds(min_year, max_year)
+        cumulative = self.cumulative[var, key]
+        return cumulative[hi] - cumulative[lo]
+
+    def value_range(self, var, min_year, max_year):
+        lo, hi = self.year_bounds(min_year, max_year)
+        return np.nanmin(self.year_min[var][lo:hi]), np.nanmax(self.year_max[var][lo:hi])
+
+
+# Präfixsummen (Graph 6): pro Gruppe kumulierte Summen und Anzahlen (bzw. Gewichtssummen) jedes
+# Teilbereichs über die Jahre. Der Mittelwert eines Jahresbereichs ist damit
+# (S[hi] - S[lo]) / (N[hi] - N[lo]), ohne groupby über die gefilterten Zeilen. Damit die Differenz
+# zweier Präfixsummen exakt ist, werden Werte mit wenigen Nachkommastellen als ganzzahlige
+# Vielfache summiert (8.484 -> 8484 bei scale 1000); die Division ergibt dann den korrekt
+# gerundeten Mittelwert, für ein einzelnes Jahr genau den Quellwert. Gewichtete Mittel und Werte
+# mit mehr Nachkommastellen werden als Float summiert (scale None).
+def decimal_scale(values, max_digits=6):
+    # Kleinste Zehnerpotenz, mit der alle Werte ganzzahlig werden; die Summe muss exakt als
+    # Float darstellbar bleiben (auch für die Division im Browser, clientside.js)
+    values = values[~np.isnan(values)]
+    for digits in range(max_digits + 1):
+        scaled = values * 10 ** digits
+        if np.all(np.abs(scaled - np.round(scaled)) < 1e-6):
+            return 10 ** digits if np.abs(scaled).sum() < 2 ** 53 else None
+    return None
+
+
+class PrefixMeans:
+    def __init__(self, cube, keys, variables, weights=None):
+        self.years = np.array([], dtype=cube.frame['Jahr'].dtype)
+        self.variables = list(variables)
+        self.weights = weights
+        self.scale = self._scale(cube)
+        dtype = float if self.scale is None else np.int64
+        self.sums = {key: np.zeros((1, len(self.variables)), dtype=dtype) for key in keys}
+        self.counts = {key: np.zeros((1, len(self.variables))) for key in keys}
+        self._add_years(cube, np.unique(cube.frame['Jahr'].to_numpy()))
+
+    def _scale(self, cube):
+        if self.weights is not None:
+            return None
+        return decimal_scale(cube.frame[self.variables].to_numpy(dtype=float))
+
+    def extend(self, cube, years):
+        # Neue Jahre nachtragen, ohne die bestehenden Jahre neu zu summieren. Brauchen die neuen
+        # Werte mehr Nachkommastellen, wird wie bei einem Neustart alles neu summiert.
+        if self._scale(cube) != self.scale:
+            return PrefixMeans(cube, list(self.sums), self.variables, self.weights)
+        extended = copy.copy(self)
+        extended._add_years(cube, years)
+        return extended
+
+    def _add_years(self, cube, years):
+        merged = np.union1d(self.years, years)
+        old = np.searchsorted(merged, self.years) + 1
+        sums_by_key, counts_by_key = {}, {}
+
+        for key in self.sums:
+            rows = cube.select([key], years.min(), years.max())
+            rows = rows[np.isin(rows['Jahr'].to_numpy(), years)]
+            values = rows[self.variables].to_numpy(dtype=float)
+            weight = np.ones(len(rows)) if self.weights is None else rows[self.weights].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            year_idx = np.searchsorted(merged, rows['Jahr'].to_numpy()) + 1
+            if self.scale is None:
+                contributions = np.where(valid, values * weight[:, None], 0)
+            else:
+                contributions = np.round(np.where(valid, values, 0) * self.scale).astype(np.int64)
+
+            # Bisherige Jahre aus den Differenzen der Präfixsummen übernehmen
+            sums = np.zeros((len(merged) + 1, len(self.variables)), dtype=self.sums[key].dtype)
+            counts = np.zeros((len(merged) + 1, len(self.variables)))
+            sums[old] = np.diff(self.sums[key], axis=0)
+            counts[old] = np.diff(self.counts[key], axis=0)
+            np.add.at(sums, year_idx, contributions)
+            np.add.at(counts, year_idx, np.where(valid, weight[:, None], 0))
+            sums_by_key[key] = np.cumsum(sums, axis=0)
+            counts_by_key[key] = np.cumsum(counts, axis=0)
+
+        self.years, self.sums, self.counts = merged, sums_by_key, counts_by_key
+
+    def means(self, var, keys, min_year, max_year):
+        lo = np.searchsorted(self.years, min_year, side='left')
+        hi = np.searchsorted(self.years, max_year, side='right')
+        col = self.variables.index(var)
+        sums = np.array([self.sums[key][hi, col] - self.sums[key][lo, col] for key in keys])
+        counts = np.array([self.counts[key][hi, col] - self.counts[key][lo, col] for key in keys])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / (counts * (self.scale or 1))
+
+
+cube = DataCube(df)
+TOTAL_KEYS = [('Alle', None)]                  # Tab 1: Gesamtbevölkerung
+SEX_KEYS = [('Frauen', None), ('Männer', None)]  # Tab 2: nach Geschlecht
+AGE_KEYS = cube.age_keys()                      # Tab 3: nach Alterskategorie
+
+histogram_bins = HistogramBins(cube, SEX_KEYS, df.columns[3:])
+age_means = PrefixMeans(cube, AGE_KEYS, df.columns[3:])
+
+
+def control_props():
+    # Slider-Grenzen und -Marken sowie Dropdown-Optionen: einmal pro Datenstand berechnet und
+    # von allen drei Slidern, dem Layout und refresh_controls (Section 15) verwendet
+    years = [int(year) for year in np.unique(df['Jahr'].to_numpy())]
+    return {'min': years[0],
+            'max': years[-1],
+            'marks': {str(year): str(year) for year in years},
+            'options_2': [{'label': col, 'value': col} for col in df.columns[4:]],
+            'options': [{'label': col, 'value': col} for col in df.columns[3:]]}
+
+
+controls = control_props()
+startup_mark('data')
 
 """
 -----------------------------------------------------------------------------------------
@@ -66,6 +472,26 @@ app.layout = html.Div([
                 " Erstellt am: 31.05.2024 durch Nyffeler Tamara, Pellegatta Serge, Reiser Sharon im Auftrag der FHGR")
     ]),
 
+    # Vorberechnete Datenreihen pro Tab (nur im Clientside-Modus befüllt):
+    dcc.Store(id='series_total'),
+    dcc.Store(id='series_sex'),
+    dcc.Store(id='series_age'),
+    dcc.Store(id='histogram_bins'),
+    dcc.Store(id='prefix_means'),
+    dcc.Store(id='selection_2'),
+
+    # Hintergrund-Job für Graph 2 (Section 6): laufender Job und Abfrage seines Fortschritts
+    dcc.Store(id='job_2'),
+    dcc.Interval(id='poll_2', interval=500, disabled=True),
+
+    # Lazy Tabs: wird beim ersten Öffnen von tab_2/tab_3 gesetzt und löst erst dann deren Grafiken aus
+    dcc.Store(id='rendered_tab_2'),
+    dcc.Store(id='rendered_tab_3'),
+
+    # Nachladen (Section 15): offene Seiten fragen periodisch nach neuen Erhebungsjahren
+    dcc.Store(id='data_version'),
+    dcc.Interval(id='reload_interval', interval=(RELOAD_INTERVAL or 60) * 1000, disabled=not RELOAD),
+
     # Header:
     html.Div([
     html.H1("Dashboard zur Exploration der Zufriedenheit in der Schweiz"),
@@ -91,11 +517,11 @@ app.layout = html.Div([
                             html.P("Auswahl der Analyse-Jahre:"),
                             dcc.RangeSlider(
                                 id='slider_1',
-                                min=df['Jahr'].min(),
-                                max=df['Jahr'].max(),
+                                min=controls['min'],
+                                max=controls['max'],
                                 step=1,
-                                marks={str(year): str(year) for year in df['Jahr'].unique()},
-                                value=[df['Jahr'].min(), df['Jahr'].max()])
+                                marks=controls['marks'],
+                                value=[controls['min'], controls['max']])
                         ], className='container_1',
                     )
                 ], className="two columns"),
@@ -113,10 +539,12 @@ app.layout = html.Div([
                                 " höher ist auch die allgemeine Zufriedenheit.",
                                 target='hover-button_2'),
                             dcc.Graph(id='graph_2', style={'height': '250px'}),
+                            dbc.Progress(id='progress_2', value=0, striped=True, animated=True,
+                                         style={'display': 'none'}),
                             html.P("Bitte wählen Sie die gewünschten Teilbereiche aus:"),
                             dcc.Dropdown(
                                 id='dropdown_2',
-                                options=[{'label': col, 'value': col} for col in df.columns[4:]],
+                                options=controls['options_2'],
                                 value=None,
                                 multi=True,
                                 className='dark-dropdown-menu')
@@ -144,11 +572,11 @@ app.layout = html.Div([
                             html.P("Auswahl der Analyse-Jahre:"),
                             dcc.RangeSlider(
                                 id='slider_3',
-                                min=df['Jahr'].min(),
-                                max=df['Jahr'].max(),
+                                min=controls['min'],
+                                max=controls['max'],
                                 step=1,
-                                marks={str(year): str(year) for year in df['Jahr'].unique()},
-                                value=[df['Jahr'].min(), df['Jahr'].max()]),
+                                marks=controls['marks'],
+                                value=[controls['min'], controls['max']]),
                         ], className='container_3',
                     )
                 ], className="two columns"),
@@ -167,7 +595,7 @@ app.layout = html.Div([
                             html.P("Bitte wählen Sie einen Teilbereich aus:"),
                             dcc.Dropdown(
                                 id='dropdown_4',
-                                options=[{'label': col, 'value': col} for col in df.columns[3:]],
+                                options=controls['options'],
                                 value='Allgemein',
                                 multi=False,
                                 className='dark-dropdown-menu')
@@ -195,11 +623,11 @@ app.layout = html.Div([
                             html.P("Auswahl der Analyse-Jahre:"),
                             dcc.RangeSlider(
                                 id='slider_5',
-                                min=df['Jahr'].min(),
-                                max=df['Jahr'].max(),
+                                min=controls['min'],
+                                max=controls['max'],
                                 step=1,
-                                marks={str(year): str(year) for year in df['Jahr'].unique()},
-                                value=[df['Jahr'].min(), df['Jahr'].max()])
+                                marks=controls['marks'],
+                                value=[controls['min'], controls['max']])
                         ], className='container_5',
                     )
                 ], className="two columns"),
@@ -218,7 +646,7 @@ app.layout = html.Div([
                             html.P("Bitte wählen Sie einen Teilbereich aus:"),
                             dcc.Dropdown(
                                 id='dropdown_6',
-                                options=[{'label': col, 'value': col} for col in df.columns[3:]],
+                                options=controls['options'],
                                 value='Allgemein',
                                 multi=False,
                                 className='dark-dropdown-menu')
@@ -230,14 +658,16 @@ app.layout = html.Div([
     ])
 ], id='page_content', className='container')
 
-
+startup_mark('layout')
 
 """
 -----------------------------------------------------------------------------------------
 Section 3:
 Select Theme Mode
 """
-@app.callback(
+# Läuft im Browser (assets/clientside.js), damit der Theme-Wechsel keinen Server-Request auslöst
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='update_theme'),
     [Output('page_content', 'style'),
      Output('dropdown_2', 'className'),
      Output('dropdown_4', 'className'),
@@ -248,17 +678,6 @@ Select Theme Mode
      Output('tab_3', 'className')],
     [Input('theme_dropdown', 'value')]
 )
-def update_theme(selected_theme):
-    if selected_theme == 'dark':
-        page_style = {'backgroundColor': '#282E3B', 'color': 'white', 'padding': '20px'}
-        dropdown_class = 'dark-dropdown-menu'
-        tab_class = 'dark-tab'
-    else:
-        page_style = {'backgroundColor': '#EEEEEE', 'color': 'black', 'padding': '20px'}
-        dropdown_class = 'light-dropdown-menu'
-        tab_class = 'light-tab'
-
-    return page_style, dropdown_class, dropdown_class, dropdown_class, dropdown_class, tab_class, tab_class, tab_class
 
 """
 -----------------------------------------------------------------------------------------
@@ -266,410 +685,1734 @@ Section 4:
 Kontext Info Box
 """
 
-@app.callback(
+# Läuft im Browser (assets/clientside.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='toggle_text_box'),
     Output('text_box', 'style'),
     Input('text_button', 'n_clicks'),
     State('text_box', 'style')
 )
-def toggle_text_box(n_clicks, current_style):
-    if n_clicks is None:
-        return {'display': 'none'}
 
-    if current_style['display'] == 'none':
-        return {'display': 'block'}
+
+"""
+-----------------------------------------------------------------------------------------
+Section 5:
+Figure Cache (LRU)
+"""
+# Die Grafik-Callbacks hängen nur von Slider- und Dropdown-Werten ab. Bereits berechnete
+# Figuren werden deshalb prozessweit als serialisiertes Dict zwischengespeichert. Sie gelten für
+# den geladenen Datenstand: ohne Nachladen (Section 15) ändert er sich bis zum Neustart nicht,
+# mit Nachladen verwirft reload_data gezielt die betroffenen Einträge.
+class FigureCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+            self.hits = 0
+            self.misses = 0
+
+    def invalidate(self, years=None, stale=None):
+        # Nur Figuren verwerfen, deren Jahresbereich eines der geänderten Jahre enthält
+        # (years=None: alle), und unabhängig vom Jahresbereich die, für die stale(Funktionsname,
+        # Argumente) zutrifft. Einträge ohne erkennbaren Jahresbereich gelten als betroffen.
+        with self.lock:
+            self.generation += 1
+            if years is None:
+                self.entries.clear()
+                return
+            for key in list(self.entries):
+                year_range = _year_range(key[1])
+                if (year_range is None or any(year_range[0] <= year <= year_range[1] for year in years)
+                        or (stale is not None and stale(*key))):
+                    del self.entries[key]
+
+    def peek(self, name, args):
+        # Fertige Figur aus diesem Cache oder dem gemeinsamen Ergebnis-Cache, ohne zu rechnen
+        with self.lock:
+            fig = self.entries.get((name, _freeze(args)))
+        if fig is None and shared_store is not None:
+            try:
+                value = shared_store.get(result_key(name, args))
+            except Exception:
+                value = None
+            fig = None if value is None else json.loads(value)
+        return fig
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self.entries),
+                    'maxsize': self.maxsize,
+                    'hit_rate': self.hits / total if total else 0.0}
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = (func.__name__, _freeze(args))
+            with self.lock:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key]
+                self.misses += 1
+                generation = self.generation
+
+            with metrics.stage('build'):
+                fig = shared_result(func.__name__, args, lambda: func(*args))
+
+            with self.lock:
+                # Während der Berechnung nachgeladene Daten: Figur nicht mehr zwischenspeichern
+                if generation != self.generation:
+                    return fig
+                self.entries[key] = fig
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+            return fig
+
+        return wrapper
+
+
+def _freeze(value):
+    # Listen (RangeSlider, Mehrfach-Dropdown) in hashbare Tupel umwandeln
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _year_range(args):
+    # Der RangeSlider-Wert ist das einzige Argument aus zwei ganzen Zahlen
+    for arg in args:
+        if isinstance(arg, tuple) and len(arg) == 2 and all(isinstance(v, (int, np.integer)) for v in arg):
+            return arg
+    return None
+
+
+figure_cache = FigureCache(maxsize=256)
+
+# Hinter dem Cache im Prozess: gemeinsamer Ergebnis-Cache aller Worker (DASHBOARD_RESULT_STORE).
+# Der Schlüssel enthält den Datenstand, Einträge früherer Datenstände laufen ab bzw. werden
+# verdrängt. prewarm_cache.py füllt ihn beim Deploy.
+shared_store = shared_stats = None
+if RESULT_STORE:
+    import result_store
+    shared_store = result_store.connect(RESULT_STORE, max_bytes=int(RESULT_MAX_MB * 2 ** 20))
+    shared_stats = result_store.Stats()
+
+
+def result_key(name, args, version=None):
+    return f"{name}:{version or data_version}:{json.dumps(args, default=lambda value: value.item())}"
+
+
+def encode_result(value):
+    # Figuren (dicts mit NumPy-Werten) als JSON für den gemeinsamen Cache und die Job-Ergebnisse
+    return pio.json.to_json_plotly(value).encode()
+
+
+def shared_result(name, args, compute, version=None, encode=encode_result, decode=json.loads):
+    if shared_store is None:
+        return compute()
+    return result_store.cached(shared_store, result_key(name, args, version), compute, RESULT_TTL, shared_stats,
+                               encode=encode, decode=decode)
+
+# Auslagern in Hilfsprozesse: Die Prozesse entstehen per fork und erben Datensatz und Aggregate.
+# Gestartet wird der Pool nur explizit (gunicorn: post_fork, bevor der Worker seine Threads
+# anlegt; sonst __main__). Aufrufe beim Import, z.B. im gunicorn-Master, bauen im Prozess selbst.
+OFFLOADED = {}
+build_pool = None
+build_pool_lock = threading.Lock()
+
+
+def start_build_pool():
+    global build_pool
+    if build_pool is None and BUILD_PROCESSES > 0:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        build_pool = ProcessPoolExecutor(BUILD_PROCESSES, mp_context=multiprocessing.get_context('fork'),
+                                         initializer=forget_build_pool)
+        # Mit fork legt der erste Auftrag alle Prozesse auf einmal an
+        build_pool.submit(int).result()
+
+
+def retire_build_pool(pool, reason):
+    # Ein Hilfsprozess ist gestorben (z.B. OOM-Killer) oder hängt: Pool aufgeben, der Worker baut
+    # ab jetzt im Thread. Kein neuer fork zur Laufzeit: andere Threads des Workers können gerade
+    # reload_lock, figure_cache.lock oder job_lock halten, der neue Prozess erbte sie gesperrt.
+    global build_pool
+    with build_pool_lock:
+        if build_pool is not pool:
+            return
+        build_pool = None
+    server.logger.warning('%s, Figuren werden ab jetzt im Worker gebaut', reason)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def forget_build_pool():
+    # Der Hilfsprozess erbt das Pool-Objekt des Workers, baut selbst aber immer direkt
+    global build_pool
+    build_pool = None
+
+
+def build_offloaded(name, args, version, job):
+    # Läuft im Hilfsprozess. Hat der Worker seit dem fork neue Daten geladen (Section 15),
+    # zieht der Hilfsprozess vor dem Aufbau nach. job: Fortschritt und Abbruch wie im Worker.
+    if version != data_version:
+        reload_data()
+    token = current_job.set(job)
+    try:
+        return OFFLOADED[name](*args)
+    finally:
+        current_job.reset(token)
+
+
+def offload(func):
+    OFFLOADED[func.__name__] = func
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        # Ohne (funktionierenden) Pool im Thread bauen
+        pool = build_pool
+        if pool is not None:
+            from concurrent.futures import TimeoutError
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                future = pool.submit(build_offloaded, func.__name__, args, data_version, current_job.get())
+                return future.result(timeout=BUILD_TIMEOUT)
+            except BrokenProcessPool:
+                retire_build_pool(pool, 'Hilfsprozess für den Figurenaufbau beendet')
+            except TimeoutError:
+                retire_build_pool(pool, f'Hilfsprozess antwortet nicht innerhalb von {BUILD_TIMEOUT:g} s')
+        return func(*args)
+
+    return wrapper
+
+
+# Hintergrund-Jobs: Teure Figuren entstehen in einem Thread des Workers (mit offload im
+# Hilfsprozess), der Browser fragt den Fortschritt ab (Section 6). Status, Fortschritt und
+# Ergebnis liegen im gemeinsamen Ergebnis-Cache bzw. in .cache/jobs.sqlite3, damit jeder Worker
+# die Abfrage beantworten kann. Die Job-ID ist ein Hash aus Funktion, Argumenten und Datenstand:
+# gleiche Aufträge mehrerer Sitzungen laufen nur einmal. Abgebrochen wird kooperativ, die Figur-
+# Funktion prüft bei jeder Fortschrittsmeldung (job_progress) das Abbruch-Flag.
+JOB_TIMEOUT = 300
+current_job = contextvars.ContextVar('current_job', default=None)
+job_store = job_pool = None
+job_lock = threading.Lock()
+
+
+def jobs():
+    # Erst beim ersten Job anlegen (schneller Start, Section 20)
+    global job_store
+    if job_store is None:
+        with job_lock:
+            if job_store is None:
+                import result_store
+                job_store = shared_store or result_store.connect('sqlite:///' + os.path.join(cache_dir, 'jobs.sqlite3'))
+    return job_store
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def job_id(name, args):
+    return 'job:' + hashlib.sha1(result_key(name, args).encode()).hexdigest()
+
+
+def job_progress(done, total):
+    job = current_job.get()
+    if job is None:
+        return
+    if jobs().get(job + ':cancel') is not None:
+        raise JobCancelled(job)
+    # Jede Meldung verlängert auch die Job-Markierung: JOB_TIMEOUT zählt ab der letzten Meldung,
+    # länger laufende Jobs gelten sonst als verloren und würden doppelt gestartet
+    jobs().set(job, b'1', ex=JOB_TIMEOUT)
+    jobs().set(job + ':progress', json.dumps([done, total]).encode(), ex=JOB_TIMEOUT)
+
+
+def run_job(job, func, args):
+    token = current_job.set(job)
+    try:
+        jobs().set(job + ':result', encode_result(func(*args)), ex=JOB_TIMEOUT)
+    except JobCancelled:
+        pass
+    except Exception:
+        server.logger.exception('Hintergrund-Job %s fehlgeschlagen', job)
+        jobs().set(job + ':error', b'1', ex=JOB_TIMEOUT)
+    finally:
+        current_job.reset(token)
+        jobs().delete(job, job + ':cancel', job + ':progress')
+
+
+def submit_job(func, args):
+    # Startet den Job oder hängt sich an den gleichen laufenden bzw. fertigen Job an.
+    # Gibt die Job-ID zurück und ob dieser Aufruf ihn gestartet hat (nur dann darf er abbrechen).
+    global job_pool
+    job = job_id(func.__name__, args)
+    if jobs().get(job + ':result') is not None or not jobs().set(job, b'1', ex=JOB_TIMEOUT, nx=True):
+        return job, False
+    jobs().delete(job + ':error')
+    with job_lock:
+        # Erst im Worker anlegen: Threads überleben den fork aus dem gunicorn-Master nicht
+        if job_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            job_pool = ThreadPoolExecutor(BACKGROUND_THREADS, thread_name_prefix='job')
+    job_pool.submit(run_job, job, func, args)
+    return job, True
+
+
+def cancel_job(job):
+    jobs().set(job + ':cancel', b'1', ex=JOB_TIMEOUT)
+
+
+def job_status(job):
+    result = jobs().get(job + ':result')
+    if result is not None:
+        return 'done', json.loads(result)
+    if jobs().get(job + ':error') is not None:
+        return 'error', None
+    if jobs().get(job) is None:
+        return 'lost', None  # abgebrochen oder Worker beendet: neu starten
+    progress = jobs().get(job + ':progress')
+    return 'running', json.loads(progress) if progress is not None else [0, 1]
+
+"""
+-----------------------------------------------------------------------------------------
+Section 6:
+Graph Callbacks: Partial Updates and Clientside Filtering
+"""
+# Partielle Updates: Existiert die Figur im Browser bereits, wird nur ein dash.Patch mit den
+# geänderten Trace-Daten und Layout-Werten gesendet (Achsen-, Font- und Margin-Dicts bleiben).
+def trace_patch(trace_keys, layout_paths=()):
+    def patch(fig, previous, *args):
+        patched = Patch()
+        for i, trace in enumerate(fig['data']):
+            for key in trace_keys:
+                if key in trace:
+                    patched['data'][i][key] = trace[key]
+        for path in layout_paths:
+            value, target = fig['layout'], patched['layout']
+            for part in path[:-1]:
+                value, target = value.get(part, {}), target[part]
+            target[path[-1]] = value.get(path[-1])
+        return patched
+
+    return patch
+
+
+patch_lines = trace_patch(['x', 'y', 'type'], [('xaxis', 'tick0'), ('xaxis', 'range')])
+
+
+HIDDEN = {'display': 'none'}
+
+
+def server_callback(func, output, inputs, patch, memory, tab, background):
+    # memory: dcc.Store mit den Inputs des letzten Aufrufs (für Patches, die den Vorzustand brauchen)
+    # tab: Grafik erst berechnen, wenn der Tab zum ersten Mal geöffnet wird (kein Initial-Call)
+    # background: Anzahl Datenpunkte der Figur aus den Inputs; ab BACKGROUND_POINTS wird eine
+    # noch nicht berechnete Figur als Hintergrund-Job gerechnet (job_N, poll_N, progress_N)
+    outputs = [output] + ([Output(memory, 'data')] if memory else [])
+    triggers = [Input(f'rendered_{tab}', 'data')] if tab else []
+    states = [State(memory, 'data')] if memory else []
+    if background:
+        suffix = output.component_id.split('_')[-1]
+        outputs += [Output(f'job_{suffix}', 'data'), Output(f'poll_{suffix}', 'disabled'),
+                    Output(f'progress_{suffix}', 'value'), Output(f'progress_{suffix}', 'style')]
+        states += [State(f'job_{suffix}', 'data')]
+
+    def callback(*values):
+        args = values[:len(inputs)]
+        previous = values[len(inputs) + len(triggers)] if memory else None
+        fig = None
+        if background:
+            running = values[-1]
+            job = None
+            if BACKGROUND_POINTS and background(*args) >= BACKGROUND_POINTS:
+                fig = figure_cache.peek(func.__name__, args)
+                job = job_id(func.__name__, args) if fig is None else None
+            # Neue Eingaben: den eigenen, nicht mehr gebrauchten Job abbrechen
+            if running and running['owner'] and running['id'] != job:
+                cancel_job(running['id'])
+            if job is not None:
+                job, owner = submit_job(func, args)
+                return (no_update,) * (len(outputs) - 4) + ({'id': job, 'owner': owner}, False, 0, {})
+        if fig is None:
+            fig = func(*args)
+        # Beim ersten Aufruf (triggered_id None) bzw. beim ersten Öffnen des Tabs existiert noch
+        # keine Figur im Browser
+        if patch is not None and ctx.triggered_id not in (None, f'rendered_{tab}'):
+            with metrics.stage('patch'):
+                fig = patch(fig, previous, *args)
+        result = (fig, list(args)) if memory else (fig,)
+        if background:
+            # Direkt berechnet: einen noch sichtbaren Fortschrittsbalken eines früheren Jobs ausblenden
+            return result + (None, True, 0, HIDDEN)
+        return result if memory else fig
+
+    callback.__name__ = func.__name__
+    app.callback(*outputs, *inputs, *triggers, *states,
+                 prevent_initial_call=tab is not None)(metrics.instrument(callback))
+    if background:
+        poll_callback(func, output, inputs, memory, suffix)
+
+
+# Fortschritt eines Hintergrund-Jobs abfragen (jeder Worker kann antworten, Section 5). Ist der
+# Job fertig, kommt die ganze Figur; ist er verschwunden (abgebrochen von der Sitzung, die ihn
+# gestartet hat, oder Worker beendet), wird er neu gestartet. Ist er fehlgeschlagen, zeigt die
+# Grafik einen Hinweis statt der alten Figur.
+JOB_FAILED = ("<i>Die Grafik konnte nicht berechnet werden.<br>"
+              "Bitte ändern Sie die Auswahl oder laden Sie die Seite neu<i>.")
+
+
+def poll_callback(func, output, inputs, memory, suffix):
+    outputs = [Output(output.component_id, 'figure', allow_duplicate=True)]
+    outputs += [Output(memory, 'data', allow_duplicate=True)] if memory else []
+    outputs += [Output(f'progress_{suffix}', 'value', allow_duplicate=True),
+                Output(f'progress_{suffix}', 'style', allow_duplicate=True),
+                Output(f'poll_{suffix}', 'disabled', allow_duplicate=True),
+                Output(f'job_{suffix}', 'data', allow_duplicate=True)]
+    unchanged = (no_update,) * (len(outputs) - 4)
+
+    def callback(n_intervals, running, *args):
+        # Antworten zu inzwischen geänderten Eingaben verwerfen
+        if not running or running['id'] != job_id(func.__name__, args):
+            raise PreventUpdate
+        status, value = job_status(running['id'])
+        if status == 'done':
+            result = (value, list(args)) if memory else (value,)
+            return result + (100, HIDDEN, True, None)
+        if status == 'error':
+            # Ohne Vorzustand (memory None) baut der nächste Aufruf die ganze Figur statt eines Patches
+            result = (message_figure(JOB_FAILED), None) if memory else (message_figure(JOB_FAILED),)
+            return result + (0, HIDDEN, True, None)
+        if status == 'lost':
+            job, owner = submit_job(func, args)
+            return unchanged + (0, {}, False, {'id': job, 'owner': owner})
+        done, total = value
+        return unchanged + (100 * done / max(total, 1), {}, False, no_update)
+
+    callback.__name__ = f'poll_{func.__name__}'
+    app.callback(*outputs, Input(f'poll_{suffix}', 'n_intervals'), State(f'job_{suffix}', 'data'),
+                 *[State(dep.component_id, dep.component_property) for dep in inputs],
+                 prevent_initial_call=True)(metrics.instrument(callback))
+
+
+# Zoom in Liniendiagramme: Wurden die Reihen verdichtet (Level of Detail, Section 7), holt ein
+# aufgezogener Ausschnitt die Punkte dieses Jahresbereichs in voller Auflösung bzw. neu verdichtet
+# nach; ein Doppelklick (autorange) stellt den ganzen Sliderbereich wieder her. Ohne Verdichtung
+# bleibt es beim Zoom im Browser: Der Callback wird nur registriert, wenn beim Start eine der
+# Reihen länger als LOD_POINTS ist, sonst kostete jedes relayoutData-Ereignis (Zoom, Pan,
+# Autosize) eine Server-Anfrage ohne Ergebnis. Werden Reihen erst durch Nachladen (Section 15) so
+# lang, greift das Nachladen beim Zoom nach dem nächsten Neustart.
+def zoom_needed(keys):
+    return LOD_POINTS > 0 and any(len(cube.groups[key][1]) > LOD_POINTS for key in keys() if key in cube.groups)
+
+
+def zoom_range(relayout, selected_years):
+    if not relayout:
+        return None
+    if relayout.get('xaxis.autorange'):
+        return selected_years
+    if 'xaxis.range[0]' in relayout:
+        lo, hi = relayout['xaxis.range[0]'], relayout['xaxis.range[1]']
+    elif 'xaxis.range' in relayout:
+        lo, hi = relayout['xaxis.range']
     else:
-        return {'display': 'none'}
+        return None  # z.B. autosize oder Legendenklick
+    return max(lo, selected_years[0]), min(hi, selected_years[1])
+
+
+def zoom_callback(graph_id, slider, keys):
+    def callback(relayout, selected_years):
+        year_range = zoom_range(relayout, selected_years)
+        sizes = [np.subtract(*cube.slice(key, *selected_years)[::-1]) for key in keys()]
+        if year_range is None or not LOD_POINTS or max(sizes) <= LOD_POINTS:
+            raise PreventUpdate
+        patched = Patch()
+        for i, key in enumerate(keys()):
+            # Je ein Punkt über den Rand hinaus, damit die Linie bis an den Rand reicht
+            rows = cube.select([key], np.floor(year_range[0]), np.ceil(year_range[1]))
+            x, y = level_of_detail(rows['Jahr'].to_numpy(), rows['Allgemein'].to_numpy())
+            patched['data'][i]['x'] = typed_array(x)
+            patched['data'][i]['y'] = typed_array(y)
+            patched['data'][i]['type'] = trace_type(len(x))
+        # Die Figur wird neu gezeichnet: Ausschnitt festhalten (None = ganzer Bereich)
+        patched['layout']['xaxis']['range'] = None if relayout.get('xaxis.autorange') else list(year_range)
+        return patched
+
+    callback.__name__ = f'zoom_{graph_id}'
+    app.callback(Output(graph_id, 'figure', allow_duplicate=True), Input(graph_id, 'relayoutData'),
+                 State(slider.component_id, slider.component_property),
+                 prevent_initial_call=True)(metrics.instrument(callback))
+
+
+# Im Clientside-Modus werden die Datenreihen jedes Tabs einmalig über dcc.Store ausgeliefert.
+# Slider-Änderungen filtern die Traces danach direkt im Browser (assets/clientside.js);
+# nur Dropdown-Änderungen lösen noch einen Server-Callback aus (Slider-Wert als State).
+def series_records(keys):
+    # Eine Liste pro Trace: {Spalte: [Werte]} mit None statt NaN (JSON-kompatibel)
+    records = []
+    for key in keys:
+        group = cube.select([key], df['Jahr'].min(), df['Jahr'].max())
+        group = group.drop(columns=['Alterskategorie', 'Geschlecht'])
+        records.append({col: [None if pd.isna(v) else v.item() for v in group[col].to_numpy()]
+                        for col in group.columns})
+    return records
+
+
+def graph_callback(output, *inputs, store, clientside, patch=None, memory=None, tab=None, zoom=None,
+                   background=None):
+    # zoom: Gruppen-Schlüssel der Linien (als Funktion, sie ändern sich beim Nachladen) für den
+    # Zoom-Nachlade-Callback; im Clientside-Modus liegen die Reihen ohnehin vollständig im Browser
+    # background: Hintergrund-Jobs (server_callback), nur im Server-Modus
+    def decorator(func):
+        if not CLIENTSIDE_FILTERING:
+            server_callback(func, output, inputs, patch, memory, tab, background)
+            if zoom is not None and zoom_needed(zoom):
+                zoom_callback(output.component_id, inputs[0], zoom)
+            return func
+
+        graph_id = output.component_id
+        slider = next(dep for dep in inputs if dep.component_id.startswith('slider'))
+        dropdowns = [dep for dep in inputs if dep is not slider]
+        duplicate = Output(graph_id, 'figure', allow_duplicate=True)
+
+        # Dropdown-Änderungen weiterhin auf dem Server, der Slider wird nur mitgelesen
+        if dropdowns:
+            server_deps = [State(dep.component_id, dep.component_property) if dep is slider else dep
+                           for dep in inputs]
+            app.callback(duplicate, *server_deps, prevent_initial_call=True)(metrics.instrument(func))
+
+        # Startfigur lazy geladener Tabs: erst beim ersten Öffnen statt im Layout (Section 14)
+        if tab:
+            def render(rendered, *args):
+                return func(*args)
+
+            render.__name__ = func.__name__
+            app.callback(duplicate, Input(f'rendered_{tab}', 'data'),
+                         *[State(dep.component_id, dep.component_property) for dep in inputs],
+                         prevent_initial_call=True)(metrics.instrument(render))
+
+        app.clientside_callback(
+            ClientsideFunction(namespace='dashboard', function_name=clientside),
+            duplicate,
+            slider,
+            *[State(dep.component_id, dep.component_property) for dep in dropdowns],
+            State(store, 'data'),
+            State(graph_id, 'figure'),
+            prevent_initial_call=True)
+        return func
+
+    return decorator
+
+
+def histogram_records(bins, keys):
+    # Pro Teilbereich: Bin-Grenzen, kumulierte Zählungen je Gruppe und Min/Max pro Jahr
+    def clean(values):
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    return {var: {'years': bins.years.tolist(),
+                  'edges': bins.edges[var].tolist(),
+                  'cumulative': [bins.cumulative[var, key].tolist() for key in keys],
+                  'year_min': clean(bins.year_min[var]),
+                  'year_max': clean(bins.year_max[var])}
+            for var in bins.edges}
+
+
+def prefix_records(prefix, keys):
+    # Kumulierte Summen und Anzahlen pro Gruppe (Zeilen: Jahre, Spalten: Teilbereiche); Summen
+    # ganzzahlig in Einheiten von 1/scale
+    return {'years': prefix.years.tolist(),
+            'variables': prefix.variables,
+            'scale': prefix.scale or 1,
+            'sums': [prefix.sums[key].tolist() for key in keys],
+            'counts': [prefix.counts[key].tolist() for key in keys]}
+
+
+def store_records(store):
+    if store == 'series_total':
+        return series_records(TOTAL_KEYS)
+    if store == 'series_sex':
+        return series_records(SEX_KEYS)
+    if store == 'series_age':
+        return series_records(AGE_KEYS)
+    if store == 'histogram_bins':
+        return histogram_records(histogram_bins, SEX_KEYS)
+    if store == 'prefix_means':
+        return prefix_records(age_means, AGE_KEYS)
+    raise KeyError(store)
+
+
+# Stores, die nur die Grafiken eines lazy geladenen Tabs brauchen, werden nicht ins Layout
+# geschrieben, sondern beim ersten Öffnen des Tabs nachgeliefert
+TAB_STORES = {'tab_2': ['histogram_bins'], 'tab_3': ['series_age', 'prefix_means']}
+
+
+def fill_stores():
+    lazy = [store for stores in TAB_STORES.values() for store in stores]
+    for store in ('series_total', 'series_sex', 'series_age', 'histogram_bins', 'prefix_means'):
+        if store not in lazy:
+            app.layout[store].data = store_records(store)
+
+
+def tab_store_callback(stores):
+    def callback(rendered):
+        return [store_records(store) for store in stores]
+
+    return callback
+
+
+# Setzt rendered_tab_N beim ersten Öffnen von tab_N (im Browser, ohne Server-Request)
+for tab in ('tab_2', 'tab_3'):
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='render_tab'),
+        Output(f'rendered_{tab}', 'data'),
+        Input('tabs', 'value'),
+        State(tab, 'value'),
+        State(f'rendered_{tab}', 'data'))
+
+if CLIENTSIDE_FILTERING:
+    fill_stores()
+    for tab, stores in TAB_STORES.items():
+        app.callback([Output(store, 'data') for store in stores], Input(f'rendered_{tab}', 'data'),
+                     prevent_initial_call=True)(tab_store_callback(stores))
 
+"""
+-----------------------------------------------------------------------------------------
+Section 7:
+Figure Template and Trace Builders
+"""
+# Gemeinsame Gestaltung aller Grafiken als Plotly-Template, einmal beim Start zusammengestellt.
+# Die Grafik-Callbacks bauen ihre Figuren direkt als Dicts aus fertigen Trace-Dicts (ohne
+# plotly.express und ohne Validierung bei jedem Aufruf) und setzen nur noch, was sich von
+# Grafik zu Grafik unterscheidet. Das Template wird mit jeder Figur übertragen; es enthält
+# deshalb nur die Teile des Plotly-Standardtemplates, die für Linien-, Streu- und
+# Balkendiagramme wirken (statt ~7 KB mit Geo-, 3D- und Farbskalen-Vorgaben).
+FONT = {'color': '#808080', 'size': 14, 'family': 'Arial, sans-serif'}
+TRANSPARENT = 'rgba(0, 0, 0, 0)'
+AGE_COLORS = {'16-17 Jahre': '#69969C',
+              '18-24 Jahre': '#427A82',
+              '25-49 Jahre': '#246068',
+              '50-64 Jahre': '#0E464E',
+              '65 Jahre +': '#093030'}
+
+
+def slim_template():
+    plotly_template = pio.templates['plotly'].to_plotly_json()
+    layout = {key: plotly_template['layout'][key]
+              for key in ('autotypenumbers', 'colorway', 'hovermode', 'hoverlabel', 'annotationdefaults',
+                          'xaxis', 'yaxis', 'title')}
+    data = {trace: plotly_template['data'][trace] for trace in ('scatter', 'bar')}
+    return {'data': data, 'layout': layout}
+
+
+BASE_TEMPLATE = slim_template()
+
+DASHBOARD_TEMPLATE = copy.deepcopy(BASE_TEMPLATE)
+DASHBOARD_TEMPLATE['layout'].update(
+    plot_bgcolor=TRANSPARENT,
+    paper_bgcolor=TRANSPARENT,
+    font=FONT,
+    margin={'l': 40, 'r': 20, 't': 20, 'b': 10},
+    legend={'tracegroupgap': 0, 'title': {'text': ''}})
+for axis in ('xaxis', 'yaxis'):
+    DASHBOARD_TEMPLATE['layout'][axis].update(
+        showgrid=False, showticklabels=True, tickfont=FONT, tickcolor='#808080')
+
+TYPED_ARRAY_CODES = {'int8': 'i1', 'int16': 'i2', 'int32': 'i4', 'float32': 'f4', 'float64': 'f8'}
+
+
+def typed_array(values):
+    # Numerische Arrays wie bei plotly als base64-kodiertes Typed Array (kompakter als Listen);
+    # int64 wird auf den kleinsten passenden Typ verkleinert
+    values = np.ascontiguousarray(values)
+    if values.size == 0:
+        return []
+    if values.dtype == np.int64:
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= values.min() and values.max() <= info.max:
+                values = values.astype(dtype)
+                break
+    return {'dtype': TYPED_ARRAY_CODES[values.dtype.name], 'bdata': base64.b64encode(values).decode('ascii')}
+
+
+# Level of Detail: Mehr Punkte als Pixel bringen im Browser nichts ausser Übertragungs- und
+# Zeichenzeit. lttb (Largest-Triangle-Three-Buckets) erhält die Form der Kurve, minmax behält
+# pro Bucket den kleinsten und grössten Wert (keine Ausreisser gehen verloren). Beide liefern die
+# Positionen der behaltenen Punkte; fehlende Werte werden übersprungen.
+def lttb(x, y, points):
+    n = len(x)
+    edges = np.linspace(1, n - 1, points - 1).astype(int)  # points - 2 Buckets zwischen erstem und letztem Punkt
+    keep = np.empty(points, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        prev_x, prev_y = x[keep[i]], y[keep[i]]
+        area = np.abs((prev_x - next_x) * (y[lo:hi] - prev_y) - (prev_x - x[lo:hi]) * (next_y - prev_y))
+        keep[i + 1] = lo + np.argmax(area)
+    return keep
+
+
+def minmax(x, y, points):
+    n = len(x)
+    starts = np.linspace(0, n, max(points // 2, 1), endpoint=False).astype(int)
+    counts = np.diff(np.append(starts, n))
+    position = np.arange(n)
+    # Pro Bucket die erste Position, an der das Minimum bzw. Maximum des Buckets steht
+    lows = np.minimum.reduceat(np.where(y == np.repeat(np.minimum.reduceat(y, starts), counts), position, n), starts)
+    highs = np.minimum.reduceat(np.where(y == np.repeat(np.maximum.reduceat(y, starts), counts), position, n), starts)
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+LOD_METHODS = {'lttb': lttb, 'minmax': minmax}
+
+
+def level_of_detail(x, y):
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    if not LOD_POINTS or len(valid) <= max(LOD_POINTS, 2):
+        return x, y
+    keep = valid[LOD_METHODS[LOD_METHOD](x[valid].astype(float), y[valid].astype(float), max(LOD_POINTS, 3))]
+    return x[keep], y[keep]
+
+
+def trace_type(points):
+    return 'scattergl' if WEBGL_THRESHOLD and points >= WEBGL_THRESHOLD else 'scatter'
+
+
+def figure(data, layout, template=DASHBOARD_TEMPLATE):
+    return {'data': data, 'layout': dict(layout, template=template)}
+
+
+def message_figure(text):
+    # Leere Grafik mit Hinweistext (Plotly-Standardschrift und -ränder wie bei px.scatter())
+    data = [{'hovertemplate': '<extra></extra>', 'legendgroup': '', 'marker': {'color': '#636efa', 'symbol': 'circle'},
+             'mode': 'markers', 'name': '', 'orientation': 'v', 'showlegend': False,
+             'xaxis': 'x', 'yaxis': 'y', 'type': 'scatter'}]
+
+    hidden_axis = {'showgrid': False, 'zeroline': False, 'showline': False}
+    layout = {
+        'xaxis': dict(hidden_axis, anchor='y', domain=[0.0, 1.0]),
+        'yaxis': dict(hidden_axis, anchor='x', domain=[0.0, 1.0]),
+        'legend': {'tracegroupgap': 0},
+        'margin': {'t': 60},
+        'plot_bgcolor': TRANSPARENT,
+        'paper_bgcolor': TRANSPARENT,
+        'font': {'color': '#808080'},
+        'title': {'text': text,
+                  'y': 0.6,
+                  'x': 0.5,
+                  'xanchor': 'center',
+                  'yanchor': 'top',
+                  'font': {'size': 16, 'color': '#808080', 'family': 'Arial, sans-serif'}}}
+
+    return figure(data, layout, template=BASE_TEMPLATE)
+
+
+def line_trace(rows, label, name, color, marker_size, marker_line_width):
+    # Wie px.line(x='Jahr', y='Allgemein', color=label) mit mode='markers+lines'
+    hover = f'{label}={name}<br>' if label else ''
+    x, y = level_of_detail(rows['Jahr'].to_numpy(), rows['Allgemein'].to_numpy())
+    return {'hovertemplate': hover + 'Jahr=%{x}<br>Allgemein=%{y}<extra></extra>',
+            'legendgroup': name,
+            'line': {'color': color, 'dash': 'solid', 'width': 4},
+            'marker': {'symbol': 'circle', 'line': {'color': '#808080', 'width': marker_line_width},
+                       'size': marker_size},
+            'mode': 'markers+lines',
+            'name': name,
+            'orientation': 'v',
+            'showlegend': bool(label),
+            'x': typed_array(x),
+            'xaxis': 'x',
+            'y': typed_array(y),
+            'yaxis': 'y',
+            'type': trace_type(len(x))}
+
+
+def year_axis(filtered_df):
+    # Jahresachse der Liniendiagramme: alle zwei Jahre ab dem ersten gewählten Jahr
+    return {'dtick': 2,
+            'tickangle': 0,
+            'tickmode': 'linear',
+            'tick0': int(filtered_df['Jahr'].min())}
 
 """
 -----------------------------------------------------------------------------------------
-Section 5:
+Section 8:
 Tab 1: Define Graph 1 - Linechart (Allgemein)
 """
-@app.callback(
+@graph_callback(
     Output('graph_1', 'figure'),
-    Input('slider_1', 'value'))
+    Input('slider_1', 'value'),
+    store='series_total', clientside='filter_lines', patch=patch_lines,
+    zoom=lambda: TOTAL_KEYS)
 
+@figure_cache
 def update_graph_1(selected_years):
     min_year, max_year = selected_years
-    filtered_df = df[(df['Geschlecht'] == 'Alle') & (df['Jahr'] >= min_year) & (df['Jahr'] <= max_year)]
-
-    fig = px.line(filtered_df,
-                  x='Jahr',
-                  y='Allgemein')
-
-    fig.update_traces(marker=dict(size=8, symbol='circle', line=dict(width=0.5, color='#808080')),
-                      line=dict(color='#427A82', width=4),
-                      mode='markers+lines')
-
-    fig.update_xaxes(dtick=2,
-                     tickangle=0,
-                     tickmode='linear',
-                     tick0=filtered_df['Jahr'].min(),
-                     showgrid=False,
-                     showticklabels=True,
-                     ticks="",
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080')
-
-    fig.update_yaxes(showgrid=False,
-                     showticklabels=True,
-                     ticks='outside',
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     tickformat=".2f",
-                     range=[7.80, 8.30])
-
-    fig.update_layout(
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        xaxis_title=None,
-        yaxis_title="Zufriedenheits-Index",
-        font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-        margin=dict(l=40, r=20, t=20, b=10),
-        legend_title_text='')
-
-    return fig
+    with metrics.stage('filter'):
+        filtered_df = cube.select(TOTAL_KEYS, min_year, max_year)
+
+    data = [line_trace(filtered_df, None, '', '#427A82', marker_size=8, marker_line_width=0.5)]
+
+    layout = {
+        'xaxis': dict(year_axis(filtered_df), ticks=''),
+        'yaxis': {'title': {'text': 'Zufriedenheits-Index'},
+                  'ticks': 'outside',
+                  'tickformat': '.2f',
+                  'range': [7.80, 8.30]}}
+
+    return figure(data, layout)
 
 """
 -----------------------------------------------------------------------------------------
-Section 6:
+Section 9:
 Tab 1: Define Graph 2 - Scatter-Plot (Allgemein und Einflussfaktoren)
 """
-@app.callback(
+# OLS-Trendlinien: geschlossene Lösung der einfachen linearen Regression (Allgemein ~ Teilbereich),
+# für alle Teilbereiche gleichzeitig als NumPy-Matrixoperation. Fehlende Werte werden paarweise
+# ausgeschlossen (wie bei plotly/statsmodels). Die Koeffizienten werden pro Jahresbereich gecacht.
+@functools.lru_cache(maxsize=256)
+def ols_fits(min_year, max_year):
+    filtered_df = cube.select(SEX_KEYS, min_year, max_year)
+    variables = list(df.columns[4:])
+    x = filtered_df[variables].to_numpy(dtype=float)                 # (Zeilen, Teilbereiche)
+    y = np.broadcast_to(filtered_df[['Allgemein']].to_numpy(dtype=float), x.shape)
+
+    mask = ~(np.isnan(x) | np.isnan(y))
+    n = mask.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.where(mask, x, 0).sum(axis=0) / n
+        mean_y = np.where(mask, y, 0).sum(axis=0) / n
+        dx = np.where(mask, x - mean_x, 0)
+        dy = np.where(mask, y - mean_y, 0)
+        sxx = (dx * dx).sum(axis=0)
+        sxy = (dx * dy).sum(axis=0)
+        syy = (dy * dy).sum(axis=0)
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r2 = sxy ** 2 / (sxx * syy)
+
+    return {var: {'slope': slope[i], 'intercept': intercept[i], 'r2': r2[i], 'n': int(n[i])}
+            for i, var in enumerate(variables)}
+
+
+def trendline_trace(filtered_df, variable, color, fit):
+    # Gleicher Aufbau wie die px-Trendlinie (sortierte x-Werte, Hovertext mit Steigung und R²)
+    pairs = filtered_df[[variable, 'Allgemein']].dropna().sort_values(variable)
+    x = pairs[variable].to_numpy()
+    x, y = level_of_detail(x, fit['intercept'] + fit['slope'] * x)
+    return {
+        'hovertemplate': f"<b>OLS trendline</b><br>Allgemein = {fit['slope']:g} * Value + {fit['intercept']:g}"
+                         f"<br>R<sup>2</sup>={fit['r2']:f}<br><br>Variable={variable}<br>Value=%{{x}}"
+                         f"<br>Allgemein=%{{y}} <b>(trend)</b><extra></extra>",
+        'legendgroup': variable,
+        'marker': {'color': color, 'line': {'color': '#808080', 'width': 0.5}, 'size': 10},
+        'mode': 'lines',
+        'name': variable,
+        'showlegend': False,
+        'x': typed_array(x),
+        'y': typed_array(y),
+        'type': trace_type(len(x))}
+
+
+# Aufwand einer Figur für die Wahl zwischen Request und Hintergrund-Job (Section 6)
+def scatter_points(col_menue, selected_years):
+    rows = sum(np.subtract(*cube.slice(key, *selected_years)[::-1]) for key in SEX_KEYS if key in cube.groups)
+    return len(col_menue or []) * int(rows)
+
+
+# Pro Teilbereich gibt es zwei Traces (Punkte und Trendlinie). Kommt im Dropdown ein Teilbereich
+# hinzu, werden nur dessen Traces angehängt; ohne Auswahl wechselt das Layout (Hinweistext).
+def patch_graph_2(fig, previous, col_menue, selected_years):
+    previous_cols = previous[0] if previous else None
+    if not col_menue or not previous_cols:
+        return fig
+    if ctx.triggered_id == 'slider_1':
+        return patch_scatter(fig, previous, col_menue, selected_years)
+
+    patched = Patch()
+    if list(col_menue[:len(previous_cols)]) == list(previous_cols):
+        patched['data'].extend(fig['data'][2 * len(previous_cols):])
+    else:
+        patched['data'] = fig['data']
+    return patched
+
+
+patch_scatter = trace_patch(['x', 'y', 'hovertemplate', 'type'])
+
+
+@graph_callback(
     Output('graph_2', 'figure'),
     Input('dropdown_2', 'value'),
-    Input('slider_1', 'value'))
+    Input('slider_1', 'value'),
+    store='series_sex', clientside='filter_scatter',
+    patch=patch_graph_2, memory='selection_2', background=scatter_points)
 
+@figure_cache
+@offload
 def update_graph_2(col_menue, selected_years):
     if col_menue:  # Überprüfen, ob eine Vergleichsvariable ausgewählt ist
         min_year, max_year = selected_years
-        filtered_df = df[(df['Jahr'] >= min_year) & (df['Jahr'] <= max_year) & (df['Geschlecht'] == 'Frauen') | (df['Geschlecht'] == 'Männer')]
+        with metrics.stage('filter'):
+            filtered_df = cube.select(SEX_KEYS, min_year, max_year)
 
-        melted_df = filtered_df.melt(id_vars=['Jahr', 'Allgemein'], value_vars=col_menue,
-                                     var_name='Variable', value_name='Value')
+        with metrics.stage('aggregate'):
+            fits = ols_fits(min_year, max_year)
 
         colors = ['#427A82','#00FFFF','white','#69969C','#093030','#246068','black','#0E464E']
 
-        color_map = {col_menue[i]: colors[i] for i in range(len(col_menue))}
-
-        fig = px.scatter(melted_df,
-                         x='Value',
-                         y='Allgemein',
-                         color='Variable',
-                         trendline='ols',
-                         color_discrete_map=color_map)
-
-        fig.update_traces(marker=dict(size=10, line=dict(width=0.5, color='#808080')))
-
-        fig.update_xaxes(showgrid=False,
-                         showticklabels=True,
-                         tickangle=0,
-                         ticks='outside',
-                         tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                         tickcolor='#808080',
-                         tickformat=".2f")
-                         #dtick=0.1,
-                         #range=[6.70, 9.50])
-
-        fig.update_yaxes(showgrid=False,
-                         showticklabels=True,
-                         ticks='outside',
-                         tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                         tickcolor='#808080',
-                         tickformat=".2f",
-                         range=[7.80, 8.30])
-
-        fig.update_layout(
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-            xaxis_title=None,
-            yaxis_title="Allgemeine Zufriedenheit",
-            font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-            title={
-                'y': 0.95,
-                'x': 0.5,
-                'xanchor': 'center',
-                'yanchor': 'top',
-                'font': dict(
-                    size=16,
-                    family='Arial, sans-serif')},
-            margin=dict(l=40, r=20, t=20, b=10),
-            legend_title_text='')
-
-        return fig
+        # Pro Teilbereich die Punkte und direkt danach die Trendlinie
+        data = []
+        for i, (variable, color) in enumerate(zip(col_menue, colors)):
+            job_progress(i, len(col_menue))  # nur in Hintergrund-Jobs: Fortschritt, Abbruch
+            data.append({
+                'hovertemplate': f'Variable={variable}<br>Value=%{{x}}<br>Allgemein=%{{y}}<extra></extra>',
+                'legendgroup': variable,
+                'marker': {'color': color, 'symbol': 'circle', 'line': {'color': '#808080', 'width': 0.5}, 'size': 10},
+                'mode': 'markers',
+                'name': variable,
+                'orientation': 'v',
+                'showlegend': True,
+                'x': typed_array(filtered_df[variable].to_numpy()),
+                'xaxis': 'x',
+                'y': typed_array(filtered_df['Allgemein'].to_numpy()),
+                'yaxis': 'y',
+                'type': trace_type(len(filtered_df))})
+            data.append(trendline_trace(filtered_df, variable, color, fits[variable]))
+
+        layout = {
+            'xaxis': {'tickangle': 0,
+                      'ticks': 'outside',
+                      'tickformat': '.2f'},
+                      #dtick=0.1,
+                      #range=[6.70, 9.50])
+            'yaxis': {'title': {'text': 'Allgemeine Zufriedenheit'},
+                      'ticks': 'outside',
+                      'tickformat': '.2f',
+                      'range': [7.80, 8.30]},
+            'title': {'y': 0.95,
+                      'x': 0.5,
+                      'xanchor': 'center',
+                      'yanchor': 'top',
+                      'font': {'size': 16, 'family': 'Arial, sans-serif'}}}
+
+        return figure(data, layout)
 
     else:
-        fig = px.scatter()
-
-        fig.update_layout(
-            plot_bgcolor='rgba(0, 0, 0, 0)',
-            paper_bgcolor='rgba(0, 0, 0, 0)',
-            font=dict(color='#808080'),
-            title={'text': f"<i>Bitte wählen Sie mind. einen Teilbereich aus,<br>um Daten einzusehen<i>.",
-                   'y': 0.6,
-                   'x': 0.5,
-                   'xanchor': 'center',
-                   'yanchor': 'top',
-                   'font': dict(
-                       size=16,
-                       color='#808080',
-                       family='Arial, sans-serif')})
-
-        fig.update_xaxes(showgrid=False, zeroline=False, showline=False)
-        fig.update_yaxes(showgrid=False, zeroline=False, showline=False)
-
-        return fig
+        return message_figure("<i>Bitte wählen Sie mind. einen Teilbereich aus,<br>um Daten einzusehen<i>.")
 
 """
 -----------------------------------------------------------------------------------------
-Section 7:
+Section 10:
 Tab 2: Define Graph 3 - Linechart (Allgemein Männer vs Frauen)
 """
-@app.callback(
+@graph_callback(
     Output('graph_3', 'figure'),
-        Input('slider_3', 'value'))
+        Input('slider_3', 'value'),
+        store='series_sex', clientside='filter_lines', patch=patch_lines, tab='tab_2',
+        zoom=lambda: SEX_KEYS)
 
+@figure_cache
 def update_graph_3(selected_years):
     min_year, max_year = selected_years
     # Daten filtern, um nur Männer und Frauen zu erhalten
-    filtered_df = df[
-        (df['Jahr'] >= min_year) & (df['Jahr'] <= max_year) & (df['Geschlecht'].isin(['Männer', 'Frauen']))]
-
-    fig = px.line(filtered_df,
-                  x='Jahr',
-                  y='Allgemein',
-                  color='Geschlecht',
-                  color_discrete_map={'Männer': '#0E464E', 'Frauen': '#69969C'})
-
-    fig.update_traces(marker=dict(size=8, symbol='circle', line=dict(width=0.5, color='#808080')),
-                      mode='markers+lines',
-                      line=dict(width=4))
-
-    fig.update_xaxes(dtick=2,
-                     tickangle=0,
-                     tickmode='linear',
-                     tick0=filtered_df['Jahr'].min(),
-                     showgrid=False,
-                     showticklabels=True,
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080')
-
-    fig.update_yaxes(showgrid=False,
-                     showticklabels=True,
-                     ticks='outside',
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     tickformat = ".2f",
-                     range=[7.80, 8.30])
-
-    fig.update_layout(
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        xaxis_title="",
-        yaxis_title="Zufriedenheits-Index",
-        font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-        margin=dict(l=40, r=20, t=20, b=10),
-        legend_title_text='')
-
-    return fig
+    with metrics.stage('filter'):
+        filtered_df = cube.select(SEX_KEYS, min_year, max_year)
+        groups = [(key[0], cube.select([key], min_year, max_year)) for key in SEX_KEYS]
+
+    color_map = {'Männer': '#0E464E', 'Frauen': '#69969C'}
+    data = [line_trace(rows, 'Geschlecht', name, color_map[name], marker_size=8, marker_line_width=0.5)
+            for name, rows in groups]
+
+    layout = {
+        'xaxis': dict(year_axis(filtered_df), title={'text': ''}),
+        'yaxis': {'title': {'text': 'Zufriedenheits-Index'},
+                  'ticks': 'outside',
+                  'tickformat': '.2f',
+                  'range': [7.80, 8.30]}}
+
+    return figure(data, layout)
 
 """
 -----------------------------------------------------------------------------------------
-Section 8:
-Tab 2: Define Graph 4 - Scatter-Plot (Frauen vs. Männer)
+Section 11:
+Tab 2: Define Graph 4 - Histogramm (Frauen vs. Männer)
 """
-@app.callback(
+@graph_callback(
     Output('graph_4', 'figure'),
     Input('dropdown_4', 'value'),
-    Input('slider_3', 'value'))
-
+    Input('slider_3', 'value'),
+    store='histogram_bins', clientside='filter_histogram',
+    patch=trace_patch(['x', 'y', 'hovertemplate'],
+                      [('xaxis', 'tickvals'), ('xaxis', 'ticktext'),
+                       ('xaxis2', 'tickvals'), ('xaxis2', 'ticktext'), ('title', 'text')]),
+    tab='tab_2')
+
+@figure_cache
 def update_graph_4(col_menue, selected_years):
     min_year, max_year = selected_years
-    # Daten filtern, um nur die Jahre im Bereich und nur Männer und Frauen zu erhalten
-    filtered_df = df[
-        (df['Jahr'] >= min_year) & (df['Jahr'] <= max_year) & (df['Geschlecht'].isin(['Männer', 'Frauen']))]
-
-    fig = px.histogram(filtered_df,
-                       x=col_menue,
-                       color='Geschlecht',
-                       facet_col='Geschlecht',
-                       facet_col_spacing=0.08,
-                       color_discrete_map={'Männer': '#0E464E', 'Frauen': '#69969C'})
-
-    fig.update_traces(marker=dict(line=dict(width=0.5, color='#808080')))
-
-    min_val = filtered_df[col_menue].min()
-    max_val = filtered_df[col_menue].max()
-
-    fig.update_xaxes(showgrid=False,
-                     showticklabels=True,
-                     tickangle=0,
-                     ticks='outside',
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     tickvals=[min_val, max_val],  # Nur minimale und maximale Werte anzeigen
-                     ticktext=[f'{min_val:.2f}', f'{max_val:.2f}'],
-                     title_text='')
-
-    fig.update_yaxes(showgrid=False,
-                     showticklabels=True,
-                     dtick=2,
-                     ticks='outside',
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     matches=None, col=1)
-
-    fig.update_yaxes(showgrid=False,
-                     showticklabels=False,
-                     ticks=None,
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     matches=None, col=2)
-
-    fig.update_layout(
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        bargap=0.06,
-        yaxis_title="Häufigkeit",
-        font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-        title={
-            'text': f"Zufriedenheiten im Bereich '{col_menue}'",
-            'y': 1.0,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(
-                size=16,
-                family='Arial, sans-serif')},
-        margin=dict(l=40, r=20, t=20, b=10),
-        legend_title_text='')
-
-    for annotation in fig['layout']['annotations']:
-        annotation['text'] = ''
-
-    return fig
+    # Vorberechnete Bin-Zählungen für die Jahre im Bereich, je für Frauen und Männer
+    with metrics.stage('aggregate'):
+        edges = histogram_bins.edges[col_menue]
+        centers = (edges[:-1] + edges[1:]) / 2
+        counts = [histogram_bins.counts(col_menue, key, min_year, max_year) for key in SEX_KEYS]
+        min_val, max_val = histogram_bins.value_range(col_menue, min_year, max_year)
+
+    # Ein Teildiagramm pro Geschlecht (wie facet_col='Geschlecht')
+    color_map = {'Männer': '#0E464E', 'Frauen': '#69969C'}
+    data = []
+    for i, (key, count) in enumerate(zip(SEX_KEYS, counts)):
+        suffix = str(i + 1) if i else ''
+        data.append({
+            'hovertemplate': f'Geschlecht={key[0]}<br>{col_menue}=%{{x}}<br>count=%{{y}}<extra></extra>',
+            'legendgroup': key[0],
+            'marker': {'color': color_map[key[0]], 'pattern': {'shape': ''},
+                       'line': {'color': '#808080', 'width': 0.5}},
+            'name': key[0],
+            'orientation': 'v',
+            'showlegend': True,
+            'textposition': 'auto',
+            'x': typed_array(centers),
+            'xaxis': 'x' + suffix,
+            'y': typed_array(count),
+            'yaxis': 'y' + suffix,
+            'type': 'bar'})
+
+    value_axis = {'title': {'text': ''},
+                  'tickangle': 0,
+                  'ticks': 'outside',
+                  'tickvals': [min_val, max_val],  # Nur minimale und maximale Werte anzeigen
+                  'ticktext': [f'{min_val:.2f}', f'{max_val:.2f}']}
+
+    layout = {
+        'xaxis': dict(value_axis, anchor='y', domain=[0.0, 0.46]),
+        'xaxis2': dict(value_axis, anchor='y2', domain=[0.54, 1.0], matches='x'),
+        'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': 'Häufigkeit'},
+                  'dtick': 2, 'ticks': 'outside'},
+        'yaxis2': {'anchor': 'x2', 'domain': [0.0, 1.0], 'showticklabels': False},
+        'barmode': 'relative',
+        'bargap': 0.06,
+        'title': {'text': f"Zufriedenheiten im Bereich '{col_menue}'",
+                  'y': 1.0,
+                  'x': 0.5,
+                  'xanchor': 'center',
+                  'yanchor': 'top',
+                  'font': {'size': 16, 'family': 'Arial, sans-serif'}}}
+
+    return figure(data, layout)
 
 """
 -----------------------------------------------------------------------------------------
-Section 9:
+Section 12:
 Tab 3: Define Graph 5 - Linechart (Alterskategorien)
 """
-@app.callback(
+@graph_callback(
     Output('graph_5', 'figure'),
-        Input('slider_5', 'value'))
+        Input('slider_5', 'value'),
+        store='series_age', clientside='filter_lines', patch=patch_lines, tab='tab_3',
+        zoom=lambda: AGE_KEYS)
 
+@figure_cache
 def update_graph_5(selected_years):
     min_year, max_year = selected_years
     # Daten filtern, um nur Daten ohne Geschlecht zu erhalten
-    filtered_df = df[
-        (df['Jahr'] >= min_year) & (df['Jahr'] <= max_year) & (df['Geschlecht'].isna())]
-
-    fig = px.line(filtered_df,
-                  x='Jahr',
-                  y='Allgemein',
-                  color='Alterskategorie',
-                  color_discrete_map={'16-17 Jahre': '#69969C',
-                                     '18-24 Jahre': '#427A82',
-                                     '25-49 Jahre': '#246068',
-                                     '50-64 Jahre': '#0E464E',
-                                     '65 Jahre +': '#093030'})
-
-    fig.update_traces(marker=dict(size=6, symbol='circle', line=dict(width=0.3, color='#808080')),
-                      mode='markers+lines',
-                      line=dict(width=4))
-
-    fig.update_xaxes(dtick=2,
-                     tickangle=0,
-                     tickmode='linear',
-                     tick0=filtered_df['Jahr'].min(),
-                     showgrid=False,
-                     showticklabels=True,
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080')
-
-    fig.update_yaxes(dtick=0.2,
-                     showgrid=False,
-                     showticklabels=True,
-                     ticks='outside',
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080',
-                     tickformat = ".2f",
-                     range=[7.60, 8.90])
-
-    fig.update_layout(
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        xaxis_title="",
-        yaxis_title="Zufriedenheits-Index",
-        font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-        margin=dict(l=40, r=20, t=20, b=10),
-        legend_title_text='',
-        showlegend=True)
-
-    return fig
+    with metrics.stage('filter'):
+        filtered_df = cube.select(AGE_KEYS, min_year, max_year)
+        groups = [(key[1], cube.select([key], min_year, max_year)) for key in AGE_KEYS]
+
+    data = [line_trace(rows, 'Alterskategorie', name, AGE_COLORS[name], marker_size=6, marker_line_width=0.3)
+            for name, rows in groups]
+
+    layout = {
+        'xaxis': dict(year_axis(filtered_df), title={'text': ''}),
+        'yaxis': {'title': {'text': 'Zufriedenheits-Index'},
+                  'dtick': 0.2,
+                  'ticks': 'outside',
+                  'tickformat': '.2f',
+                  'range': [7.60, 8.90]},
+        'showlegend': True}
+
+    return figure(data, layout)
 
 """
 -----------------------------------------------------------------------------------------
-Section 10:
+Section 13:
 Tab 3: Define Graph 6 - Barchart (Alterskategorien)
 """
-@app.callback(
+@graph_callback(
     Output('graph_6', 'figure'),
     Input('slider_5', 'value'),
-    Input('dropdown_6', 'value')
-)
+    Input('dropdown_6', 'value'),
+    store='prefix_means', clientside='group_means',
+    patch=trace_patch(['x', 'hovertemplate'], [('xaxis', 'title', 'text')]),
+    tab='tab_3')
+@figure_cache
 def update_graph_6(selected_years, selected_variable):
     min_year, max_year = selected_years
-    # Daten filtern, um nur Daten ohne Geschlecht zu erhalten
-    filtered_df = df[
-        (df['Jahr'] >= min_year) & (df['Jahr'] <= max_year) & (df['Geschlecht'].isna())]
-
-    # Mittelwert der ausgewählten Variablen für jede Alterskategorie berechnen
-    mean_df = filtered_df.groupby('Alterskategorie')[selected_variable].mean().reset_index()
-
-    fig = px.bar(mean_df,
-                 x=selected_variable,
-                 y='Alterskategorie',
-                 orientation='h',
-                 color='Alterskategorie',
-                 text='Alterskategorie',
-                 color_discrete_map={'16-17 Jahre': '#69969C',
-                                     '18-24 Jahre': '#427A82',
-                                     '25-49 Jahre': '#246068',
-                                     '50-64 Jahre': '#0E464E',
-                                     '65 Jahre +': '#093030'})
-
-    fig.update_traces(marker=dict(line=dict(width=0.5, color='#808080')),
-                      textposition='inside',
-                      textfont=dict(color='white', size=14, family='Arial, sans-serif'))
-
-    fig.update_xaxes(showgrid=False,
-                     showticklabels=True,
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080')
-
-    fig.update_yaxes(showgrid=False,
-                     showticklabels=False,
-                     ticks=None,
-                     tickfont=dict(color='#808080', size=14, family='Arial, sans-serif'),
-                     tickcolor='#808080')
-
-    fig.update_layout(
-        plot_bgcolor='rgba(0, 0, 0, 0)',
-        paper_bgcolor='rgba(0, 0, 0, 0)',
-        xaxis_title=selected_variable,
-        yaxis_title=None,
-        font=dict(color='#808080', size=14, family='Arial, sans-serif'),
-        margin=dict(l=40, r=20, t=20, b=10),
-        legend_title_text='',
-        showlegend=False)
-
-    return fig
+    # Mittelwert der ausgewählten Variablen für jede Alterskategorie (aus den Präfixsummen)
+    with metrics.stage('aggregate'):
+        means = age_means.means(selected_variable, AGE_KEYS, min_year, max_year)
+
+    names = [key[1] for key in AGE_KEYS]
+    data = [{'hovertemplate': f'Alterskategorie=%{{text}}<br>{selected_variable}=%{{x}}<extra></extra>',
+             'legendgroup': name,
+             'marker': {'color': AGE_COLORS[name], 'pattern': {'shape': ''},
+                        'line': {'color': '#808080', 'width': 0.5}},
+             'name': name,
+             'orientation': 'h',
+             'showlegend': True,
+             'text': [name],
+             'textposition': 'inside',
+             'textfont': {'color': 'white', 'size': 14, 'family': 'Arial, sans-serif'},
+             'x': typed_array(means[i:i + 1]),
+             'xaxis': 'x',
+             'y': [name],
+             'yaxis': 'y',
+             'type': 'bar'}
+            for i, name in enumerate(names)]
+
+    layout = {
+        'xaxis': {'title': {'text': selected_variable}},
+        'yaxis': {'categoryorder': 'array',
+                  'categoryarray': names[::-1],
+                  'showticklabels': False},
+        'barmode': 'relative',
+        'showlegend': False}
+
+    return figure(data, layout)
+
+startup_mark('callbacks')
+
+"""
+-----------------------------------------------------------------------------------------
+Section 14:
+Clientside Filtering: Initial Figures
+"""
+# Ohne Server-Callback beim Seitenaufruf brauchen die Grafiken ihre Startfigur im Layout.
+# Die Grafiken von tab_2/tab_3 erhalten sie erst beim ersten Öffnen des Tabs (Section 6).
+def initial_figures():
+    full_range = [df['Jahr'].min(), df['Jahr'].max()]
+    app.layout['graph_1'].figure = update_graph_1(full_range)
+    app.layout['graph_2'].figure = update_graph_2(None, full_range)
+
+
+if CLIENTSIDE_FILTERING:
+    initial_figures()
+
+startup_mark('figures')
+
+"""
+-----------------------------------------------------------------------------------------
+Section 15:
+Incremental Data Reload
+"""
+# Neue Erhebungsjahre (BFS publiziert jährlich) werden ohne Neustart übernommen: Die Datei wird
+# neu eingelesen, und sind nur ganze Jahre hinzugekommen, werden Histogramm-Bins und
+# Präfixsummen nur um diese Jahre ergänzt. Die neuen Objekte ersetzen die alten erst, wenn sie
+# vollständig sind; aus dem Figure-Cache fallen nur Einträge, deren Jahresbereich ein neues
+# Jahr enthält, sowie Graph 4 der Teilbereiche mit neuen Bin-Grenzen. Der gemeinsame Ergebnis-
+# Cache ist nach Datenstand geschlüsselt, dort gibt es nach dem Nachladen keine alten Treffer.
+# Geänderte bestehende Zeilen oder neue Gruppen lösen einen Neuaufbau aus.
+reload_lock = threading.Lock()
+
+
+def source_version():
+    stat = os.stat(microdata_path or data_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Datenstand als Kennung aus der Quelldatei, damit alle Worker denselben Wert liefern
+loaded_version = source_version()
+data_version = '{}-{}'.format(*loaded_version)
+app.layout['data_version'].data = data_version
+
+
+def update_layout():
+    # Für neue Seitenaufrufe: Slider, Dropdowns und (Clientside-Modus) Stores und Startfiguren
+    global controls
+    controls = control_props()
+    for slider in ('slider_1', 'slider_3', 'slider_5'):
+        app.layout[slider].min = controls['min']
+        app.layout[slider].max = controls['max']
+        app.layout[slider].marks = controls['marks']
+        app.layout[slider].value = [controls['min'], controls['max']]
+    app.layout['dropdown_2'].options = controls['options_2']
+    app.layout['dropdown_4'].options = controls['options']
+    app.layout['dropdown_6'].options = controls['options']
+    app.layout['data_version'].data = data_version
+    if CLIENTSIDE_FILTERING:
+        fill_stores()
+        initial_figures()
+
+
+def reload_data():
+    global df, cube, AGE_KEYS, histogram_bins, age_means, data_version, data_path, loaded_version
+    with reload_lock:
+        version = source_version()
+        if microdata_path:
+            import ingest
+            data_path = ingest.ensure_aggregates(microdata_path, os.path.join(cache_dir, 'microdata'),
+                                                 weight=os.environ.get('DASHBOARD_MICRODATA_WEIGHT'),
+                                                 workers=int(os.environ.get('DASHBOARD_INGEST_WORKERS', os.cpu_count())))
+        frame = load_dataset(data_path) if DATA_CACHE else read_source(data_path)
+        new_cube = DataCube(frame)
+
+        years = np.unique(new_cube.frame['Jahr'].to_numpy())
+        added = np.setdiff1d(years, np.unique(cube.frame['Jahr'].to_numpy()))
+        kept = new_cube.frame[~np.isin(new_cube.frame['Jahr'].to_numpy(), added)].reset_index(drop=True)
+        incremental = (new_cube.groups.keys() == cube.groups.keys()
+                       and kept.equals(cube.frame.reset_index(drop=True)))
+        loaded_version = version
+        if incremental and len(added) == 0:
+            return {'status': 'unchanged', 'version': data_version}
+
+        if incremental:
+            bins = histogram_bins.extend(new_cube, added)
+            means = age_means.extend(new_cube, added)
+            # Neu eingeteilte Teilbereiche: Graph 4 für alle Jahresbereiche neu berechnen
+            rebinned = {var for var in bins.edges if not np.array_equal(bins.edges[var], histogram_bins.edges[var])}
+        else:
+            bins = HistogramBins(new_cube, SEX_KEYS, frame.columns[3:])
+            means = PrefixMeans(new_cube, new_cube.age_keys(), frame.columns[3:])
+
+        df, cube, AGE_KEYS, histogram_bins, age_means = frame, new_cube, new_cube.age_keys(), bins, means
+        if incremental:
+            figure_cache.invalidate(added.tolist(), lambda name, args: name == 'update_graph_4' and args[0] in rebinned)
+        else:
+            figure_cache.invalidate()
+        ols_fits.cache_clear()
+        api_body.cache_clear()
+        data_version = '{}-{}'.format(*version)
+        update_layout()
+        return {'status': 'appended' if incremental else 'rebuilt',
+                'years': added.tolist() if incremental else years.tolist(),
+                'version': data_version}
+
+
+# Nachladen in allen Workern: /admin/reload lädt im bearbeitenden Worker nach und berührt danach
+# die Signaldatei; die Watcher aller Worker prüfen sie alle RELOAD_SIGNAL_INTERVAL Sekunden und
+# laden ebenfalls nach. Ein später aus dem Master geforkter Worker findet eine neuere Signaldatei
+# als beim Import vor und zieht ebenso nach.
+RELOAD_SIGNAL_INTERVAL = 2
+reload_signal_path = os.path.join(cache_dir, 'reload.signal')
+
+
+def signal_version():
+    try:
+        return os.stat(reload_signal_path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def send_reload_signal():
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(reload_signal_path, 'a'):
+        os.utime(reload_signal_path)
+    return signal_version()
+
+
+loaded_signal = signal_version()
+
+
+def watch_source():
+    # Prüft die Signaldatei und (mit RELOAD_INTERVAL) die Datendatei periodisch und lädt bei
+    # Änderungen nach
+    global loaded_signal
+    checked = time.monotonic()
+    while True:
+        time.sleep(min(RELOAD_INTERVAL or RELOAD_SIGNAL_INTERVAL, RELOAD_SIGNAL_INTERVAL))
+        try:
+            signal = signal_version()
+            if signal != loaded_signal:
+                loaded_signal = signal
+                reload_data()
+            elif RELOAD_INTERVAL > 0 and time.monotonic() - checked >= RELOAD_INTERVAL:
+                checked = time.monotonic()
+                if source_version() != loaded_version:
+                    reload_data()
+        except Exception:
+            server.logger.exception('Nachladen der Daten fehlgeschlagen')
+
+
+def start_watcher():
+    # Threads überleben kein fork: unter gunicorn startet jeder Worker seinen eigenen Watcher
+    # (post_fork in gunicorn.conf.py)
+    if RELOAD:
+        threading.Thread(target=watch_source, name='data-watcher', daemon=True).start()
+
+
+@server.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    # Sofortiges Nachladen im bearbeitenden Prozess; die übrigen Worker folgen über die Signaldatei
+    global loaded_signal
+    if not ADMIN_TOKEN or request.headers.get('Authorization') != f'Bearer {ADMIN_TOKEN}':
+        return jsonify({'status': 'forbidden'}), 403
+    result = reload_data()
+    loaded_signal = send_reload_signal()
+    return jsonify(result)
+
+
+def version_time(version):
+    # Änderungszeit der Quelldatei (ns) aus der Kennung des Datenstands
+    return int(version.split('-')[0]) if version else 0
+
+
+# Bereits geöffnete Seiten: Slider-Grenzen und Dropdown-Optionen (im Clientside-Modus auch die
+# Datenreihen bereits geöffneter Tabs) nachführen, sobald dieser Prozess einen neueren
+# Datenstand hat; die gewählten Werte bleiben unverändert. Ein Worker, der noch nicht
+# nachgeladen hat, setzt die Seite nicht auf den älteren Stand zurück.
+REFRESHED_STORES = ['series_total', 'series_sex'] + [store for stores in TAB_STORES.values() for store in stores]
+
+
+@app.callback(
+    [Output(slider, prop) for slider in ('slider_1', 'slider_3', 'slider_5') for prop in ('min', 'max', 'marks')]
+    + [Output('dropdown_2', 'options'), Output('dropdown_4', 'options'), Output('dropdown_6', 'options'),
+       Output('data_version', 'data')]
+    + ([Output(store, 'data', allow_duplicate=True) for store in REFRESHED_STORES] if CLIENTSIDE_FILTERING else []),
+    Input('reload_interval', 'n_intervals'),
+    State('data_version', 'data'),
+    *([State(f'rendered_{tab}', 'data') for tab in TAB_STORES] if CLIENTSIDE_FILTERING else []),
+    prevent_initial_call=True)
+def refresh_controls(n_intervals, client_version, *rendered):
+    if version_time(client_version) >= version_time(data_version):
+        raise PreventUpdate
+    outputs = ([controls['min'], controls['max'], controls['marks']] * 3
+               + [controls['options_2'], controls['options'], controls['options'], data_version])
+    if CLIENTSIDE_FILTERING:
+        # Stores noch nicht geöffneter Tabs füllt tab_store_callback erst beim Öffnen
+        closed = {store for tab, done in zip(TAB_STORES, rendered) if not done for store in TAB_STORES[tab]}
+        outputs += [no_update if store in closed else store_records(store) for store in REFRESHED_STORES]
+    return outputs
+
+
+"""
+-----------------------------------------------------------------------------------------
+Section 16:
+Metrics Endpoint
+"""
+# Nur mit DASHBOARD_METRICS=1: Callback-Zeiten und Antwortgrössen (metrics.py), Cache-
+# Trefferquoten und Speicher dieses Prozesses. Unter gunicorn antwortet jeweils ein Worker;
+# das Label 'worker' (PID) unterscheidet die Reihen, Prometheus summiert über die Worker.
+def metric_gauges():
+    figures = figure_cache.stats()
+    ols = ols_fits.cache_info()
+    rss, max_rss = metrics.process_memory()
+    worker = {'worker': os.getpid()}
+    gauges = [
+        ('dashboard_cache_hits_total', 'counter', 'Cache-Treffer',
+         [(dict(worker, cache='figure'), figures['hits']), (dict(worker, cache='ols'), ols.hits)]),
+        ('dashboard_cache_misses_total', 'counter', 'Cache-Fehlgriffe',
+         [(dict(worker, cache='figure'), figures['misses']), (dict(worker, cache='ols'), ols.misses)]),
+        ('dashboard_cache_hit_ratio', 'gauge', 'Trefferquote seit dem Start',
+         [(dict(worker, cache='figure'), figures['hit_rate']),
+          (dict(worker, cache='ols'), ols.hits / (ols.hits + ols.misses) if ols.hits + ols.misses else 0.0)]),
+        ('dashboard_cache_entries', 'gauge', 'Einträge im Cache',
+         [(dict(worker, cache='figure'), figures['size']), (dict(worker, cache='ols'), ols.currsize)]),
+        ('process_resident_memory_bytes', 'gauge', 'Aktueller RSS des Workers', [(worker, rss)]),
+        ('dashboard_process_max_resident_memory_bytes', 'gauge', 'Maximaler RSS des Workers', [(worker, max_rss)]),
+    ]
+    if shared_stats is not None:
+        # Gemeinsamer Cache: Warten auf das Ergebnis eines anderen Workers zählt als Treffer
+        shared = dict(worker, cache='shared')
+        hits, misses = shared_stats.hits + shared_stats.waits, shared_stats.misses - shared_stats.waits
+        gauges[0][3].append((shared, hits))
+        gauges[1][3].append((shared, misses))
+        gauges[2][3].append((shared, hits / (hits + misses) if hits + misses else 0.0))
+        gauges += [
+            ('dashboard_shared_cache_waits_total', 'counter', 'Auf die Berechnung eines anderen Workers gewartet',
+             [(worker, shared_stats.waits)]),
+            ('dashboard_shared_cache_errors_total', 'counter', 'Fehler des gemeinsamen Ergebnis-Caches',
+             [(worker, shared_stats.errors)])]
+    return gauges
+
+
+if metrics.ENABLED:
+    server.after_request(metrics.observe_response)
+
+    @server.route('/metrics')
+    def metrics_endpoint():
+        return metrics.render(metric_gauges()), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+"""
+-----------------------------------------------------------------------------------------
+Section 17:
+Response Encoding and Compression
+"""
+# Dash serialisiert Callback-Antworten und Layout über plotly.io. Mit orjson werden NumPy-
+# Arrays und -Skalare direkt kodiert statt über Python-Listen und das json-Modul.
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pio.json.config.default_engine = 'json'
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'text/', 'image/svg+xml')
+
+# Statische Dateien (Dash-Bundles unter /_dash-component-suites, /assets) werden pro Verfahren nur
+# einmal komprimiert. Schlüssel ist der Pfad ohne Fingerprint und Query-String (Dash liefert jede
+# Fingerprint-Variante derselben Datei aus), gespeichert mit dem ETag der komprimierten Fassung:
+# eine geänderte Datei in /assets ersetzt ihren Eintrag, die Menge bleibt durch die Dateien begrenzt.
+STATIC_PREFIXES = (app.config.routes_pathname_prefix + app.config.assets_url_path.strip('/') + '/',
+                   app.config.routes_pathname_prefix + '_dash-component-suites/')
+compressed_static = {}
+
+
+def response_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, static):
+    # Callback-Antworten mit schnellen Stufen, statische Dateien einmalig mit hoher Stufe
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if static else 5)
+    return gzip.compress(data, compresslevel=9 if static else 6, mtime=0)
+
+
+def compress_response(response):
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or not response.mimetype.startswith(COMPRESSIBLE_TYPES)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = response_encoding()
+    if encoding is None:
+        return response
+
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    etag, _ = response.get_etag()
+    if request.path.startswith(STATIC_PREFIXES):
+        key = (check_fingerprint(request.path)[0], encoding)
+        cached_etag, body = compressed_static.get(key, (None, None))
+        if body is None or cached_etag != etag:
+            body = compress(data, encoding, static=True)
+            compressed_static[key] = (etag, body)
+    else:
+        body = compress(data, encoding, static=False)
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    if etag is not None:
+        # Andere Darstellung derselben Datei: schwaches ETag, bedingte Anfragen (304) greifen weiter
+        response.set_etag(etag, weak=True)
+    return response
+
+
+# Nach Section 16 registriert: Flask ruft after_request-Funktionen in umgekehrter Reihenfolge
+# auf, /metrics erfasst damit die übertragenen (komprimierten) Bytes
+if COMPRESS_MIN_SIZE > 0:
+    server.after_request(compress_response)
+
+# Phase serialize der Callback-Metriken: Dash kodiert die Rückgabe erst nach dem Callback als
+# JSON. Gemessen wird bis hierher, vor der Kompression (deshalb nach compress_response registriert).
+if metrics.ENABLED:
+    server.after_request(metrics.observe_serialization)
+
+
+
+"""
+-----------------------------------------------------------------------------------------
+Section 18:
+Static Image Export
+"""
+# Grafiken als PNG/SVG für Berichte und Kiosk-Anzeigen, die kein Plotly.js ausführen sollen:
+#     GET /export/graph_2.png?years=2010-2020&variables=Finanzen,Gesundheit&width=900&theme=dark
+# Gerendert wird mit kaleido (optional: pip install kaleido, benötigt Chrome), nur in den Grössen
+# aus IMAGE_SIZES. export_images.py rendert die Bilder vorab nach .cache/images/<Datenstand>/,
+# von dort werden sie direkt ausgeliefert. Fehlende Bilder rendert der Endpunkt bei Bedarf, ohne
+# sie abzulegen (Browser und CDN cachen sie über ETag und max-age), und pro Worker höchstens
+# EXPORT_RENDERS gleichzeitig; weitere Anfragen erhalten 503 mit Retry-After.
+IMAGE_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+IMAGE_SIZES = [(600, 300), (900, 450), (1200, 600), (1800, 900)]
+THEME_BACKGROUNDS = {'light': '#EEEEEE', 'dark': '#282E3B'}  # wie update_theme (clientside.js)
+KALEIDO = importlib.util.find_spec('kaleido') is not None
+EXPORT_RENDERS = 1
+export_slots = threading.BoundedSemaphore(EXPORT_RENDERS)
+
+
+def year_param(params):
+    # years=2010-2020 oder years=2015, ohne Angabe der ganze Bereich (auch für Section 19)
+    first, last = controls['min'], controls['max']
+    min_year, _, max_year = params.get('years', f'{first}-{last}').partition('-')
+    years = [int(min_year), int(max_year or min_year)]
+    if not first <= years[0] <= years[1] <= last:
+        raise ValueError(f'Jahresbereich ausserhalb von {first}-{last}')
+    return years
+
+
+def export_request(graph, params):
+    # Query-Parameter prüfen und vereinheitlichen (ValueError bei ungültigen Werten). Die
+    # Teilbereiche von Graph 2 werden in Spaltenreihenfolge gebracht, damit dieselbe Auswahl
+    # immer dieselbe Figur (Farben) und dieselbe Datei ergibt.
+    if graph not in ('graph_1', 'graph_2', 'graph_3', 'graph_4', 'graph_5', 'graph_6'):
+        raise ValueError(f'Unbekannte Grafik: {graph}')
+    spec = {'graph': graph, 'years': year_param(params),
+            'width': int(params.get('width', 900)), 'height': int(params.get('height', 450)),
+            'theme': params.get('theme', 'light')}
+    if (spec['width'], spec['height']) not in IMAGE_SIZES:
+        raise ValueError('Breite x Höhe: ' + ', '.join(f'{w}x{h}' for w, h in IMAGE_SIZES))
+    if spec['theme'] not in THEME_BACKGROUNDS:
+        raise ValueError(f"Unbekanntes Theme: {spec['theme']}")
+
+    if graph == 'graph_2':
+        selected = set(filter(None, params.get('variables', '').split(',')))
+        if not selected <= set(df.columns[4:]):
+            raise ValueError(f'Unbekannte Teilbereiche: {sorted(selected - set(df.columns[4:]))}')
+        spec['variables'] = [col for col in df.columns[4:] if col in selected]
+    elif graph in ('graph_4', 'graph_6'):
+        spec['variable'] = params.get('variable', 'Allgemein')
+        if spec['variable'] not in df.columns[3:]:
+            raise ValueError(f"Unbekannter Teilbereich: {spec['variable']}")
+    return spec
+
+
+def export_figure(spec):
+    # Dieselben (gecachten) Figuren wie im Dashboard, mit dem Seitenhintergrund des Themes
+    years = spec['years']
+    if spec['graph'] == 'graph_1':
+        fig = update_graph_1(years)
+    elif spec['graph'] == 'graph_2':
+        fig = update_graph_2(spec['variables'] or None, years)
+    elif spec['graph'] == 'graph_3':
+        fig = update_graph_3(years)
+    elif spec['graph'] == 'graph_4':
+        fig = update_graph_4(spec['variable'], years)
+    elif spec['graph'] == 'graph_5':
+        fig = update_graph_5(years)
+    else:
+        fig = update_graph_6(years, spec['variable'])
+    background = THEME_BACKGROUNDS[spec['theme']]
+    return dict(fig, layout=dict(fig['layout'], paper_bgcolor=background, plot_bgcolor=background))
+
+
+def image_path(spec, fmt):
+    # Lesbare Dateinamen, z.B. graph_2/2010-2020_Finanzen+Gesundheit_900x450_dark.png
+    parts = ['{}-{}'.format(*spec['years'])]
+    if spec.get('variables'):
+        parts.append('+'.join(spec['variables']))
+    if spec.get('variable'):
+        parts.append(spec['variable'])
+    parts += [f"{spec['width']}x{spec['height']}", spec['theme']]
+    return os.path.join(cache_dir, 'images', data_version, spec['graph'], '_'.join(parts) + '.' + fmt)
+
+
+@server.route('/export/<graph>.<fmt>')
+def export_image(graph, fmt):
+    if fmt not in IMAGE_FORMATS:
+        return jsonify({'status': 'error', 'message': f'Format {fmt} nicht unterstützt (png, svg)'}), 404
+    try:
+        spec = export_request(graph, request.args)
+    except ValueError as error:
+        return jsonify({'status': 'error', 'message': str(error)}), 400
+
+    path = image_path(spec, fmt)
+    if os.path.exists(path):
+        return send_file(os.path.abspath(path), mimetype=IMAGE_FORMATS[fmt], max_age=86400, conditional=True,
+                         etag=True)
+
+    # Nicht vorab gerendert: Das ETag hängt wie der Dateiname nur von Datenstand und Parametern
+    # ab, bedingte Anfragen kommen ohne Rendern aus
+    response = server.response_class(mimetype=IMAGE_FORMATS[fmt])
+    response.set_etag(hashlib.sha1(path.encode()).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    if not is_resource_modified(request.environ, etag=response.get_etag()[0]):
+        response.status_code = 304
+        return response
+    if not KALEIDO:
+        return jsonify({'status': 'error', 'message': 'Bildexport benötigt kaleido (pip install kaleido)'}), 501
+    if not export_slots.acquire(timeout=10):
+        return jsonify({'status': 'error', 'message': 'Bildexport ausgelastet'}), 503, {'Retry-After': '10'}
+    try:
+        response.set_data(pio.to_image(export_figure(spec), format=fmt, width=spec['width'],
+                                       height=spec['height'], validate=False))
+    finally:
+        export_slots.release()
+    return response
+
+
+"""
+-----------------------------------------------------------------------------------------
+Section 19:
+Aggregate API
+"""
+# Dieselben Zahlen wie in den Grafiken für andere Dienste, ohne Umweg über Dash-Callbacks:
+#     GET /api/v1/total?years=2010-2020        Mittelwerte der Gesamtbevölkerung pro Jahr
+#     GET /api/v1/sex?years=2010-2020          dito nach Geschlecht
+#     GET /api/v1/age-groups?years=2010-2020   Mittelwert pro Alterskategorie und Teilbereich
+# Antworten sind JSON oder, mit format=arrow bzw. Accept: application/vnd.apache.arrow.stream,
+# Arrow IPC (optional: pip install pyarrow). Das ETag hängt nur von Datenstand, Endpunkt,
+# Jahresbereich und Format ab; bedingte Anfragen werden ohne Berechnung mit 304 beantwortet.
+ARROW_TYPE = 'application/vnd.apache.arrow.stream'
+ARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def api_frame(endpoint, min_year, max_year):
+    if endpoint == 'total':
+        return cube.select(TOTAL_KEYS, min_year, max_year).drop(columns=CATEGORY_COLUMNS)
+    if endpoint == 'sex':
+        frame = cube.select(SEX_KEYS, min_year, max_year).drop(columns=['Alterskategorie'])
+        frame['Geschlecht'] = frame['Geschlecht'].astype(str)
+        return frame
+    if endpoint == 'age-groups':
+        frame = pd.DataFrame({var: age_means.means(var, AGE_KEYS, min_year, max_year) for var in df.columns[3:]})
+        frame.insert(0, 'Alterskategorie', [key[1] for key in AGE_KEYS])
+        return frame
+    raise KeyError(endpoint)
+
+
+@functools.lru_cache(maxsize=512)
+def api_body(endpoint, min_year, max_year, fmt, version):
+    # version (Datenstand) gehört zum Schlüssel: nach dem Nachladen werden alle Antworten neu erzeugt
+    # Die Antwort ist bereits kodiert (JSON bzw. Arrow) und wird unverändert abgelegt
+    return shared_result('api_body', (endpoint, min_year, max_year, fmt),
+                         lambda: api_payload(endpoint, min_year, max_year, fmt, version), version,
+                         encode=bytes, decode=bytes)
+
+
+def api_payload(endpoint, min_year, max_year, fmt, version):
+    frame = api_frame(endpoint, min_year, max_year).reset_index(drop=True)
+    if fmt == 'arrow':
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({'data_version': version, 'years': f'{min_year}-{max_year}'})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    records = frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+    return pio.json.to_json_plotly({'data_version': version, 'years': [min_year, max_year],
+                                    'data': records}).encode()
+
+
+def api_format():
+    fmt = request.args.get('format')
+    if fmt is None:
+        best = request.accept_mimetypes.best_match(['application/json', ARROW_TYPE], default='application/json')
+        fmt = 'arrow' if best == ARROW_TYPE else 'json'
+    if fmt not in ('json', 'arrow'):
+        raise ValueError(f'Format {fmt} nicht unterstützt (json, arrow)')
+    return fmt
+
+
+@server.route('/api/v1/')
+def api_index():
+    return jsonify({'data_version': data_version,
+                    'years': [controls['min'], controls['max']],
+                    'variables': list(df.columns[3:]),
+                    'age_groups': [key[1] for key in AGE_KEYS],
+                    'endpoints': ['/api/v1/total', '/api/v1/sex', '/api/v1/age-groups'],
+                    'formats': ['json'] + (['arrow'] if ARROW else [])})
+
+
+@server.route('/api/v1/<endpoint>')
+def api_aggregates(endpoint):
+    if endpoint not in ('total', 'sex', 'age-groups'):
+        return jsonify({'status': 'error', 'message': f'Unbekannter Endpunkt: {endpoint}'}), 404
+    try:
+        years, fmt = year_param(request.args), api_format()
+    except ValueError as error:
+        return jsonify({'status': 'error', 'message': str(error)}), 400
+    if fmt == 'arrow' and not ARROW:
+        return jsonify({'status': 'error', 'message': 'Arrow benötigt pyarrow (pip install pyarrow)'}), 406
+
+    version = data_version
+    response = server.response_class(mimetype=ARROW_TYPE if fmt == 'arrow' else 'application/json')
+    response.set_etag(hashlib.sha1(f'{version}|{endpoint}|{years[0]}-{years[1]}|{fmt}'.encode()).hexdigest())
+    response.last_modified = int(version.split('-')[0]) // 1_000_000_000
+    response.cache_control.public = True
+    response.cache_control.max_age = API_MAX_AGE
+    response.vary.add('Accept')
+    if not is_resource_modified(request.environ, etag=response.get_etag()[0], last_modified=response.last_modified):
+        response.status_code = 304
+        return response
+    response.set_data(api_body(endpoint, years[0], years[1], fmt, version))
+    return response
+
+
+"""
+-----------------------------------------------------------------------------------------
+Section 20:
+Fast Start: Layout ETag, Warm-up and Startup Profile
+"""
+# Das Layout ändert sich nur beim Nachladen (update_layout, Section 15). Dash liefert es selbst
+# aus (serve_layout mit seinen Hooks und der Validierung); dieser after_request-Hook ergänzt ein
+# ETag aus dem Inhalt, wiederholte Seitenaufrufe erhalten 304 ohne erneute Übertragung.
+LAYOUT_PATH = app.config.routes_pathname_prefix + '_dash-layout'
+
+
+def layout_etag(response):
+    if request.path != LAYOUT_PATH or response.status_code != 200:
+        return response
+    response.add_etag()
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+# Nach Section 17 registriert und damit vor compress_response ausgeführt: das ETag gilt dem
+# unkomprimierten Layout
+server.after_request(layout_etag)
+
+
+def warm_up():
+    # Optional im gunicorn-Master vor dem fork (gunicorn.conf.py): erst bei Bedarf geladene
+    # Module und Startfiguren vorbereiten und Dash einmal das Layout ausliefern lassen (beim
+    # ersten Request richtet Dash Callback-Liste und Routen ein). Die Worker erben alles per fork
+    # und beantworten schon den ersten Request ohne Aufbauarbeit.
+    for module in ('concurrent.futures.process', 'ingest', 'kaleido'):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    server.test_client().get(LAYOUT_PATH)
+    full_range = [controls['min'], controls['max']]
+    update_graph_1(full_range)
+    update_graph_2(None, full_range)
+
+
+def startup_report():
+    lines = [f'Startprofil app.py (Budget {STARTUP_BUDGET * 1000:.0f} ms):']
+    for (_, previous), (phase, at) in zip(startup_marks, startup_marks[1:]):
+        lines.append(f'    {phase:<10}{(at - previous) * 1000:8.1f} ms')
+    total = startup_marks[-1][1] - startup_marks[0][1]
+    status = 'überschritten' if total > STARTUP_BUDGET else 'eingehalten'
+    lines.append(f"    {'gesamt':<10}{total * 1000:8.1f} ms ({status})")
+    return '\n'.join(lines)
 
 
+startup_mark('routes')
 
+if STARTUP_BUDGET > 0:
+    print(startup_report(), file=sys.stderr)
 
 if __name__ == '__main__':
-    # run the app in server port 8051:
-    app.run_server(port=8051, debug=True)
+    start_build_pool()
+    start_watcher()
+    # run the app in server port 8051 (Entwicklungsserver; Produktivbetrieb: gunicorn app:server)
+    app.run(port=8051, debug=os.environ.get('DASHBOARD_DEBUG', '1') == '1')
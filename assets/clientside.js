@@ -0,0 +1,184 @@
+// Clientside Callbacks: reine UI-Logik, die ohne Server-Roundtrip im Browser läuft
+(function() {
+    // Zeilen einer Datenreihe ({Spalte: [Werte]}) auf den Jahresbereich einschränken
+    function select_years(group, years) {
+        var rows = {};
+        Object.keys(group).forEach(function(col) { rows[col] = []; });
+        group.Jahr.forEach(function(year, i) {
+            if (year >= years[0] && year <= years[1]) {
+                Object.keys(group).forEach(function(col) { rows[col].push(group[col][i]); });
+            }
+        });
+        return rows;
+    }
+
+    function concat_groups(groups) {
+        var rows = {};
+        groups.forEach(function(group) {
+            Object.keys(group).forEach(function(col) {
+                rows[col] = (rows[col] || []).concat(group[col]);
+            });
+        });
+        return rows;
+    }
+
+    function is_value(v) {
+        return v !== null && v !== undefined && !isNaN(v);
+    }
+
+    // Neues Figure-Objekt, damit dcc.Graph die Änderung erkennt
+    function copy_figure(figure) {
+        var layout = Object.assign({}, figure.layout);
+        Object.keys(layout).forEach(function(key) {
+            if (/^xaxis\d*$/.test(key)) {
+                layout[key] = Object.assign({}, layout[key]);
+            }
+        });
+        return {
+            data: figure.data.map(function(trace) { return Object.assign({}, trace); }),
+            layout: layout
+        };
+    }
+
+    // Wie '%g' in Python (6 signifikante Stellen)
+    function format_g(v) {
+        return String(parseFloat(v.toPrecision(6)));
+    }
+
+    function ols(x, y) {
+        var n = x.length, mean_x = 0, mean_y = 0, sxx = 0, sxy = 0, syy = 0;
+        for (var i = 0; i < n; i++) { mean_x += x[i] / n; mean_y += y[i] / n; }
+        for (var j = 0; j < n; j++) {
+            sxx += (x[j] - mean_x) * (x[j] - mean_x);
+            sxy += (x[j] - mean_x) * (y[j] - mean_y);
+            syy += (y[j] - mean_y) * (y[j] - mean_y);
+        }
+        var slope = sxy / sxx;
+        return {slope: slope, intercept: mean_y - slope * mean_x, r2: sxy * sxy / (sxx * syy)};
+    }
+
+    var no_update = function() { return window.dash_clientside.no_update; };
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            // Select Theme Mode
+            update_theme: function(selected_theme) {
+                var page_style, dropdown_class, tab_class;
+                if (selected_theme === 'dark') {
+                    page_style = {'backgroundColor': '#282E3B', 'color': 'white', 'padding': '20px'};
+                    dropdown_class = 'dark-dropdown-menu';
+                    tab_class = 'dark-tab';
+                } else {
+                    page_style = {'backgroundColor': '#EEEEEE', 'color': 'black', 'padding': '20px'};
+                    dropdown_class = 'light-dropdown-menu';
+                    tab_class = 'light-tab';
+                }
+                return [page_style, dropdown_class, dropdown_class, dropdown_class, dropdown_class,
+                        tab_class, tab_class, tab_class];
+            },
+
+            // Lazy Tabs: true beim ersten Öffnen des Tabs, danach keine Änderung mehr
+            render_tab: function(selected_tab, tab, rendered) {
+                if (selected_tab !== tab || rendered) { return no_update(); }
+                return true;
+            },
+
+            // Kontext Info Box
+            toggle_text_box: function(n_clicks, current_style) {
+                if (n_clicks === undefined || n_clicks === null) {
+                    return {'display': 'none'};
+                }
+                if (current_style && current_style.display === 'none') {
+                    return {'display': 'block'};
+                }
+                return {'display': 'none'};
+            },
+
+            // Liniendiagramme (Graph 1, 3, 5) - ein Trace pro Datenreihe
+            filter_lines: function(years, groups, figure) {
+                if (!groups || !figure) { return no_update(); }
+                var fig = copy_figure(figure);
+                var min_year = null;
+                fig.data.forEach(function(trace, i) {
+                    var rows = select_years(groups[i], years);
+                    trace.x = rows.Jahr;
+                    trace.y = rows.Allgemein;
+                    rows.Jahr.forEach(function(year) {
+                        if (min_year === null || year < min_year) { min_year = year; }
+                    });
+                });
+                fig.layout.xaxis.tick0 = min_year;
+                return fig;
+            },
+
+            // Streudiagramm (Graph 2) inkl. OLS-Trendlinie pro Teilbereich
+            filter_scatter: function(years, variables, groups, figure) {
+                if (!groups || !figure || !variables || variables.length === 0) { return no_update(); }
+                var fig = copy_figure(figure);
+                var rows = select_years(concat_groups(groups), years);
+                fig.data.forEach(function(trace) {
+                    var variable = trace.legendgroup;
+                    if (!(variable in rows)) { return; }
+                    if (trace.mode !== 'lines') {
+                        trace.x = rows[variable];
+                        trace.y = rows.Allgemein;
+                        return;
+                    }
+                    var pairs = [];
+                    rows[variable].forEach(function(v, i) {
+                        if (is_value(v) && is_value(rows.Allgemein[i])) { pairs.push([v, rows.Allgemein[i]]); }
+                    });
+                    pairs.sort(function(a, b) { return a[0] - b[0]; });
+                    var x = pairs.map(function(p) { return p[0]; });
+                    var fit = ols(x, pairs.map(function(p) { return p[1]; }));
+                    trace.x = x;
+                    trace.y = x.map(function(v) { return fit.intercept + fit.slope * v; });
+                    trace.hovertemplate = '<b>OLS trendline</b><br>Allgemein = ' + format_g(fit.slope) +
+                        ' * Value + ' + format_g(fit.intercept) + '<br>R<sup>2</sup>=' + fit.r2.toFixed(6) +
+                        '<br><br>Variable=' + variable + '<br>Value=%{x}<br>Allgemein=%{y} <b>(trend)</b><extra></extra>';
+                });
+                return fig;
+            },
+
+            // Histogramm (Graph 4) - ein Trace pro Geschlecht, Bins aus kumulierten Zählungen
+            filter_histogram: function(years, variable, bins, figure) {
+                if (!bins || !figure || !bins[variable]) { return no_update(); }
+                var fig = copy_figure(figure);
+                var b = bins[variable];
+                var lo = b.years.filter(function(year) { return year < years[0]; }).length;
+                var hi = b.years.filter(function(year) { return year <= years[1]; }).length;
+                var centers = b.edges.slice(1).map(function(edge, j) { return (b.edges[j] + edge) / 2; });
+                fig.data.forEach(function(trace, i) {
+                    var cumulative = b.cumulative[i];
+                    trace.x = centers;
+                    trace.y = cumulative[hi].map(function(count, j) { return count - cumulative[lo][j]; });
+                });
+                var values = b.year_min.slice(lo, hi).concat(b.year_max.slice(lo, hi)).filter(is_value);
+                var min_val = Math.min.apply(null, values);
+                var max_val = Math.max.apply(null, values);
+                Object.keys(fig.layout).forEach(function(key) {
+                    if (/^xaxis\d*$/.test(key) && values.length > 0) {
+                        fig.layout[key].tickvals = [min_val, max_val];
+                        fig.layout[key].ticktext = [min_val.toFixed(2), max_val.toFixed(2)];
+                    }
+                });
+                return fig;
+            },
+
+            // Balkendiagramm (Graph 6) - Mittelwert pro Alterskategorie aus den Präfixsummen
+            group_means: function(years, variable, prefix, figure) {
+                if (!prefix || !figure) { return no_update(); }
+                var fig = copy_figure(figure);
+                var lo = prefix.years.filter(function(year) { return year < years[0]; }).length;
+                var hi = prefix.years.filter(function(year) { return year <= years[1]; }).length;
+                var col = prefix.variables.indexOf(variable);
+                fig.data.forEach(function(trace, i) {
+                    var sum = prefix.sums[i][hi][col] - prefix.sums[i][lo][col];
+                    var count = prefix.counts[i][hi][col] - prefix.counts[i][lo][col];
+                    trace.x = [count > 0 ? sum / (count * prefix.scale) : null];
+                });
+                return fig;
+            }
+        }
+    });
+})();
@@ -0,0 +1,234 @@
+"""
+Benchmark: alle Dashboard-Callbacks mit systematisch variierten Eingaben
+
+Ruft update_graph_1 bis update_graph_6 direkt auf (ohne Figure-Cache, inkl.
+JSON-Serialisierung wie in der Dash-Antwort) und variiert dabei:
+    - alle Jahresbereiche der Slider (min <= max)
+    - alle Teilmengen von dropdown_2 (Graph 2, beim vollen Jahresbereich) sowie alle
+      Jahresbereiche mit einer festen Auswahl; --full: vollständiges Kreuzprodukt
+    - jeden Teilbereich in dropdown_4 / dropdown_6
+update_theme und toggle_text_box laufen als Clientside-Callbacks im Browser; sie werden mit
+Node.js (falls vorhanden) direkt aus assets/clientside.js gemessen.
+
+Jede Skalierung läuft in einem frischen Prozess gegen den ausgelieferten Datensatz (x1) bzw.
+einen synthetischen Datensatz mit x-fach wiederholten Zeilen. Ausgegeben werden p50/p99 der
+Laufzeit, die maximale Speicherallokation pro Aufruf (tracemalloc, auf einer Stichprobe) und
+die mittlere JSON-Grösse. --save schreibt eine Baseline, --compare meldet Regressionen
+(Exit-Code 1), wenn p50 oder die JSON-Grösse die Baseline um mehr als --threshold übersteigt.
+
+    python benchmarks/bench_callbacks.py --scales 1 10 100 --save benchmarks/baseline.json
+    python benchmarks/bench_callbacks.py --scales 1 10 100 --compare benchmarks/baseline.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CLIENTSIDE = """
+global.window = {dash_clientside: {no_update: null}};
+require(%s);
+const fns = window.dash_clientside.dashboard;
+const cases = {
+    update_theme: [['dark'], ['light']],
+    toggle_text_box: [[null, null], [1, {display: 'none'}], [2, {display: 'block'}]]
+};
+const result = {};
+for (const [name, inputs] of Object.entries(cases)) {
+    const times = [], sizes = [];
+    for (let i = 0; i < %d; i++) {
+        const args = inputs[i %% inputs.length];
+        const start = process.hrtime.bigint();
+        const out = fns[name](...args);
+        times.push(Number(process.hrtime.bigint() - start) / 1e9);
+        sizes.push(JSON.stringify(out).length);
+    }
+    result[name] = {times: times, sizes: sizes};
+}
+console.log(JSON.stringify(result));
+"""
+
+
+def make_dataset(scale, directory):
+    # Synthetischer Datensatz: die Originalzeilen scale-mal wiederholt (wie bench_loader.py)
+    source = pd.read_csv(os.path.join(ROOT, 'assets', 'Zufriedenheit_raw.csv'), sep=';', dtype=str,
+                         keep_default_na=False, encoding='utf-8-sig')
+    path = os.path.join(directory, f'Zufriedenheit_x{scale}.csv')
+    pd.concat([source] * scale, ignore_index=True).to_csv(path, sep=';', index=False)
+    return path
+
+
+def sweep_cases(app, full=False):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    ranges = [[lo, hi] for lo, hi in itertools.combinations_with_replacement(years, 2)]
+    full_range = [years[0], years[-1]]
+    dropdown_2 = list(app.df.columns[4:])
+    subsets = [list(subset) for n in range(1, len(dropdown_2) + 1)
+               for subset in itertools.combinations(dropdown_2, n)]
+    variables = list(app.df.columns[3:])
+
+    if full:
+        cases_2 = [(subset, r) for subset in [None] + subsets for r in ranges]
+    else:
+        cases_2 = ([(subset, full_range) for subset in [None] + subsets]
+                   + [(dropdown_2[:2], r) for r in ranges])
+    return {
+        'update_graph_1': [(r,) for r in ranges],
+        'update_graph_2': cases_2,
+        'update_graph_3': [(r,) for r in ranges],
+        'update_graph_4': [(var, r) for var in variables for r in ranges],
+        'update_graph_5': [(r,) for r in ranges],
+        'update_graph_6': [(r, var) for var in variables for r in ranges],
+    }
+
+
+def run_sweep(args):
+    # Läuft im Worker-Prozess: app.py lädt den Datensatz aus DASHBOARD_DATA_PATH
+    import plotly.io as pio
+
+    sys.path.insert(0, ROOT)
+    import app
+
+    def call(func, case):
+        # Zwischenergebnisse der OLS-Koeffizienten nicht über Fälle hinweg wiederverwenden
+        app.ols_fits.cache_clear()
+        return pio.to_json(func(*case), validate=False)
+
+    rng = random.Random(args.seed)
+    results = {}
+    for name, cases in sweep_cases(app, args.full).items():
+        func = getattr(app, name).__wrapped__  # ohne Figure-Cache
+        if args.sample and len(cases) > args.sample:
+            cases = rng.sample(cases, args.sample)
+        call(func, cases[0])  # Aufwärmen (Imports, Plotly-Validatoren)
+
+        times, sizes = [], []
+        for case in cases:
+            start = time.perf_counter()
+            payload = call(func, case)
+            times.append(time.perf_counter() - start)
+            sizes.append(len(payload))
+
+        peaks = []
+        tracemalloc.start()
+        for case in cases[:args.alloc_cases]:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            call(func, case)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.stop()
+
+        results[name] = summarize(times, sizes, peaks)
+    results['rows'] = len(app.df)
+    return results
+
+
+def summarize(times, sizes, peaks=()):
+    return {'cases': len(times),
+            'p50_ms': float(np.percentile(times, 50) * 1000),
+            'p99_ms': float(np.percentile(times, 99) * 1000),
+            'alloc_kb': float(max(peaks) / 1024) if peaks else None,
+            'json_kb': float(np.mean(sizes) / 1024)}
+
+
+def run_clientside(repeat):
+    node = shutil.which('node')
+    if node is None:
+        return {}
+    script = CLIENTSIDE % (json.dumps(os.path.join(ROOT, 'assets', 'clientside.js')), repeat)
+    result = subprocess.run([node, '-e', script], capture_output=True, text=True, check=True)
+    return {name: summarize(r['times'], r['sizes'])
+            for name, r in json.loads(result.stdout.strip().splitlines()[-1]).items()}
+
+
+def run_scale(scale, args, tmp):
+    data_path = os.path.join(ROOT, 'assets', 'Zufriedenheit_raw.csv') if scale == 1 else make_dataset(scale, tmp)
+    env = dict(os.environ, DASHBOARD_DATA_PATH=data_path, DASHBOARD_CACHE_DIR=os.path.join(tmp, f'cache_{scale}'),
+               DASHBOARD_CLIENTSIDE_FILTERING='0', DASHBOARD_METRICS='0')
+    command = [sys.executable, os.path.abspath(__file__), '--worker', '--seed', str(args.seed),
+               '--sample', str(args.sample), '--alloc-cases', str(args.alloc_cases)] + (['--full'] if args.full else [])
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for scale, callbacks in results['scales'].items():
+        for name, current in callbacks.items():
+            previous = baseline['scales'].get(scale, {}).get(name)
+            if not isinstance(current, dict) or not previous:
+                continue
+            for metric in ('p50_ms', 'json_kb'):
+                if current[metric] > previous[metric] * (1 + threshold):
+                    regressions.append(f'x{scale} {name} {metric}: {previous[metric]:.2f} -> {current[metric]:.2f}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--sample', type=int, default=200, help='max. Fälle pro Callback (0 = alle)')
+    parser.add_argument('--alloc-cases', type=int, default=10, help='Fälle für die Allokationsmessung')
+    parser.add_argument('--full', action='store_true', help='Graph 2: alle Teilmengen x alle Jahresbereiche')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='Ergebnisse als Baseline (JSON) speichern')
+    parser.add_argument('--compare', help='Mit Baseline (JSON) vergleichen')
+    parser.add_argument('--threshold', type=float, default=0.2, help='erlaubte Verschlechterung (0.2 = 20%%)')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_sweep(args)))
+        return
+
+    import dash
+    import plotly
+    results = {'environment': {'python': platform.python_version(), 'machine': platform.machine(),
+                               'pandas': pd.__version__, 'plotly': plotly.__version__, 'dash': dash.__version__},
+               'settings': {'sample': args.sample, 'full': args.full, 'seed': args.seed},
+               'scales': {}}
+
+    print(f"{'Callback':<18}{'Skala':>7}{'Zeilen':>10}{'Fälle':>7}{'p50 [ms]':>10}{'p99 [ms]':>10}"
+          f"{'Alloc [KB]':>12}{'JSON [KB]':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            callbacks = run_scale(scale, args, tmp)
+            results['scales'][str(scale)] = callbacks
+            for name, r in callbacks.items():
+                if isinstance(r, dict):
+                    print(f"{name:<18}{'x' + str(scale):>7}{callbacks['rows']:>10}{r['cases']:>7}{r['p50_ms']:>10.2f}"
+                          f"{r['p99_ms']:>10.2f}{r['alloc_kb']:>12.0f}{r['json_kb']:>11.1f}")
+
+    clientside = run_clientside(repeat=1000)
+    results['clientside'] = clientside
+    for name, r in clientside.items():
+        print(f"{name:<18}{'JS':>7}{'-':>10}{r['cases']:>7}{r['p50_ms']:>10.4f}{r['p99_ms']:>10.4f}"
+              f"{'-':>12}{r['json_kb']:>11.2f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+        print('Keine Regressionen gegenüber der Baseline.')
+
+
+if __name__ == '__main__':
+    main()
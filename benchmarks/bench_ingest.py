@@ -0,0 +1,86 @@
+"""
+Benchmark: Mikrodaten-Import (ingest.py) bei 1M / 10M / 50M Zeilen
+
+Erzeugt synthetische Befragtendaten (blockweise, ohne die ganze Datei im Speicher zu halten),
+aggregiert sie in einem frischen Prozess und misst Laufzeit und maximalen Speicher (RSS).
+Der Speicher sollte mit der Blockgrösse wachsen, nicht mit der Anzahl Zeilen. Mit --workers
+wird dieselbe Datei zusätzlich mit mehreren Prozessen aggregiert (Skalierung über die Kerne);
+der RSS ist dann die Summe aus Hauptprozess und grösstem Worker.
+
+    python benchmarks/bench_ingest.py --rows 1000000 10000000 50000000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import ingest  # noqa: E402
+
+SEXES = ['Frauen', 'Männer']
+AGES = ['16-17 Jahre', '18-24 Jahre', '25-49 Jahre', '50-64 Jahre', '65 Jahre +']
+
+WORKER = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import ingest
+start = time.perf_counter()
+moments = ingest.aggregate({path!r}, chunksize={chunksize}, workers={workers})
+ingest.write_outputs(moments, {out!r})
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+print(json.dumps({{'seconds': time.perf_counter() - start, 'max_rss_mb': rss / 1024}}))
+"""
+
+
+def make_microdata(path, rows, block=1_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    written = 0
+    while written < rows:
+        n = min(block, rows - written)
+        chunk = pd.DataFrame({
+            'Jahr': rng.integers(2007, 2023, n),
+            'Geschlecht': rng.choice(SEXES, n),
+            'Alterskategorie': rng.choice(AGES, n)})
+        for var in ingest.VARIABLES:
+            values = np.clip(np.rint(rng.normal(8, 1.5, n)), 0, 10)
+            values[rng.random(n) < 0.05] = np.nan  # keine Angabe
+            chunk[var] = values
+        chunk.to_csv(path, sep=';', index=False, header=written == 0, mode='w' if written == 0 else 'a',
+                     na_rep='#NA', float_format='%.0f')
+        written += n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument('--chunksize', type=int, default=250_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    args = parser.parse_args()
+
+    print(f"{'Zeilen':>12}{'Datei [MB]':>12}{'Prozesse':>10}{'Zeit [s]':>10}{'Zeilen/s':>12}"
+          f"{'Speedup':>9}{'max RSS [MB]':>14}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mikrodaten.csv')
+            make_microdata(path, rows)
+            size_mb = os.path.getsize(path) / 1024 ** 2
+            baseline = None
+            for workers in args.workers:
+                code = WORKER.format(root=ROOT, path=path, chunksize=args.chunksize, workers=workers,
+                                     out=os.path.join(tmp, 'out'))
+                result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+                result = json.loads(result.stdout.strip().splitlines()[-1])
+                baseline = baseline or result['seconds']
+                print(f"{rows:>12,}{size_mb:>12.0f}{workers:>10}{result['seconds']:>10.1f}"
+                      f"{rows / result['seconds']:>12,.0f}{baseline / result['seconds']:>9.2f}"
+                      f"{result['max_rss_mb']:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Lasttest: viele gleichzeitige Sitzungen gegen den Produktivserver (gunicorn, gunicorn.conf.py)
+
+Jede Sitzung hält eine Keep-Alive-Verbindung, lädt zuerst das Layout und sendet danach
+Callback-Requests mit zufälligen Eingaben:
+    graph_1   Slider-Änderung (günstig, meist dash.Patch)
+    graph_2   Auswahl in dropdown_2 (rechenintensiv: Streudiagramm mit Trendlinien)
+Zwischen zwei Requests wartet eine Sitzung --think Sekunden (0 = Sättigung). Ausgegeben werden
+Requests pro Sekunde, Fehler sowie p50/p99 der Antwortzeit pro Callback, damit sichtbar wird,
+ob langsame Graph-2-Aufrufe die günstigen blockieren.
+
+Mit --start wird gunicorn selbst gestartet (--workers, --threads, --build-processes), sonst
+wird der Server unter --url verwendet. Der Client nutzt nur asyncio (ein Prozess, keine Threads).
+
+    python benchmarks/bench_load.py --start --sessions 500 --duration 30 --build-processes 2
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YEARS = list(range(2007, 2023))
+VARIABLES = ['Finanzen', 'Alleinleben', 'Zusammenleben', 'Beziehungen', 'Gesundheit',
+             'Wohnsituation', 'Arbeitsbedingungen', 'Arbeitsklima']
+
+
+def random_range(rng):
+    return sorted(rng.sample(YEARS, 2))
+
+
+def graph_1_body(rng):
+    return {'output': 'graph_1.figure', 'outputs': {'id': 'graph_1', 'property': 'figure'},
+            'inputs': [{'id': 'slider_1', 'property': 'value', 'value': random_range(rng)}],
+            'state': [], 'changedPropIds': ['slider_1.value']}
+
+
+def graph_2_body(rng):
+    selection = rng.sample(VARIABLES, rng.randint(1, len(VARIABLES)))
+    return {'output': ('..graph_2.figure...selection_2.data...job_2.data...poll_2.disabled'
+                       '...progress_2.value...progress_2.style..'),
+            'outputs': [{'id': 'graph_2', 'property': 'figure'}, {'id': 'selection_2', 'property': 'data'},
+                        {'id': 'job_2', 'property': 'data'}, {'id': 'poll_2', 'property': 'disabled'},
+                        {'id': 'progress_2', 'property': 'value'}, {'id': 'progress_2', 'property': 'style'}],
+            'inputs': [{'id': 'dropdown_2', 'property': 'value', 'value': selection},
+                       {'id': 'slider_1', 'property': 'value', 'value': random_range(rng)}],
+            'state': [{'id': 'selection_2', 'property': 'data', 'value': None},
+                      {'id': 'job_2', 'property': 'data', 'value': None}],
+            'changedPropIds': ['dropdown_2.value']}
+
+
+class Connection:
+    # Minimaler HTTP/1.1-Client mit Keep-Alive (Content-Length oder chunked)
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        head = (f'{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nAccept-Encoding: gzip\r\n'
+                f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n')
+        reused = self.writer is not None
+        if not reused:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(head.encode() + payload)
+        status_line = await self.reader.readline()
+        if not status_line and reused:
+            # Vom Server nach keepalive Sekunden geschlossen: einmal neu verbinden
+            self.close()
+            return await self.request(method, path, body)
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if headers.get('transfer-encoding') == 'chunked':
+            while size := int((await self.reader.readline()).strip(), 16):
+                await self.reader.readexactly(size + 2)
+            await self.reader.readline()
+        else:
+            await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def session(index, args, host, port, deadline, results):
+    rng = random.Random(args.seed * 100_003 + index)
+    connection = Connection(host, port)
+    await asyncio.sleep(rng.random() * args.ramp_up)
+    requests = [('layout', 'GET', '/_dash-layout', None)]
+    while time.perf_counter() < deadline:
+        if not requests:
+            kind = 'graph_2' if rng.random() < args.heavy_share else 'graph_1'
+            body = graph_2_body(rng) if kind == 'graph_2' else graph_1_body(rng)
+            requests.append((kind, 'POST', '/_dash-update-component', body))
+        kind, method, path, body = requests.pop()
+        start = time.perf_counter()
+        try:
+            status = await connection.request(method, path, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as error:
+            connection.close()
+            status = type(error).__name__
+        results.append((kind, start, time.perf_counter() - start, status))
+        if args.think:
+            await asyncio.sleep(min(rng.expovariate(1 / args.think), max(deadline - time.perf_counter(), 0)))
+    connection.close()
+
+
+async def run_load(args):
+    url = urlsplit(args.url)
+    results = []
+    # Gemessen wird nur nach dem Anlauf, wenn alle Sitzungen aktiv sind
+    measure_from = time.perf_counter() + args.ramp_up
+    deadline = measure_from + args.duration
+    await asyncio.gather(*(session(i, args, url.hostname, url.port or 80, deadline, results)
+                           for i in range(args.sessions)))
+    return [(kind, latency, status) for kind, start, latency, status in results
+            if measure_from <= start and start + latency <= deadline]
+
+
+def start_server(args):
+    env = dict(os.environ, DASHBOARD_BIND=urlsplit(args.url).netloc, DASHBOARD_WORKERS=str(args.workers),
+               DASHBOARD_THREADS=str(args.threads), DASHBOARD_BUILD_PROCESSES=str(args.build_processes))
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:server', '--log-level', 'warning'],
+                               cwd=ROOT, env=env)
+    for _ in itertools.count():
+        try:
+            urllib.request.urlopen(args.url + '/_dash-layout', timeout=1)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                sys.exit('gunicorn konnte nicht gestartet werden')
+            time.sleep(0.2)
+
+
+def report(results, args):
+    print(f'{args.sessions} Sitzungen, {args.duration:.0f} s (+{args.ramp_up:.0f} s Anlauf), '
+          f'Denkzeit {args.think} s, Anteil Graph 2 {args.heavy_share:.0%}')
+    print(f"{'Request':<10}{'Anzahl':>9}{'Fehler':>8}{'p50 [ms]':>10}{'p99 [ms]':>10}")
+    for kind in ('layout', 'graph_1', 'graph_2'):
+        rows = [(latency, status) for k, latency, status in results if k == kind]
+        if not rows:
+            continue
+        latencies = np.array([latency for latency, _ in rows]) * 1000
+        errors = sum(status not in (200, 204) for _, status in rows)
+        print(f'{kind:<10}{len(rows):>9}{errors:>8}{np.percentile(latencies, 50):>10.1f}'
+              f'{np.percentile(latencies, 99):>10.1f}')
+    ok = sum(status in (200, 204) for _, _, status in results)
+    print(f'Durchsatz: {ok / args.duration:.0f} Requests/s ({ok} erfolgreich in {args.duration:.0f} s)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8051')
+    parser.add_argument('--sessions', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=30, help='Messdauer in Sekunden')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Sitzungen starten verteilt über diese Zeit')
+    parser.add_argument('--think', type=float, default=1.0, help='mittlere Denkzeit zwischen Requests (s)')
+    parser.add_argument('--heavy-share', type=float, default=0.2, help='Anteil der Graph-2-Requests')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', action='store_true', help='gunicorn mit gunicorn.conf.py starten')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--build-processes', type=int, default=0)
+    args = parser.parse_args()
+
+    process = start_server(args) if args.start else None
+    try:
+        results = asyncio.run(run_load(args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    report(results, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: Worker-Start mit pd.read_csv vs. spaltenweisem .npy-Cache (Memory-Mapping)
+
+Jede Variante läuft in einem frischen Python-Prozess (wie ein neu gestarteter Worker).
+Gemessen werden die Importzeit von app.py, die reine Ladezeit und der Speicher (max. RSS).
+
+    python benchmarks/bench_loader.py --scale 1000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import json, resource, time
+start = time.perf_counter()
+import app
+import_time = time.perf_counter() - start
+
+start = time.perf_counter()
+frame = app.load_dataset(app.data_path) if app.DATA_CACHE else app.read_source(app.data_path)
+load_time = time.perf_counter() - start
+
+print(json.dumps({'import_s': import_time,
+                  'load_s': load_time,
+                  'rows': len(frame),
+                  'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def make_dataset(scale, directory):
+    # Synthetischer Datensatz: die Originalzeilen scale-mal wiederholt
+    source = pd.read_csv(os.path.join(ROOT, 'assets', 'Zufriedenheit_raw.csv'), sep=';', dtype=str,
+                         keep_default_na=False, encoding='utf-8-sig')
+    path = os.path.join(directory, f'Zufriedenheit_x{scale}.csv')
+    pd.concat([source] * scale, ignore_index=True).to_csv(path, sep=';', index=False)
+    return path
+
+
+def run_worker(data_path, cache_dir, use_cache):
+    env = dict(os.environ,
+               DASHBOARD_DATA_PATH=data_path,
+               DASHBOARD_CACHE_DIR=cache_dir,
+               DASHBOARD_DATA_CACHE='1' if use_cache else '0')
+    result = subprocess.run([sys.executable, '-c', WORKER], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=1, help='Vervielfachung der Originalzeilen')
+    parser.add_argument('--repeat', type=int, default=3, help='Wiederholungen pro Variante')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = make_dataset(args.scale, tmp)
+        cache_dir = os.path.join(tmp, 'cache')
+
+        variants = [('read_csv', False), ('npy cache (kalt)', True)] + \
+                   [('npy cache (warm)', True)] * args.repeat
+        print(f"{'Variante':<20}{'Zeilen':>10}{'Import [s]':>12}{'Laden [s]':>12}{'max RSS [MB]':>14}")
+        for label, use_cache in variants:
+            if not use_cache:
+                runs = [run_worker(data_path, cache_dir, False) for _ in range(args.repeat)]
+                result = min(runs, key=lambda r: r['import_s'])
+            else:
+                result = run_worker(data_path, cache_dir, True)
+            print(f"{label:<20}{result['rows']:>10}{result['import_s']:>12.3f}"
+                  f"{result['load_s']:>12.4f}{result['max_rss_mb']:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: Level of Detail für lange Datenreihen (Section 7 in app.py)
+
+Die Jahreswerte des Datensatzes bleiben unter der Verdichtungsgrenze. Gemessen wird deshalb an
+synthetischen Reihen (monatliche Werte bzw. Befragte, Saisonmuster mit Rauschen und einigen
+Ausreissern) mit --sizes Punkten:
+    - Laufzeit von lttb und minmax
+    - übertragene Bytes der Trace-Daten (x/y als Typed Array) vor und nach der Verdichtung
+    - Treue: mittlere Abweichung der Originalpunkte von der verdichteten Linie (in % der
+      Wertespanne) und ob der grösste Ausreisser erhalten bleibt
+
+    python benchmarks/bench_lod.py --sizes 10000 100000 1000000 --points 800
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+
+
+def series(size, seed):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(2007, 2023, size)
+    y = 8 + 0.15 * np.sin(2 * np.pi * x) + 0.05 * np.sin(0.7 * x) + rng.normal(0, 0.03, size)
+    outliers = rng.choice(size, max(size // 20_000, 1), replace=False)
+    y[outliers] += rng.choice([-1, 1], len(outliers)) * 0.5
+    return x, y
+
+
+def payload(x, y):
+    return len(json.dumps({'x': app.typed_array(x), 'y': app.typed_array(y)}))
+
+
+def deviation(x, y, xs, ys):
+    # Abstand der Originalpunkte zur (linear interpolierten) verdichteten Linie
+    return np.mean(np.abs(np.interp(x, xs, ys) - y)) / (y.max() - y.min())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--points', type=int, default=app.LOD_POINTS, help='Zielpunkte (Pixelbreite)')
+    parser.add_argument('--repeat', type=int, default=5, help='Wiederholungen pro Messung (Minimum zählt)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    app.LOD_POINTS = args.points
+    print(f"{'Punkte':>10}{'Methode':>9}{'Zeit [ms]':>11}{'roh [KB]':>10}{'LOD [KB]':>10}{'behalten':>10}"
+          f"{'Abw. [%]':>10}{'Ausreisser':>12}")
+    for size in args.sizes:
+        x, y = series(size, args.seed)
+        peak = np.argmax(np.abs(y - np.median(y)))
+        for method in app.LOD_METHODS:
+            app.LOD_METHOD = method
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                xs, ys = app.level_of_detail(x, y)
+                times.append(time.perf_counter() - start)
+            kept = 'ja' if np.any(xs == x[peak]) else 'nein'
+            print(f'{size:>10}{method:>9}{min(times) * 1000:>11.2f}{payload(x, y) / 1024:>10.1f}'
+                  f'{payload(xs, ys) / 1024:>10.1f}{len(xs):>10}{deviation(x, y, xs, ys) * 100:>10.1f}{kept:>12}')
+    print(f'\nWebGL (scattergl) ab {app.WEBGL_THRESHOLD} Punkten pro Trace (DASHBOARD_WEBGL_THRESHOLD)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark und Abgleich: OLS-Trendlinien in Graph 2
+
+Vergleicht die NumPy-Regression aus app.py (ols_fits) mit der statsmodels-Regression, die
+plotly.express bei trendline='ols' verwendet: Laufzeit pro Figur und maximale Abweichung von
+Steigung, Achsenabschnitt und R² über alle Teilbereiche und Jahresbereiche.
+
+    python benchmarks/bench_ols.py
+"""
+import os
+import sys
+import time
+
+import plotly.express as px
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+
+TOLERANCE = 1e-9
+
+
+def statsmodels_fits(min_year, max_year, variables):
+    import statsmodels.api as sm
+
+    filtered_df = app.cube.select(app.SEX_KEYS, min_year, max_year)
+    fits = {}
+    for var in variables:
+        pairs = filtered_df[[var, 'Allgemein']].dropna()
+        result = sm.OLS(pairs['Allgemein'].to_numpy(), sm.add_constant(pairs[var].to_numpy())).fit()
+        fits[var] = {'intercept': result.params[0], 'slope': result.params[1], 'r2': result.rsquared}
+    return fits
+
+
+def px_trendline_figure(min_year, max_year, variables):
+    filtered_df = app.cube.select(app.SEX_KEYS, min_year, max_year)
+    melted_df = filtered_df.melt(id_vars=['Jahr', 'Allgemein'], value_vars=variables,
+                                 var_name='Variable', value_name='Value')
+    return px.scatter(melted_df, x='Value', y='Allgemein', color='Variable', trendline='ols')
+
+
+def numpy_trendline_figure(min_year, max_year, variables):
+    # Wie update_graph_2, aber ohne Styling: Punkte per px, Trendlinien aus ols_fits
+    app.ols_fits.cache_clear()
+    filtered_df = app.cube.select(app.SEX_KEYS, min_year, max_year)
+    melted_df = filtered_df.melt(id_vars=['Jahr', 'Allgemein'], value_vars=variables,
+                                 var_name='Variable', value_name='Value')
+    fig = px.scatter(melted_df, x='Value', y='Allgemein', color='Variable')
+    fits = app.ols_fits(min_year, max_year)
+    for var in variables:
+        fig.add_trace(app.trendline_trace(filtered_df, var, None, fits[var]))
+    return fig
+
+
+def timed(func, *args, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    variables = list(app.df.columns[4:])
+    years = sorted(app.df['Jahr'].unique().tolist())
+    ranges = [(lo, hi) for lo in years for hi in years if hi - lo >= 2]
+
+    worst = 0.0
+    for min_year, max_year in ranges:
+        app.ols_fits.cache_clear()
+        ours = app.ols_fits(min_year, max_year)
+        reference = statsmodels_fits(min_year, max_year, variables)
+        for var in variables:
+            for key in ('slope', 'intercept', 'r2'):
+                worst = max(worst, abs(ours[var][key] - reference[var][key]))
+    status = 'OK' if worst <= TOLERANCE else 'ABWEICHUNG'
+    print(f'Abgleich mit statsmodels: {len(ranges)} Jahresbereiche x {len(variables)} Teilbereiche, '
+          f'max. Abweichung {worst:.2e} (Toleranz {TOLERANCE:.0e}) -> {status}')
+
+    first, last = years[0], years[-1]
+    px_time = timed(px_trendline_figure, first, last, variables)
+    numpy_time = timed(numpy_trendline_figure, first, last, variables)
+    fit_time = timed(lambda: (app.ols_fits.cache_clear(), app.ols_fits(first, last)))
+    print(f'Figur mit allen {len(variables)} Teilbereichen {first}-{last}: '
+          f'px trendline=ols {px_time * 1000:.1f} ms, NumPy-Trendlinien {numpy_time * 1000:.1f} ms '
+          f'(davon Regression über alle Teilbereiche {fit_time * 1000:.2f} ms, gecacht ~0 ms)')
+    return 0 if worst <= TOLERANCE else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Benchmark: Serialisierung und Übertragungsgrösse der Grafik-Callbacks
+
+Für update_graph_1 bis update_graph_6 (voller Jahresbereich, Graph 2 mit allen Teilbereichen)
+wird die Figur einmal aufgebaut und danach gemessen:
+    - Kodierzeit mit dem json-Modul und mit orjson (plotly.io, wie in der Dash-Antwort)
+    - Bytes ohne Komprimierung, mit gzip (Stufe 6) und brotli (Stufe 5, falls installiert)
+Zusätzlich die Bytes, die der Server (Section 17 in app.py) für einen Callback-Aufruf und die
+Skripte der Startseite tatsächlich sendet, mit und ohne Accept-Encoding.
+
+    python benchmarks/bench_serialize.py --repeat 200
+"""
+import argparse
+import gzip
+import os
+import re
+import sys
+import time
+
+from plotly.io.json import to_json_plotly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def cases():
+    years = sorted(app.df['Jahr'].unique().tolist())
+    full_range = [years[0], years[-1]]
+    return {'update_graph_1': (full_range,),
+            'update_graph_2': (list(app.df.columns[4:]), full_range),
+            'update_graph_3': (full_range,),
+            'update_graph_4': ('Allgemein', full_range),
+            'update_graph_5': (full_range,),
+            'update_graph_6': (full_range, 'Allgemein')}
+
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def encoded_sizes(payload):
+    sizes = {'raw': len(payload), 'gzip': len(gzip.compress(payload, compresslevel=6))}
+    if brotli is not None:
+        sizes['br'] = len(brotli.compress(payload, quality=5))
+    return sizes
+
+
+def wire_bytes(client, encoding):
+    # Ein Callback-Aufruf (Graph 2, alle Teilbereiche) und alle Skripte der Startseite
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    args = cases()['update_graph_2']
+    body = {'output': ('..graph_2.figure...selection_2.data...job_2.data...poll_2.disabled'
+                       '...progress_2.value...progress_2.style..'),
+            'outputs': [{'id': 'graph_2', 'property': 'figure'}, {'id': 'selection_2', 'property': 'data'},
+                        {'id': 'job_2', 'property': 'data'}, {'id': 'poll_2', 'property': 'disabled'},
+                        {'id': 'progress_2', 'property': 'value'}, {'id': 'progress_2', 'property': 'style'}],
+            'inputs': [{'id': 'dropdown_2', 'property': 'value', 'value': args[0]},
+                       {'id': 'slider_1', 'property': 'value', 'value': args[1]}],
+            'state': [{'id': 'selection_2', 'property': 'data', 'value': None},
+                      {'id': 'job_2', 'property': 'data', 'value': None}],
+            'changedPropIds': ['dropdown_2.value']}
+    callback = len(client.post('/_dash-update-component', json=body, headers=headers).data)
+    scripts = re.findall(r'src="(/[^"]+)"', client.get('/').data.decode())
+    page = sum(len(client.get(url, headers=headers).data) for url in ['/'] + scripts)
+    return callback, page
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=100, help='Wiederholungen pro Messung (Minimum zählt)')
+    args = parser.parse_args()
+
+    print(f"{'Callback':<16}{'json [ms]':>11}{'orjson [ms]':>13}{'Faktor':>8}{'roh [KB]':>10}"
+          f"{'gzip [KB]':>11}{'br [KB]':>9}")
+    for name, case in cases().items():
+        figure = getattr(app, name).__wrapped__(*case)  # ohne Figure-Cache
+        json_time = timed(lambda: to_json_plotly(figure, engine='json'), args.repeat)
+        orjson_time = timed(lambda: to_json_plotly(figure, engine='orjson'), args.repeat)
+        sizes = encoded_sizes(to_json_plotly(figure, engine='orjson').encode())
+        br = f"{sizes['br'] / 1024:>9.1f}" if 'br' in sizes else f"{'-':>9}"
+        print(f'{name:<16}{json_time * 1000:>11.3f}{orjson_time * 1000:>13.3f}{json_time / orjson_time:>8.1f}'
+              f"{sizes['raw'] / 1024:>10.1f}{sizes['gzip'] / 1024:>11.1f}{br}")
+
+    client = app.server.test_client()
+    encodings = [None, 'gzip'] + (['br'] if brotli is not None and app.brotli is not None else [])
+    print()
+    print(f"{'Accept-Encoding':<16}{'Callback [KB]':>15}{'Startseite [KB]':>17}")
+    for encoding in encodings:
+        callback, page = wire_bytes(client, encoding)
+        print(f"{encoding or '-':<16}{callback / 1024:>15.1f}{page / 1024:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
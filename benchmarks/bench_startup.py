@@ -0,0 +1,95 @@
+"""
+Benchmark: Kaltstart von app.py
+
+Startet --runs frische Python-Prozesse und misst jeweils:
+    - den Import von app.py, aufgeteilt in die Phasen des Startprofils (Section 20)
+    - die Zeit bis zur ersten Antwort auf /_dash-layout und den ersten Graph-1-Callback
+Ein zusätzlicher Lauf mit python -X importtime listet die Pakete, deren Import am meisten
+Zeit kostet (kumuliert, direkt von app.py bzw. dessen Modulen geladen).
+
+    python benchmarks/bench_startup.py --runs 5 --budget 1.0
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.server.test_client()
+client.get('/_dash-layout')
+layout = time.perf_counter()
+client.post('/_dash-update-component', json={
+    'output': 'graph_1.figure', 'outputs': {'id': 'graph_1', 'property': 'figure'},
+    'inputs': [{'id': 'slider_1', 'property': 'value', 'value': [app.controls['min'], app.controls['max']]}],
+    'state': [], 'changedPropIds': []})
+callback = time.perf_counter()
+phases = {phase: at - previous for (_, previous), (phase, at) in zip(app.startup_marks, app.startup_marks[1:])}
+print(json.dumps({'phases': phases, 'import': imported - start, 'layout': layout - imported,
+                  'callback': callback - layout}))
+"""
+
+
+def probe(env):
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_profile(env, top):
+    # Ausgabe von -X importtime: "import time: self | kumuliert | Name", Einrückung = Tiefe. Ein
+    # Modul erscheint nach seinen Unterimporten; der Teilbaum von app steht direkt vor 'app'.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    entries = [(len(match.group(2)) // 2, match.group(3), int(match.group(1)))
+               for match in (re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', line)
+                             for line in result.stderr.splitlines()) if match]
+    end = next(i for i, (depth, name, _) in enumerate(entries) if depth == 0 and name == 'app')
+    packages = {}
+    for depth, name, micros in reversed(entries[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            packages[name.split('.')[0]] = packages.get(name.split('.')[0], 0) + micros
+    return sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=1.0, help='Startbudget in Sekunden')
+    parser.add_argument('--top', type=int, default=10, help='Anzahl Pakete im Import-Profil')
+    args = parser.parse_args()
+
+    env = dict(os.environ, DASHBOARD_METRICS='0')
+    env.pop('DASHBOARD_STARTUP_BUDGET', None)
+    runs = [probe(env) for _ in range(args.runs)]
+
+    print(f'Median über {args.runs} frische Prozesse:')
+    for phase in runs[0]['phases']:
+        print(f"    {phase:<22}{np.median([run['phases'][phase] for run in runs]) * 1000:8.1f} ms")
+    total_import = np.median([run['import'] for run in runs])
+    ready = np.median([run['import'] + run['layout'] + run['callback'] for run in runs])
+    print(f"    {'Import gesamt':<22}{total_import * 1000:8.1f} ms")
+    print(f"    {'erstes /_dash-layout':<22}{np.median([run['layout'] for run in runs]) * 1000:8.1f} ms")
+    print(f"    {'erster Callback':<22}{np.median([run['callback'] for run in runs]) * 1000:8.1f} ms")
+    status = 'eingehalten' if ready <= args.budget else 'überschritten'
+    print(f"    {'bereit':<22}{ready * 1000:8.1f} ms (Budget {args.budget * 1000:.0f} ms {status})")
+
+    print('\nTeuerste Importe (kumuliert, python -X importtime):')
+    for name, micros in import_profile(env, args.top):
+        print(f'    {name:<30}{micros / 1000:8.1f} ms')
+    return 0 if ready <= args.budget else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+-----------------------------------------------------------------------------------------
+Bildexport (Batch)
+
+Rendert graph_1 bis graph_6 für alle Jahresbereiche (und je nach Grafik alle Teilbereiche bzw.
+alle Auswahlkombinationen von dropdown_2) als PNG/SVG in den Bild-Cache von app.py
+(.cache/images/<Datenstand>/). Der Endpunkt /export/<graph>.<format> liefert diese Dateien
+danach ohne Rendern aus; das Verzeichnis kann auch direkt statisch ausgeliefert werden.
+Bereits vorhandene Bilder werden übersprungen, Verzeichnisse älterer Datenstände gelöscht.
+
+Benötigt kaleido >= 1.0 (pip install kaleido, inkl. Chrome). Alle Figuren eines Blocks werden
+in einer Browser-Sitzung gerendert (plotly.io.write_images).
+
+    python export_images.py --graphs graph_1 graph_4 --formats png svg --theme light dark
+"""
+import argparse
+import itertools
+import os
+import shutil
+import time
+
+import plotly.io as pio
+
+import app
+
+
+def export_specs(graphs, sizes, themes, subsets):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    ranges = [f'{lo}-{hi}' for lo, hi in itertools.combinations_with_replacement(years, 2)]
+    variables = list(app.df.columns[3:])
+    if subsets:
+        selections = [','.join(subset) for n in range(0, len(variables))
+                      for subset in itertools.combinations(variables[1:], n)]
+    else:
+        selections = [''] + variables[1:] + [','.join(variables[1:])]
+
+    for graph, years_param, (width, height), theme in itertools.product(graphs, ranges, sizes, themes):
+        params = {'years': years_param, 'width': width, 'height': height, 'theme': theme}
+        if graph == 'graph_2':
+            for selection in selections:
+                yield app.export_request(graph, dict(params, variables=selection))
+        elif graph in ('graph_4', 'graph_6'):
+            for variable in variables:
+                yield app.export_request(graph, dict(params, variable=variable))
+        else:
+            yield app.export_request(graph, params)
+
+
+def prune(images_dir):
+    # Bilder früherer Datenstände entfernen
+    removed = 0
+    for version in os.listdir(images_dir) if os.path.isdir(images_dir) else []:
+        if version != app.data_version:
+            shutil.rmtree(os.path.join(images_dir, version))
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Grafiken vorab als Bilder in den Export-Cache rendern')
+    parser.add_argument('--graphs', nargs='+', default=['graph_1', 'graph_2', 'graph_3', 'graph_4', 'graph_5',
+                                                        'graph_6'])
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=sorted(app.IMAGE_FORMATS))
+    parser.add_argument('--sizes', nargs='+', default=['900x450'],
+                        choices=[f'{width}x{height}' for width, height in app.IMAGE_SIZES], help='Breite x Höhe')
+    parser.add_argument('--theme', nargs='+', default=['light'], choices=sorted(app.THEME_BACKGROUNDS))
+    parser.add_argument('--all-subsets', action='store_true',
+                        help='Graph 2: alle Auswahlkombinationen statt einzelner Teilbereiche und aller zusammen')
+    parser.add_argument('--batch', type=int, default=200, help='Figuren pro Browser-Sitzung')
+    args = parser.parse_args()
+
+    if not app.KALEIDO:
+        parser.error('kaleido ist nicht installiert (pip install kaleido)')
+    removed = prune(os.path.join(app.cache_dir, 'images'))
+
+    jobs = [(spec, fmt, app.image_path(spec, fmt))
+            for spec in export_specs(args.graphs, [tuple(map(int, size.split('x'))) for size in args.sizes],
+                                     args.theme, args.all_subsets)
+            for fmt in args.formats]
+    pending = [job for job in jobs if not os.path.exists(job[2])]
+    print(f'{len(jobs)} Bilder, davon {len(jobs) - len(pending)} bereits vorhanden '
+          f'({removed} alte Datenstände entfernt)')
+
+    start = time.perf_counter()
+    for i in range(0, len(pending), args.batch):
+        batch = pending[i:i + args.batch]
+        for _, _, path in batch:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # In temporäre Dateien rendern und erst danach umbenennen, damit der Endpunkt nie ein halbes
+        # Bild ausliefert
+        tmp_paths = [f'{path}.{os.getpid()}.tmp' for _, _, path in batch]
+        pio.write_images([app.export_figure(spec) for spec, _, _ in batch], tmp_paths,
+                         format=[fmt for _, fmt, _ in batch],
+                         width=[spec['width'] for spec, _, _ in batch],
+                         height=[spec['height'] for spec, _, _ in batch], validate=False)
+        for tmp_path, (_, _, path) in zip(tmp_paths, batch):
+            os.replace(tmp_path, path)
+        done = i + len(batch)
+        print(f'{done}/{len(pending)} gerendert ({done / (time.perf_counter() - start):.1f} Bilder/s)')
+
+
+if __name__ == '__main__':
+    main()
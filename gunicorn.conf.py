@@ -0,0 +1,42 @@
+# Gunicorn-Konfiguration für den Produktivbetrieb: gunicorn app:server
+# (Gunicorn liest diese Datei automatisch aus dem Arbeitsverzeichnis.)
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('DASHBOARD_BIND', '0.0.0.0:8051')
+workers = int(os.environ.get('DASHBOARD_WORKERS', multiprocessing.cpu_count()))
+
+# Threads pro Worker: Callback-Requests sind kurz und oft Cache-Treffer, viele gleichzeitige
+# Sitzungen teilen sich so wenige Prozesse. Ruhende Keep-Alive-Verbindungen belegen keinen
+# Thread, sondern warten im Poller des Workers (bis worker_connections).
+worker_class = 'gthread'
+threads = int(os.environ.get('DASHBOARD_THREADS', 8))
+worker_connections = int(os.environ.get('DASHBOARD_WORKER_CONNECTIONS', 1000))
+keepalive = 5
+timeout = 60
+
+# app.py wird einmal im Master importiert. Die Worker erben Datensatz, Würfel-Index und
+# Memory-Mappings per fork (Copy-on-Write), statt sie je Worker neu aufzubauen.
+preload_app = True
+
+
+def when_ready(server):
+    # Im Master vor dem Start der Worker: verzögert geladene Module, Dash-Routen und Startfiguren
+    # vorbereiten (Section 20 in app.py), abschaltbar mit DASHBOARD_WARM_UP=0
+    import app
+    if os.environ.get('DASHBOARD_WARM_UP', '1') == '1':
+        app.warm_up()
+    # Danach nimmt gc.freeze() die im Master angelegten Objekte von künftigen Durchläufen der
+    # Garbage Collection aus: deren Speicherseiten bleiben zwischen Master und Workern geteilt
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Threads überleben den fork nicht: jeder Worker startet seinen eigenen Datei-Watcher
+    # (Nachladen neuer Erhebungsjahre, Section 15 in app.py). Die Hilfsprozesse für
+    # rechenintensive Figuren (DASHBOARD_BUILD_PROCESSES, Section 5) entstehen davor, solange
+    # der Worker noch keine Threads hat.
+    import app
+    app.start_build_pool()
+    app.start_watcher()
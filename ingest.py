@@ -0,0 +1,213 @@
+"""
+-----------------------------------------------------------------------------------------
+Mikrodaten-Import (Out-of-Core)
+
+Liest Befragtendaten (eine Zeile pro Person, ';' getrennt) blockweise ein und reduziert sie
+auf die Aggregate, die app.py verwendet. Pro Block werden für jede Gruppe
+Jahr x Geschlecht x Alterskategorie und jeden Teilbereich Anzahl, Summe und Quadratsumme
+gebildet und aufsummiert. Der Speicherbedarf hängt damit nur von der Blockgrösse und der
+Anzahl Gruppen ab, nicht von der Grösse der Eingabedatei. Leere Dateien (oder nur Kopfzeile)
+werden mit ValueError abgewiesen.
+
+Mit --workers wird die Datei in Byte-Bereiche (an Zeilenenden ausgerichtet) aufgeteilt, die
+parallel in einem Prozess-Pool aggregiert werden. Die Teilergebnisse (Anzahlen und Summen)
+sind additiv und werden am Schluss zusammengezählt.
+
+Erwartete Spalten: Jahr, Geschlecht (Frauen/Männer), Alterskategorie, die Teilbereiche
+(Werte 0-10, leer oder '#NA' = keine Angabe) und optional eine Gewichtungsspalte.
+
+Ausgabe (im Zielverzeichnis):
+    means.csv      Mittelwerte im Format von Zufriedenheit_raw.csv (Alle, nach Geschlecht,
+                   nach Alterskategorie) - direkt von app.py ladbar
+    stats.csv      Anzahl, Mittelwert und Varianz pro Jahr, Gruppe und Teilbereich
+
+    python ingest.py mikrodaten.csv --out .cache/microdata --chunksize 250000 --workers 8
+"""
+import argparse
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLUMNS = ['Jahr', 'Geschlecht', 'Alterskategorie']
+VARIABLES = ['Allgemein', 'Finanzen', 'Alleinleben', 'Zusammenleben', 'Beziehungen',
+             'Gesundheit', 'Wohnsituation', 'Arbeitsbedingungen', 'Arbeitsklima']
+
+
+def csv_options(weight=None):
+    usecols = GROUP_COLUMNS + VARIABLES + ([weight] if weight else [])
+    dtype = {'Jahr': 'int16', 'Geschlecht': 'category', 'Alterskategorie': 'category'}
+    dtype.update({col: 'float32' for col in VARIABLES})
+    if weight:
+        dtype[weight] = 'float64'
+    return dict(sep=';', encoding='utf-8-sig', na_values=['#NA'], usecols=usecols, dtype=dtype)
+
+
+def read_chunks(path, chunksize, weight=None):
+    return pd.read_csv(path, chunksize=chunksize, **csv_options(weight))
+
+
+def split_ranges(path, parts):
+    # Byte-Bereiche nach der Kopfzeile, jeweils an einem Zeilenende ausgerichtet. Landet eine
+    # Grenze mitten in einer Zeile, gehört die Zeile noch zum vorderen Bereich.
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        bounds = [f.tell()]
+        sample = f.read(1 << 16)
+        row_bytes = len(sample) / max(sample.count(b'\n'), 1)
+        for i in range(1, parts):
+            f.seek(max(bounds[0] + (size - bounds[0]) * i // parts, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    ranges = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+    return header, ranges, row_bytes
+
+
+def read_range(path, start, stop, header, block_bytes, weight=None):
+    # Wie read_chunks, aber nur für die Zeilen zwischen den Byte-Positionen start und stop.
+    # Jeder Block wird bis zum nächsten Zeilenende verlängert und mit der Kopfzeile geparst.
+    with open(path, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < stop:
+            block = f.read(min(block_bytes, stop - position))
+            if position + len(block) < stop:
+                block += f.readline()
+            position += len(block)
+            yield pd.read_csv(io.BytesIO(header + block), **csv_options(weight))
+
+
+def chunk_aggregates(chunk, weight=None):
+    # Gruppen-Codes einmal pro Block, danach alle Summen per np.bincount (ohne Python-Schleife
+    # über Zeilen oder Gruppen)
+    chunk = chunk.dropna(subset=GROUP_COLUMNS)
+    grouped = chunk.groupby(GROUP_COLUMNS, observed=True, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    index = grouped.size().index
+    n_groups = len(index)
+
+    w = np.ones(len(chunk)) if weight is None else chunk[weight].to_numpy(dtype=float)
+    moments = {}
+    for var in VARIABLES:
+        values = chunk[var].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        v, c, wv = values[valid], codes[valid], w[valid]
+        moments['n', var] = np.bincount(c, weights=wv, minlength=n_groups)
+        moments['sum', var] = np.bincount(c, weights=wv * v, minlength=n_groups)
+        moments['sumsq', var] = np.bincount(c, weights=wv * v * v, minlength=n_groups)
+
+    return pd.DataFrame(moments, index=index)
+
+
+def combine(parts):
+    moments = None
+    for part in parts:
+        moments = part if moments is None else moments.add(part, fill_value=0)
+    return moments
+
+
+def aggregate_range(path, start, stop, header, block_bytes, weight=None):
+    return combine(chunk_aggregates(chunk, weight)
+                   for chunk in read_range(path, start, stop, header, block_bytes, weight))
+
+
+def aggregate(path, chunksize=250_000, weight=None, workers=1):
+    if os.path.getsize(path) == 0:
+        raise ValueError(f'Mikrodaten {path}: leere Datei')
+    if workers <= 1:
+        moments = combine(chunk_aggregates(chunk, weight) for chunk in read_chunks(path, chunksize, weight))
+    else:
+        # Mehr Bereiche als Prozesse, damit ungleich schnelle Bereiche die Last nicht blockieren
+        header, ranges, row_bytes = split_ranges(path, workers * 4)
+        block_bytes = max(int(chunksize * row_bytes), 1 << 16)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(aggregate_range, path, start, stop, header, block_bytes, weight)
+                       for start, stop in ranges]
+            moments = combine(future.result() for future in futures)
+    # Nur Kopfzeile oder keine Zeile mit vollständiger Gruppe (Jahr, Geschlecht, Alterskategorie)
+    if moments is None or moments.empty:
+        raise ValueError(f'Mikrodaten {path}: keine Befragten mit Jahr, Geschlecht und Alterskategorie')
+    return moments
+
+
+def marginals(table):
+    # Dieselben drei Sichten wie in Zufriedenheit_raw.csv: Gesamtbevölkerung ('Alle'),
+    # nach Geschlecht (Alterskategorie '#NA') und nach Alterskategorie (Geschlecht '#NA')
+    total = table.groupby(level='Jahr').sum()
+    total.index = pd.MultiIndex.from_arrays([total.index, ['Alle'] * len(total), [None] * len(total)],
+                                            names=GROUP_COLUMNS)
+    by_sex = table.groupby(level=['Jahr', 'Geschlecht'], observed=True).sum()
+    by_sex.index = pd.MultiIndex.from_arrays([by_sex.index.get_level_values(0),
+                                              by_sex.index.get_level_values(1).astype(str),
+                                              [None] * len(by_sex)], names=GROUP_COLUMNS)
+    by_age = table.groupby(level=['Jahr', 'Alterskategorie'], observed=True).sum()
+    by_age.index = pd.MultiIndex.from_arrays([by_age.index.get_level_values(0),
+                                              [None] * len(by_age),
+                                              by_age.index.get_level_values(1).astype(str)],
+                                             names=GROUP_COLUMNS)
+    return pd.concat([total, by_sex, by_age])
+
+
+def summarize(moments):
+    n, total, sumsq = moments['n'], moments['sum'], moments['sumsq']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / n
+        variance = (sumsq - total * total / n) / (n - 1)
+    return n, mean, variance
+
+
+def write_outputs(moments, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    moments = marginals(moments)
+    n, mean, variance = summarize(moments)
+
+    means = mean.reset_index()[['Jahr', 'Alterskategorie', 'Geschlecht'] + VARIABLES]
+    means = means.sort_values('Jahr', ascending=False, kind='stable')
+    means.to_csv(os.path.join(out_dir, 'means.csv'), sep=';', index=False, na_rep='#NA',
+                 float_format='%.6f')
+
+    stats = pd.concat({'Anzahl': n.stack(), 'Mittelwert': mean.stack(), 'Varianz': variance.stack()},
+                      axis=1)
+    stats.index.names = GROUP_COLUMNS + ['Teilbereich']
+    stats.reset_index().to_csv(os.path.join(out_dir, 'stats.csv'), sep=';', index=False,
+                               na_rep='#NA', float_format='%.6f')
+    return os.path.join(out_dir, 'means.csv')
+
+
+def ensure_aggregates(path, out_dir, chunksize=250_000, weight=None, workers=1):
+    # Nur neu aggregieren, wenn sich die Mikrodaten (oder die Parameter) geändert haben
+    stat = os.stat(path)
+    source = {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+              'weight': weight}
+    meta_path = os.path.join(out_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            if json.load(f) == source:
+                return os.path.join(out_dir, 'means.csv')
+
+    means_path = write_outputs(aggregate(path, chunksize, weight, workers), out_dir)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(source, f)
+    return means_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mikrodaten blockweise zu Dashboard-Aggregaten reduzieren')
+    parser.add_argument('path', help='Mikrodaten-CSV (eine Zeile pro befragte Person)')
+    parser.add_argument('--out', default=os.path.join('.cache', 'microdata'), help='Zielverzeichnis')
+    parser.add_argument('--chunksize', type=int, default=250_000, help='Zeilen pro Block')
+    parser.add_argument('--weight', default=None, help='Name der Gewichtungsspalte (optional)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Anzahl Prozesse')
+    args = parser.parse_args()
+
+    means_path = ensure_aggregates(args.path, args.out, args.chunksize, args.weight, args.workers)
+    print(f'Aggregate geschrieben: {means_path}')
+
+
+if __name__ == '__main__':
+    main()
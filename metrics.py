@@ -0,0 +1,177 @@
+"""
+-----------------------------------------------------------------------------------------
+Laufzeit-Metriken (Prometheus-Textformat)
+
+Misst pro Grafik-Callback die Gesamtdauer und die Dauer der einzelnen Phasen:
+    filter      Zeilen aus dem Datenwürfel auswählen
+    aggregate   Mittelwerte, Histogramm-Bins, OLS-Koeffizienten
+    build       Plotly-Figur aufbauen
+    patch       dash.Patch mit den geänderten Teilen der Figur zusammenstellen
+    serialize   Rückgabe des Callbacks als JSON kodieren und die Antwort bauen (in Dash, nach
+                dem Callback; gemessen bis zum after_request-Hook observe_serialization)
+Verschachtelte Phasen werden exklusiv gezählt (die äussere Phase ohne die inneren). Dazu kommt
+die Grösse der Antwort in Bytes. app.py ergänzt Cache-Trefferquoten und Speicherverbrauch und
+stellt alles unter /metrics bereit.
+
+Ausgeschaltet (Standard, DASHBOARD_METRICS=0) werden weder Callbacks umhüllt noch Flask-Hooks
+registriert; stage() liefert einen gemeinsamen No-op-Kontextmanager.
+"""
+import bisect
+import contextlib
+import functools
+import os
+import resource
+import threading
+import time
+
+from flask import g
+
+ENABLED = os.environ.get('DASHBOARD_METRICS', '0') == '1'
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # Zählungen pro Bucket (nicht kumuliert), danach Summe
+                series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self, **extra):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            items = [(labels, list(series)) for labels, series in self.series.items()]
+        for labels, series in sorted(items):
+            base = _labels(zip(self.labels, labels), **extra)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append(f'{self.name}_bucket{_labels(zip(self.labels, labels), **extra, le=le)} {cumulative}')
+            lines.append(f'{self.name}_sum{base} {series[-1]!r}')
+            lines.append(f'{self.name}_count{base} {cumulative}')
+        return lines
+
+
+def _labels(pairs, **extra):
+    pairs = list(pairs) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+CALLBACK_SECONDS = Histogram('dashboard_callback_seconds', 'Gesamtdauer eines Callbacks',
+                             ['callback'], SECONDS_BUCKETS)
+STAGE_SECONDS = Histogram('dashboard_callback_stage_seconds', 'Dauer einer Phase innerhalb eines Callbacks',
+                          ['callback', 'stage'], SECONDS_BUCKETS)
+RESPONSE_BYTES = Histogram('dashboard_callback_response_bytes', 'Grösse der Callback-Antwort',
+                           ['callback'], BYTES_BUCKETS)
+
+_local = threading.local()
+_NULL = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ('name', 'start', 'children')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault('stack', [])
+        self.children = 0.0
+        self.start = time.perf_counter()
+        stack.append(self)
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        # Phasen ausserhalb eines Callbacks (z.B. Startfiguren beim Import) nicht erfassen
+        callback = getattr(_local, 'callback', None)
+        if callback is not None:
+            STAGE_SECONDS.observe(elapsed - self.children, callback, self.name)
+
+
+def stage(name):
+    return _Stage(name) if ENABLED else _NULL
+
+
+def instrument(func):
+    # Callback-Funktion umhüllen: Gesamtdauer messen und den Namen für stage() und die
+    # Antwortgrösse (observe_response) festhalten
+    if not ENABLED:
+        return func
+
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.callback = name
+        g.metrics_callback = name
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g.metrics_returned = time.perf_counter()
+            CALLBACK_SECONDS.observe(g.metrics_returned - start, name)
+            _local.callback = None
+
+    return wrapper
+
+
+def observe_serialization(response):
+    # Zeit vom Ende des Callbacks bis zur fertigen Antwort: Dash kodiert in dieser Zeit die
+    # Rückgabe (Figur bzw. Patch) als JSON. Ohne Update (204) gibt es nichts zu kodieren.
+    returned = g.get('metrics_returned')
+    if returned is not None and response.status_code == 200:
+        STAGE_SECONDS.observe(time.perf_counter() - returned, g.metrics_callback, 'serialize')
+    return response
+
+
+def observe_response(response):
+    name = g.get('metrics_callback')
+    if name is not None and not response.direct_passthrough:
+        RESPONSE_BYTES.observe(len(response.get_data()), name)
+    return response
+
+
+def process_memory():
+    # Aktueller RSS aus /proc (Linux), sonst nur das Maximum aus getrusage
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        rss = max_rss
+    return rss, max_rss
+
+
+def render(gauges=()):
+    # gauges: (Name, Typ, Beschreibung, [(Labels-Dict, Wert), ...]). Alle Reihen tragen die PID
+    # als Label 'worker', da unter gunicorn jeder Worker eigene Zähler hat.
+    lines = []
+    for histogram in (CALLBACK_SECONDS, STAGE_SECONDS, RESPONSE_BYTES):
+        lines += histogram.render(worker=os.getpid())
+    for name, kind, documentation, samples in gauges:
+        lines += [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+        lines += [f'{name}{_labels(labels.items())} {float(value)!r}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,77 @@
+"""
+-----------------------------------------------------------------------------------------
+Ergebnis-Cache vorwärmen (Deploy)
+
+Berechnet die Figuren von graph_1 bis graph_6 für alle Jahresbereiche (je nach Grafik für alle
+Teilbereiche bzw. Auswahlen von dropdown_2) sowie die Antworten der Aggregat-API und legt sie im
+gemeinsamen Ergebnis-Cache von app.py ab (DASHBOARD_RESULT_STORE, result_store.py). Die Worker
+finden danach schon beim ersten Aufruf jeder Einstellung ein fertiges Ergebnis, auch direkt
+nach einem Neustart. Bereits vorhandene Einträge des aktuellen Datenstands werden nur gelesen.
+
+Gleichzeitig laufende Worker stören nicht: fehlende Einträge werden mit Single-Flight
+berechnet, es rechnet also nie mehr als ein Prozess am selben Schlüssel.
+
+    DASHBOARD_RESULT_STORE=sqlite:///.cache/results.sqlite3 python prewarm_cache.py --graphs graph_1 graph_2
+"""
+import argparse
+import itertools
+import time
+
+import app
+
+API_ENDPOINTS = ('total', 'sex', 'age-groups')
+
+
+def prewarm_calls(graphs, subsets, api):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    ranges = [[lo, hi] for lo, hi in itertools.combinations_with_replacement(years, 2)]
+    variables = list(app.df.columns[3:])
+    if subsets:
+        selections = [list(subset) for n in range(1, len(variables))
+                      for subset in itertools.combinations(variables[1:], n)]
+    else:
+        selections = [[variable] for variable in variables[1:]] + [variables[1:]]
+
+    for graph, years_range in itertools.product(graphs, ranges):
+        func = getattr(app, graph.replace('graph_', 'update_graph_'))
+        if graph == 'graph_2':
+            for selection in [None] + selections:
+                yield func, (selection, years_range)
+        elif graph == 'graph_4':
+            for variable in variables:
+                yield func, (variable, years_range)
+        elif graph == 'graph_6':
+            for variable in variables:
+                yield func, (years_range, variable)
+        else:
+            yield func, (years_range,)
+    if api:
+        for endpoint, (lo, hi) in itertools.product(API_ENDPOINTS, ranges):
+            yield app.api_body, (endpoint, lo, hi, 'json', app.data_version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Figuren und Aggregate vorab in den gemeinsamen Ergebnis-Cache rechnen')
+    parser.add_argument('--graphs', nargs='+', default=['graph_1', 'graph_2', 'graph_3', 'graph_4', 'graph_5',
+                                                        'graph_6'])
+    parser.add_argument('--all-subsets', action='store_true',
+                        help='Graph 2: alle Auswahlkombinationen statt einzelner Teilbereiche und aller zusammen')
+    parser.add_argument('--no-api', action='store_true', help='Antworten der Aggregat-API nicht vorwärmen')
+    args = parser.parse_args()
+
+    if app.shared_store is None:
+        parser.error('DASHBOARD_RESULT_STORE ist nicht gesetzt (z.B. sqlite:///.cache/results.sqlite3)')
+
+    calls = list(prewarm_calls(args.graphs, args.all_subsets, not args.no_api))
+    start = time.perf_counter()
+    for i, (func, call_args) in enumerate(calls, 1):
+        func(*call_args)
+        if i % 500 == 0 or i == len(calls):
+            print(f'{i}/{len(calls)} ({i / (time.perf_counter() - start):.0f}/s)')
+    stats = app.shared_stats
+    print(f'Datenstand {app.data_version}: {stats.misses} berechnet, {stats.hits} bereits vorhanden, '
+          f'{stats.waits} von anderen Prozessen berechnet, {stats.errors} Fehler')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+-----------------------------------------------------------------------------------------
+Gemeinsamer Ergebnis-Cache (Worker- und Neustart-übergreifend)
+
+Speichert serialisierte Figuren und Aggregate von app.py ausserhalb des Prozesses, damit nicht
+jeder gunicorn-Worker dieselben Figuren selbst berechnet und nach einem Deploy nicht alles neu
+entsteht. Zwei Backends mit derselben (Redis-)Schnittstelle get/set/delete:
+    sqlite:///.cache/results.sqlite3   lokale Datei, von allen Workern eines Hosts geteilt;
+                                       Ablaufzeit pro Eintrag und Verdrängung der am längsten
+                                       nicht gelesenen Einträge ab max_bytes
+    redis://localhost:6379/0           Redis-kompatibler Server (pip install redis); Ablauf über
+                                       EX, Verdrängung über maxmemory/maxmemory-policy des Servers
+
+Werte sind Bytes, die app.py als JSON kodiert (Figuren über plotly.io, API-Antworten unverändert).
+Gelesene Einträge werden nur mit json.loads dekodiert, nie mit pickle: ein Eintrag im geteilten
+Server kann so keinen Code im Worker ausführen.
+
+cached() berechnet fehlende Einträge mit Single-Flight: Wer den Schlüssel nicht findet, setzt
+mit SET NX PX eine Sperre (lock:<Schlüssel>, kurze Ablaufzeit, Wert ist ein zufälliges Token)
+und rechnet; alle anderen Prozesse und Threads warten auf das Ergebnis statt dasselbe zu
+berechnen. Stirbt der Rechnende, läuft die Sperre nach lock_ttl ab; freigegeben wird sie nur,
+solange sie noch das eigene Token trägt. Sperren zählen in SQLite nicht zur Verdrängung nach
+Grösse. Für Redis empfiehlt sich maxmemory-policy allkeys-lru: volatile-ttl würde zuerst die
+Sperren verdrängen, die als einzige eine kurze Ablaufzeit haben. Fehler des Backends (Server
+nicht erreichbar, Datei gesperrt) werden protokolliert und es wird lokal gerechnet.
+"""
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'lock:'
+
+# Sperre nur löschen, wenn sie noch das eigene Token trägt (sonst ist sie abgelaufen und gehört
+# inzwischen einem anderen Prozess)
+RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+
+class SQLiteStore:
+    # Teilmenge der Redis-Befehle, die cached() braucht, auf einer SQLite-Datei (WAL-Modus,
+    # mehrere Prozesse lesen gleichzeitig). Verbindungen gibt es pro Prozess und Thread.
+    def __init__(self, path, max_bytes=256 * 2 ** 20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                       'expires REAL, size INTEGER NOT NULL, accessed REAL NOT NULL)')
+            db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            db.execute('CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires)')
+            # Gesamtgrösse per Trigger nachführen, statt sie bei jedem Schreiben zu summieren
+            db.execute('CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)')
+            db.execute('INSERT OR IGNORE INTO usage VALUES (0, 0)')
+            db.execute('CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries '
+                       'BEGIN UPDATE usage SET bytes = bytes + NEW.size; END')
+            db.execute('CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries '
+                       'BEGIN UPDATE usage SET bytes = bytes + NEW.size - OLD.size; END')
+            db.execute('CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries '
+                       'BEGIN UPDATE usage SET bytes = bytes - OLD.size; END')
+
+    def _connection(self):
+        # Nach einem fork (gunicorn preload_app) nicht die Verbindung des Masters verwenden
+        if getattr(self.local, 'pid', None) != os.getpid():
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self.local.db, self.local.pid = db, os.getpid()
+        return self.local.db
+
+    def get(self, name):
+        db = self._connection()
+        now = time.time()
+        row = db.execute('SELECT value, expires, accessed FROM entries WHERE key = ?', (name,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= now):
+            return None
+        # Lesezeit nur grob nachführen (Verdrängung nach Alter), damit nicht jeder Treffer schreibt
+        if now - row[2] > 60:
+            db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, name))
+        return row[0]
+
+    def set(self, name, value, ex=None, px=None, nx=False):
+        db = self._connection()
+        now = time.time()
+        expires = now + px / 1000 if px else now + ex if ex else None
+        with db:
+            db.execute('BEGIN IMMEDIATE')
+            if nx:
+                db.execute('DELETE FROM entries WHERE key = ? AND expires <= ?', (name, now))
+                inserted = db.execute('INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?)',
+                                      (name, value, expires, len(value), now)).rowcount
+                return inserted == 1
+            db.execute('INSERT INTO entries VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value, '
+                       'expires = excluded.expires, size = excluded.size, accessed = excluded.accessed',
+                       (name, value, expires, len(value), now))
+            self._evict(db, now)
+        return True
+
+    def delete(self, *names):
+        db = self._connection()
+        with db:
+            return db.execute(f"DELETE FROM entries WHERE key IN ({','.join('?' * len(names))})", names).rowcount
+
+    def delete_if_equal(self, name, value):
+        db = self._connection()
+        with db:
+            return db.execute('DELETE FROM entries WHERE key = ? AND value = ?', (name, value)).rowcount
+
+    def _evict(self, db, now):
+        # Abgelaufene Einträge und, über max_bytes, die am längsten nicht gelesenen entfernen
+        # (Sperren laufen nur ab)
+        db.execute('DELETE FROM entries WHERE expires <= ?', (now,))
+        while db.execute('SELECT bytes FROM usage').fetchone()[0] > self.max_bytes:
+            if not db.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries WHERE key NOT LIKE ? '
+                              'ORDER BY accessed LIMIT 64)', (LOCK_PREFIX + '%',)).rowcount:
+                break
+
+    def usage(self):
+        db = self._connection()
+        count, size = db.execute('SELECT COUNT(*), (SELECT bytes FROM usage) FROM entries').fetchone()
+        return {'entries': count, 'bytes': size, 'max_bytes': self.max_bytes}
+
+
+def connect(url, max_bytes=256 * 2 ** 20):
+    parts = urlsplit(url)
+    if parts.scheme == 'sqlite':
+        return SQLiteStore(url[len('sqlite:///'):], max_bytes=max_bytes)
+    if parts.scheme in ('redis', 'rediss', 'unix'):
+        import redis
+
+        return redis.Redis.from_url(url)
+    raise ValueError(f'Unbekanntes Cache-Backend: {url} (sqlite:///Pfad oder redis://host:port/db)')
+
+
+class Stats:
+    def __init__(self):
+        self.hits = self.misses = self.waits = self.errors = 0
+
+
+def release(store, name, token):
+    if isinstance(store, SQLiteStore):
+        return store.delete_if_equal(name, token)
+    return store.eval(RELEASE_SCRIPT, 1, name, token)
+
+
+def encode_json(value):
+    return json.dumps(value).encode()
+
+
+def cached(store, key, compute, ttl, stats=None, lock_ttl=30, poll=0.05, encode=encode_json, decode=json.loads):
+    # encode/decode: Ergebnis <-> Bytes; decode darf keinen Code ausführen (kein pickle)
+    stats = stats or Stats()
+    lock, token = LOCK_PREFIX + key, secrets.token_hex(16).encode()
+    try:
+        value = store.get(key)
+        if value is not None:
+            stats.hits += 1
+            return decode(value)
+        stats.misses += 1
+        # Single-Flight: nur wer die Sperre bekommt rechnet, alle anderen warten auf sein Ergebnis
+        owner = store.set(lock, token, px=int(lock_ttl * 1000), nx=True)
+        deadline = time.monotonic() + lock_ttl
+        while not owner:
+            time.sleep(poll)
+            value = store.get(key)
+            if value is not None:
+                stats.waits += 1
+                return decode(value)
+            if time.monotonic() > deadline:
+                break
+            owner = store.set(lock, token, px=int(lock_ttl * 1000), nx=True)
+    except Exception:
+        stats.errors += 1
+        logger.exception('Ergebnis-Cache nicht verfügbar, berechne lokal')
+        return compute()
+
+    try:
+        result = compute()
+        try:
+            store.set(key, encode(result), ex=ttl)
+        except Exception:
+            stats.errors += 1
+            logger.exception('Ergebnis konnte nicht gespeichert werden')
+        return result
+    finally:
+        if owner:
+            try:
+                release(store, lock, token)
+            except Exception:
+                stats.errors += 1
@@ -0,0 +1,52 @@
+"""
+Testumgebung für app.py
+
+app.py liest seine Einstellungen beim Import. Die Tests importieren es deshalb einmal mit einer
+Kopie des Datensatzes ohne das letzte Erhebungsjahr, einem eigenen Cache-Verzeichnis und
+aktiviertem Nachladen (Admin-Token), damit test_reload.py das fehlende Jahr nachtragen und das
+Ergebnis mit einem frischen Start vergleichen kann. Erwartete Werte werden in den Tests immer
+direkt mit pandas bzw. NumPy aus app.df nachgerechnet.
+
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(ROOT, 'assets', 'Zufriedenheit_raw.csv')
+WORK_DIR = tempfile.mkdtemp(prefix='dashboard-tests-')
+DATA_PATH = os.path.join(WORK_DIR, 'Zufriedenheit_raw.csv')
+
+
+def source_lines():
+    with open(SOURCE_PATH, encoding='utf-8-sig') as f:
+        return f.read().splitlines()
+
+
+LAST_YEAR = max(int(line.split(';')[0]) for line in source_lines()[1:])
+
+
+def write_source(exclude_years=()):
+    # Quelldatei im selben Format (BOM, ';', '#NA') schreiben, ohne die angegebenen Jahre
+    lines = [line for line in source_lines() if line.split(';')[0] not in {str(y) for y in exclude_years}]
+    with open(DATA_PATH, 'w', encoding='utf-8-sig') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+write_source(exclude_years=[LAST_YEAR])
+os.environ.update(DASHBOARD_DATA_PATH=DATA_PATH,
+                  DASHBOARD_CACHE_DIR=os.path.join(WORK_DIR, '.cache'),
+                  DASHBOARD_ADMIN_TOKEN='test-token')
+for name in ('DASHBOARD_RESULT_STORE', 'DASHBOARD_RELOAD_INTERVAL', 'DASHBOARD_CLIENTSIDE_FILTERING',
+             'DASHBOARD_MICRODATA_PATH', 'DASHBOARD_BUILD_PROCESSES'):
+    os.environ.pop(name, None)
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def app():
+    import app as dashboard
+    return dashboard
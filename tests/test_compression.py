@@ -0,0 +1,43 @@
+"""
+Komprimierung der Antworten (Section 17): der Speicher komprimierter Dateien bleibt begrenzt
+"""
+import gzip
+import re
+
+import pytest
+from dash.fingerprint import build_fingerprint, check_fingerprint
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    if app.COMPRESS_MIN_SIZE <= 0:
+        pytest.skip('Komprimierung abgeschaltet (DASHBOARD_COMPRESS_MIN_SIZE=0)')
+    monkeypatch.setattr(app, 'compressed_static', {})
+    return app.server.test_client()
+
+
+def test_api_responses_are_not_memoized(app, client):
+    for cb in range(20):
+        response = client.get(f'/api/v1/total?years=2008-2015&cb={cb}', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+    assert app.compressed_static == {}
+
+
+def bundle_path(app, client):
+    # Ein Dash-Bundle der Startseite, gross genug für die Komprimierung (Pfad ohne Fingerprint)
+    for src in re.findall(r'<script src="([^"?]+)', client.get('/').get_data(as_text=True)):
+        path, fingerprinted = check_fingerprint(src)
+        if (fingerprinted and path.startswith(app.STATIC_PREFIXES)
+                and len(client.get(path).get_data()) >= app.COMPRESS_MIN_SIZE):
+            return path
+    pytest.fail('Kein Dash-Bundle auf der Startseite gefunden')
+
+
+def test_fingerprint_variants_share_one_entry(app, client):
+    path = bundle_path(app, client)
+    plain = client.get(path).get_data()
+    for n in (1, 2, 3):
+        response = client.get(build_fingerprint(path, f'0.0.{n}', n) + '?cb=1', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.get_data()) == plain
+    assert len(app.compressed_static) == 1
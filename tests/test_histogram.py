@@ -0,0 +1,37 @@
+"""
+Histogramm-Index von Graph 4 (HistogramBins) gegen np.histogram über die gefilterten Zeilen
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+
+def rows(app, key, min_year, max_year):
+    frame = app.df
+    mask = ((frame['Geschlecht'] == key[0]) & frame['Alterskategorie'].isna()
+            & frame['Jahr'].between(min_year, max_year))
+    return frame[mask]
+
+
+def year_ranges(app, step=3):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    return [list(pair) for pair in itertools.combinations_with_replacement(years[::step] + years[-1:], 2)]
+
+
+@pytest.mark.parametrize('variable', ['Allgemein', 'Finanzen', 'Arbeitsklima'])
+def test_edges_span_all_years(app, variable):
+    values = np.concatenate([rows(app, key, 0, 9999)[variable].dropna().to_numpy() for key in app.SEX_KEYS])
+    np.testing.assert_array_equal(app.histogram_bins.edges[variable], np.histogram_bin_edges(values, bins='auto'))
+
+
+@pytest.mark.parametrize('variable', ['Allgemein', 'Finanzen', 'Arbeitsklima'])
+def test_counts_match_numpy(app, variable):
+    edges = app.histogram_bins.edges[variable]
+    for min_year, max_year in year_ranges(app):
+        for key in app.SEX_KEYS:
+            expected, _ = np.histogram(rows(app, key, min_year, max_year)[variable].dropna(), bins=edges)
+            np.testing.assert_array_equal(app.histogram_bins.counts(variable, key, min_year, max_year), expected)
+        values = np.concatenate([rows(app, key, min_year, max_year)[variable].dropna().to_numpy()
+                                 for key in app.SEX_KEYS])
+        assert app.histogram_bins.value_range(variable, min_year, max_year) == (values.min(), values.max())
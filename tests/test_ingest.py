@@ -0,0 +1,57 @@
+"""
+Mikrodaten-Import (ingest.py): Mittelwerte gegen pandas groupby, leere Dateien werden abgewiesen
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+
+SEXES = ['Frauen', 'Männer']
+AGES = ['18-24 Jahre', '25-49 Jahre', '65 Jahre +']
+
+
+@pytest.fixture
+def microdata(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5000
+    frame = pd.DataFrame({'Jahr': rng.integers(2015, 2020, n), 'Geschlecht': rng.choice(SEXES, n),
+                          'Alterskategorie': rng.choice(AGES, n)})
+    for var in ingest.VARIABLES:
+        values = np.clip(np.rint(rng.normal(8, 1.5, n)), 0, 10)
+        values[rng.random(n) < 0.05] = np.nan
+        frame[var] = values
+    path = tmp_path / 'mikrodaten.csv'
+    frame.to_csv(path, sep=';', index=False, na_rep='#NA', float_format='%.0f')
+    return str(path), frame
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_means_match_groupby(microdata, tmp_path, workers):
+    path, frame = microdata
+    out = tmp_path / f'out-{workers}'
+    means = pd.read_csv(ingest.write_outputs(ingest.aggregate(path, chunksize=700, workers=workers), str(out)),
+                        sep=';', na_values=['#NA'])
+    assert sorted(os.listdir(out)) == ['means.csv', 'stats.csv']
+
+    views = {'Alle': frame.groupby('Jahr')[ingest.VARIABLES].mean()}
+    for sex, group in frame.groupby('Geschlecht'):
+        views[sex] = group.groupby('Jahr')[ingest.VARIABLES].mean()
+    rows = means[means['Alterskategorie'].isna()].set_index(['Geschlecht', 'Jahr'])
+    for label, expected in views.items():
+        np.testing.assert_allclose(rows.loc[label].sort_index()[ingest.VARIABLES], expected, atol=1e-6)
+
+    by_age = frame.groupby(['Alterskategorie', 'Jahr'])[ingest.VARIABLES].mean()
+    rows = means[means['Geschlecht'].isna()].set_index(['Alterskategorie', 'Jahr']).sort_index()
+    np.testing.assert_allclose(rows[ingest.VARIABLES], by_age, atol=1e-6)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('content', ['', ';'.join(ingest.GROUP_COLUMNS + ingest.VARIABLES) + '\n'])
+def test_empty_microdata_is_rejected(tmp_path, workers, content):
+    path = tmp_path / 'leer.csv'
+    path.write_text(content, encoding='utf-8')
+    with pytest.raises(ValueError, match='Mikrodaten'):
+        ingest.aggregate(str(path), workers=workers)
@@ -0,0 +1,136 @@
+"""
+Hintergrund-Jobs (Section 5 und 6): Starten, Zusammenlegen, Abbrechen, Fehler und Fortschrittsbalken
+"""
+import time
+
+import pytest
+
+import result_store
+
+
+@pytest.fixture
+def jobs(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'job_store', result_store.SQLiteStore(str(tmp_path / 'jobs.sqlite3')))
+    return app
+
+
+def wait(app, job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, value = app.job_status(job)
+        if status != 'running':
+            return status, value
+        time.sleep(0.02)
+    raise AssertionError(f'Job {job} läuft noch')
+
+
+def slow(steps):
+    import app
+
+    for i in range(steps):
+        app.job_progress(i, steps)
+        time.sleep(0.02)
+    return {'steps': steps}
+
+
+def failing():
+    raise ValueError('kaputt')
+
+
+def test_submit_and_attach(jobs):
+    args = (['Finanzen', 'Gesundheit'], [2010, 2015])
+    job, owner = jobs.submit_job(jobs.update_graph_2, args)
+    assert owner
+    assert jobs.submit_job(jobs.update_graph_2, args) == (job, False)
+    assert wait(jobs, job) == ('done', jobs.update_graph_2.__wrapped__(*args))
+    # Fertiger Job: weitere Sitzungen holen das Ergebnis ab, statt neu zu rechnen
+    assert jobs.submit_job(jobs.update_graph_2, args) == (job, False)
+
+
+def test_progress_and_cancel(jobs):
+    job, owner = jobs.submit_job(slow, (200,))
+    deadline = time.monotonic() + 5
+    while jobs.job_status(job) == ('running', [0, 1]) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    status, (done, total) = jobs.job_status(job)
+    assert status == 'running' and total == 200 and 0 <= done < 200
+    jobs.cancel_job(job)
+    assert wait(jobs, job) == ('lost', None)
+    # Neu gestartet läuft er wieder bis zum Ende
+    assert jobs.submit_job(slow, (200,)) == (job, True)
+    assert wait(jobs, job) == ('done', {'steps': 200})
+
+
+def test_long_job_stays_alive_while_reporting(jobs, monkeypatch):
+    # Läuft länger als JOB_TIMEOUT, meldet aber laufend Fortschritt
+    monkeypatch.setattr(jobs, 'JOB_TIMEOUT', 0.3)
+    job, _ = jobs.submit_job(slow, (40,))
+    assert wait(jobs, job) == ('done', {'steps': 40})
+
+
+def test_failed_and_lost_jobs(jobs):
+    job, _ = jobs.submit_job(failing, ())
+    assert wait(jobs, job) == ('error', None)
+    assert jobs.job_status('job:unbekannt') == ('lost', None)
+
+
+def graph_2_request(selection):
+    return {'output': ('..graph_2.figure...selection_2.data...job_2.data...poll_2.disabled'
+                       '...progress_2.value...progress_2.style..'),
+            'outputs': [{'id': 'graph_2', 'property': 'figure'}, {'id': 'selection_2', 'property': 'data'},
+                        {'id': 'job_2', 'property': 'data'}, {'id': 'poll_2', 'property': 'disabled'},
+                        {'id': 'progress_2', 'property': 'value'}, {'id': 'progress_2', 'property': 'style'}],
+            'inputs': [{'id': 'dropdown_2', 'property': 'value', 'value': selection},
+                       {'id': 'slider_1', 'property': 'value', 'value': [2010, 2015]}],
+            'state': [{'id': 'selection_2', 'property': 'data', 'value': None},
+                      {'id': 'job_2', 'property': 'data', 'value': None}],
+            'changedPropIds': ['dropdown_2.value']}
+
+
+def poll_request(app, running, selection):
+    output = next(key for key, spec in app.app.callback_map.items()
+                  if spec['inputs'] == [{'id': 'poll_2', 'property': 'n_intervals'}])
+    outputs = [dict(zip(('id', 'property'), part.split('.', 1))) for part in output.strip('.').split('...')]
+    return {'output': output, 'outputs': outputs,
+            'inputs': [{'id': 'poll_2', 'property': 'n_intervals', 'value': 1}],
+            'state': [{'id': 'job_2', 'property': 'data', 'value': running},
+                      {'id': 'dropdown_2', 'property': 'value', 'value': selection},
+                      {'id': 'slider_1', 'property': 'value', 'value': [2010, 2015]}],
+            'changedPropIds': ['poll_2.n_intervals']}
+
+
+@pytest.fixture
+def client(app, jobs, monkeypatch):
+    if app.CLIENTSIDE_FILTERING:
+        pytest.skip('Hintergrund-Jobs nur im Server-Modus')
+    monkeypatch.setattr(app, 'BACKGROUND_POINTS', 1)
+    app.figure_cache.clear()
+    return app.server.test_client()
+
+
+def test_progress_bar_follows_the_request(app, client):
+    selection = ['Finanzen', 'Wohnsituation']
+    response = client.post('/_dash-update-component', json=graph_2_request(selection)).get_json()['response']
+    assert response['progress_2'] == {'value': 0, 'style': {}}
+    assert response['poll_2'] == {'disabled': False}
+    running = response['job_2']['data']
+    wait(app, running['id'])
+
+    response = client.post('/_dash-update-component', json=poll_request(app, running, selection)).get_json()['response']
+    assert response['progress_2'] == {'value': 100, 'style': {'display': 'none'}}
+    assert response['graph_2']['figure'] == app.update_graph_2.__wrapped__(selection, [2010, 2015])
+
+    # Direkt berechnet (hier: keine Auswahl) blendet den Balken eines früheren Jobs aus
+    response = client.post('/_dash-update-component', json=graph_2_request([])).get_json()['response']
+    assert response['progress_2'] == {'value': 0, 'style': {'display': 'none'}}
+    assert response['job_2'] == {'data': None}
+
+
+def test_failed_job_replaces_the_figure(app, client):
+    selection = ['Finanzen']
+    running = {'id': app.job_id('update_graph_2', (selection, [2010, 2015])), 'owner': True}
+    app.jobs().set(running['id'] + ':error', b'1', ex=60)
+    response = client.post('/_dash-update-component', json=poll_request(app, running, selection)).get_json()['response']
+    assert response['graph_2']['figure'] == app.message_figure(app.JOB_FAILED)
+    assert response['selection_2'] == {'data': None}
+    assert response['progress_2']['style'] == {'display': 'none'}
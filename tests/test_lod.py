@@ -0,0 +1,88 @@
+"""
+Level of Detail (Section 7): lttb und minmax gegen eine direkte Nachrechnung mit NumPy/pandas
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def series(size, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(2007, 2023, size)
+    y = 8 + 0.15 * np.sin(2 * np.pi * x) + rng.normal(0, 0.03, size)
+    y[rng.choice(size, 5, replace=False)] += 0.5
+    return x, y
+
+
+@pytest.mark.parametrize('size, points', [(1000, 50), (10_007, 800), (5, 3)])
+def test_lttb_keeps_largest_triangle_per_bucket(app, size, points):
+    x, y = series(size)
+    keep = app.lttb(x, y, points)
+    assert len(keep) == points
+    assert keep[0] == 0 and keep[-1] == size - 1
+    assert np.all(np.diff(keep) > 0)
+
+    # Jeder Bucket behält den Punkt mit der grössten Dreiecksfläche zum zuvor behaltenen Punkt und
+    # zum Mittelwert des nächsten Buckets
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    bounds = list(zip(edges[:-1], edges[1:])) + [(size - 1, size)]
+    for i, (lo, hi) in enumerate(bounds[:-1]):
+        next_lo, next_hi = bounds[i + 1]
+        next_x, next_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        prev = keep[i]
+        areas = [abs((x[prev] - next_x) * (y[j] - y[prev]) - (x[prev] - x[j]) * (next_y - y[prev]))
+                 for j in range(lo, hi)]
+        assert keep[i + 1] == lo + int(np.argmax(areas))
+
+
+@pytest.mark.parametrize('size, points', [(1000, 50), (10_007, 800), (7, 4)])
+def test_minmax_keeps_bucket_extremes(app, size, points):
+    x, y = series(size, seed=1)
+    keep = app.minmax(x, y, points)
+    assert keep[0] == 0 and keep[-1] == size - 1
+    assert np.all(np.diff(keep) > 0)
+    assert len(keep) <= points + 2
+
+    buckets = np.linspace(0, size, max(points // 2, 1), endpoint=False).astype(int)
+    frame = pd.DataFrame({'y': y, 'bucket': np.searchsorted(buckets, np.arange(size), side='right')})
+    expected = frame.groupby('bucket')['y'].agg(['idxmin', 'idxmax'])
+    assert set(expected['idxmin']) | set(expected['idxmax']) | {0, size - 1} == set(keep)
+    assert np.argmax(y) in keep and np.argmin(y) in keep
+
+
+def test_level_of_detail_passes_short_series_through(app, monkeypatch):
+    monkeypatch.setattr(app, 'LOD_POINTS', 100)
+    x, y = series(100)
+    xs, ys = app.level_of_detail(x, y)
+    assert xs is x and ys is y
+
+    # Die Jahreswerte des Datensatzes bleiben unverändert
+    rows = app.cube.select(app.TOTAL_KEYS, app.df['Jahr'].min(), app.df['Jahr'].max())
+    xs, ys = app.level_of_detail(rows['Jahr'].to_numpy(), rows['Allgemein'].to_numpy())
+    assert len(rows) > 0
+    np.testing.assert_array_equal(xs, rows['Jahr'].to_numpy())
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_level_of_detail_skips_missing_values(app, monkeypatch, method):
+    monkeypatch.setattr(app, 'LOD_POINTS', 100)
+    monkeypatch.setattr(app, 'LOD_METHOD', method)
+    x, y = series(2000)
+    y[::7] = np.nan
+    xs, ys = app.level_of_detail(x, y)
+    assert len(xs) <= 102 and not np.isnan(ys).any()
+    assert xs[0] == x[1] and xs[-1] == x[-1]
+    valid = ~np.isnan(y)
+    assert np.isin(xs, x[valid]).all()
+    if method == 'minmax':
+        assert np.nanmax(y) in ys and np.nanmin(y) in ys
+
+
+def test_zoom_callback_only_for_compressed_series(app, monkeypatch):
+    longest = max(len(app.cube.groups[key][1]) for key in app.TOTAL_KEYS)
+    monkeypatch.setattr(app, 'LOD_POINTS', longest)
+    assert not app.zoom_needed(lambda: app.TOTAL_KEYS)
+    monkeypatch.setattr(app, 'LOD_POINTS', longest - 1)
+    assert app.zoom_needed(lambda: app.TOTAL_KEYS)
+    monkeypatch.setattr(app, 'LOD_POINTS', 0)
+    assert not app.zoom_needed(lambda: app.TOTAL_KEYS)
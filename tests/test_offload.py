@@ -0,0 +1,51 @@
+"""
+Hilfsprozesse für den Figurenaufbau (offload): ein gestorbener oder hängender Hilfsprozess legt
+Graph 2 nicht lahm, der Worker baut danach selbst (kein neuer fork zur Laufzeit)
+"""
+import os
+import signal
+import time
+
+import pytest
+
+
+def hang(parent):
+    # Nur im Hilfsprozess hängen, im Worker sofort fertig
+    if os.getpid() != parent:
+        time.sleep(30)
+    return os.getpid()
+
+
+@pytest.fixture
+def build_pool(app, monkeypatch):
+    monkeypatch.setattr(app, 'BUILD_PROCESSES', 1)
+    monkeypatch.setitem(app.OFFLOADED, 'hang', hang)
+    app.start_build_pool()
+    pool = app.build_pool
+    processes = list(pool._processes.values())  # mit fork alle schon beim Start angelegt
+    yield pool
+    for process in processes:
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+    app.build_pool = None
+
+
+def test_dead_build_process_builds_inline(app, build_pool):
+    build = app.update_graph_2.__wrapped__  # offload ohne Figure-Cache
+    expected = build.__wrapped__(['Finanzen'], [2010, 2015])
+    assert build(['Finanzen'], [2010, 2015]) == expected
+
+    for pid in list(build_pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    time.sleep(0.2)
+    assert build(['Finanzen'], [2010, 2015]) == expected
+    assert app.build_pool is None
+    assert build(['Gesundheit'], [2010, 2015]) == build.__wrapped__(['Gesundheit'], [2010, 2015])
+
+
+def test_hanging_build_process_times_out(app, build_pool, monkeypatch):
+    monkeypatch.setattr(app, 'BUILD_TIMEOUT', 0.5)
+    start = time.monotonic()
+    assert app.offload(hang)(os.getpid()) == os.getpid()
+    assert time.monotonic() - start < 5
+    assert app.build_pool is None
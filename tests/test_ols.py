@@ -0,0 +1,43 @@
+"""
+OLS-Trendlinien in Graph 2 (ols_fits): Steigung, Achsenabschnitt und R² gegen np.polyfit bzw.
+statsmodels (wie plotly.express bei trendline='ols') für jeden Teilbereich und Jahresbereich
+"""
+import numpy as np
+import pytest
+
+
+def year_ranges(app):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    return [(lo, hi) for lo in years for hi in years if hi - lo >= 2]
+
+
+def pairs(app, min_year, max_year, variable):
+    frame = app.cube.select(app.SEX_KEYS, min_year, max_year)[[variable, 'Allgemein']].dropna()
+    return frame[variable].to_numpy(dtype=float), frame['Allgemein'].to_numpy(dtype=float)
+
+
+def test_ols_fits_match_polyfit(app):
+    variables = list(app.df.columns[4:])
+    for min_year, max_year in year_ranges(app):
+        fits = app.ols_fits(min_year, max_year)
+        assert set(fits) == set(variables)
+        for variable in variables:
+            x, y = pairs(app, min_year, max_year, variable)
+            slope, intercept = np.polyfit(x, y, 1)
+            fit = fits[variable]
+            assert fit['n'] == len(x)
+            np.testing.assert_allclose([fit['slope'], fit['intercept']], [slope, intercept], rtol=1e-9, atol=1e-9,
+                                       err_msg=f'{variable} {min_year}-{max_year}')
+            np.testing.assert_allclose(fit['r2'], np.corrcoef(x, y)[0, 1] ** 2, rtol=1e-9, atol=1e-12)
+
+
+def test_ols_fits_match_statsmodels(app):
+    sm = pytest.importorskip('statsmodels.api')
+    for min_year, max_year in year_ranges(app):
+        fits = app.ols_fits(min_year, max_year)
+        for variable, fit in fits.items():
+            x, y = pairs(app, min_year, max_year, variable)
+            result = sm.OLS(y, sm.add_constant(x)).fit()
+            np.testing.assert_allclose([fit['intercept'], fit['slope'], fit['r2']],
+                                       [result.params[0], result.params[1], result.rsquared], rtol=1e-9, atol=1e-9,
+                                       err_msg=f'{variable} {min_year}-{max_year}')
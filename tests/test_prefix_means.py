@@ -0,0 +1,55 @@
+"""
+Präfixsummen von Graph 6 (PrefixMeans) und /api/v1/age-groups gegen df.groupby().mean()
+"""
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+
+def age_rows(app, min_year, max_year):
+    frame = app.df
+    return frame[frame['Geschlecht'].isna() & frame['Alterskategorie'].notna()
+                 & frame['Jahr'].between(min_year, max_year)]
+
+
+def expected_means(app, variable, min_year, max_year):
+    means = age_rows(app, min_year, max_year).groupby('Alterskategorie', observed=False)[variable].mean()
+    return means.reindex([key[1] for key in app.AGE_KEYS]).to_numpy(dtype=float)
+
+
+def all_ranges(app):
+    years = sorted(int(year) for year in app.df['Jahr'].unique())
+    return list(itertools.combinations_with_replacement(years, 2))
+
+
+@pytest.mark.parametrize('variable', ['Allgemein', 'Finanzen', 'Alleinleben', 'Arbeitsklima'])
+def test_means_match_groupby(app, variable):
+    for min_year, max_year in all_ranges(app):
+        means = app.age_means.means(variable, app.AGE_KEYS, min_year, max_year)
+        expected = expected_means(app, variable, min_year, max_year)
+        if min_year == max_year:
+            # Ein einzelnes Jahr: genau der Wert aus der Quelldatei, ohne Rundungsrauschen
+            np.testing.assert_array_equal(means, expected)
+        else:
+            # groupby summiert in Float und kann in der letzten Stelle abweichen
+            np.testing.assert_allclose(means, expected, rtol=1e-15)
+
+
+def test_weighted_means_match_numpy(app):
+    prefix = app.PrefixMeans(app.cube, app.AGE_KEYS, ['Finanzen'], weights='Allgemein')
+    assert prefix.scale is None
+    for min_year, max_year in all_ranges(app)[::7]:
+        rows = age_rows(app, min_year, max_year).dropna(subset=['Finanzen'])
+        for key, mean in zip(app.AGE_KEYS, prefix.means('Finanzen', app.AGE_KEYS, min_year, max_year)):
+            group = rows[rows['Alterskategorie'] == key[1]]
+            expected = np.average(group['Finanzen'], weights=group['Allgemein']) if len(group) else np.nan
+            np.testing.assert_allclose(mean, expected, rtol=1e-12)
+
+
+def test_api_serves_source_values(app):
+    year = int(app.df['Jahr'].min())
+    body = json.loads(app.api_payload('age-groups', year, year, 'json', app.data_version))
+    for record, expected in zip(body['data'], expected_means(app, 'Allgemein', year, year)):
+        assert record['Allgemein'] == expected == round(expected, 3)
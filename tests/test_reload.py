@@ -0,0 +1,55 @@
+"""
+Nachladen eines neuen Erhebungsjahres (reload_data) gegen einen frischen Start auf derselben Datei
+"""
+import numpy as np
+import pytest
+
+import result_store
+
+from .conftest import LAST_YEAR, write_source
+
+
+@pytest.fixture
+def appended(app, tmp_path, monkeypatch):
+    # Figuren vor dem Nachladen in beide Caches legen, dann das letzte Jahr anhängen; danach
+    # wieder den Ausgangsstand herstellen (Neuaufbau, da ein Jahr wegfällt)
+    monkeypatch.setattr(app, 'result_store', result_store, raising=False)
+    monkeypatch.setattr(app, 'shared_store', result_store.connect(f"sqlite:///{tmp_path / 'results.sqlite3'}"))
+    monkeypatch.setattr(app, 'shared_stats', result_store.Stats())
+    before = {(var, tuple(years)): app.update_graph_4(var, years)
+              for var in app.df.columns[3:] for years in ([2010, 2015], [2008, LAST_YEAR - 1])}
+    write_source()
+    status = app.reload_data()
+    yield status, before
+    write_source(exclude_years=[LAST_YEAR])
+    assert app.reload_data()['status'] == 'rebuilt'
+
+
+def test_incremental_reload_matches_fresh_load(app, appended):
+    status, _ = appended
+    assert status['status'] == 'appended' and status['years'] == [LAST_YEAR]
+
+    fresh_bins = app.HistogramBins(app.DataCube(app.df), app.SEX_KEYS, app.df.columns[3:])
+    for var in fresh_bins.edges:
+        np.testing.assert_array_equal(app.histogram_bins.edges[var], fresh_bins.edges[var])
+        np.testing.assert_array_equal(app.histogram_bins.year_min[var], fresh_bins.year_min[var])
+        np.testing.assert_array_equal(app.histogram_bins.year_max[var], fresh_bins.year_max[var])
+        for key in app.SEX_KEYS:
+            np.testing.assert_array_equal(app.histogram_bins.cumulative[var, key], fresh_bins.cumulative[var, key])
+
+    fresh_means = app.PrefixMeans(app.DataCube(app.df), app.AGE_KEYS, app.df.columns[3:])
+    assert app.age_means.scale == fresh_means.scale
+    for key in app.AGE_KEYS:
+        np.testing.assert_array_equal(app.age_means.sums[key], fresh_means.sums[key])
+        np.testing.assert_array_equal(app.age_means.counts[key], fresh_means.counts[key])
+
+
+def test_no_stale_figures_after_reload(app, appended):
+    # Auch Jahresbereiche ohne das neue Jahr: ändern sich die Bin-Grenzen eines Teilbereichs,
+    # darf keine Figur mit den alten Grenzen mehr ausgeliefert werden
+    _, before = appended
+    for (var, years), _ in before.items():
+        assert app.update_graph_4(var, list(years)) == app.update_graph_4.__wrapped__(var, list(years))
+    rebinned = [var for (var, _), fig in before.items()
+                if fig['data'][0]['x'] != app.update_graph_4.__wrapped__(var, [2010, 2015])['data'][0]['x']]
+    assert rebinned, 'Testdaten sollten mindestens einen Teilbereich neu einteilen'
@@ -0,0 +1,107 @@
+"""
+Gemeinsamer Ergebnis-Cache (result_store.py): Single-Flight, Ablaufzeiten, Sperren und JSON
+"""
+import multiprocessing
+import pickle
+import threading
+import time
+
+import pytest
+
+import result_store
+
+
+@pytest.fixture
+def store(tmp_path):
+    return result_store.SQLiteStore(str(tmp_path / 'results.sqlite3'))
+
+
+def test_single_flight_threads(store):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'value': 42}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(result_store.cached(store, 'key', compute, 60)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{'value': 42}] * 8
+
+
+def compute_in_process(path, counter):
+    def compute():
+        with counter.get_lock():
+            counter.value += 1
+        time.sleep(0.2)
+        return [1, 2, 3]
+
+    assert result_store.cached(result_store.SQLiteStore(path), 'key', compute, 60) == [1, 2, 3]
+
+
+def test_single_flight_processes(store):
+    context = multiprocessing.get_context('fork')
+    counter = context.Value('i', 0)
+    processes = [context.Process(target=compute_in_process, args=(store.path, counter)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert counter.value == 1
+
+
+def test_entries_expire(store):
+    assert result_store.cached(store, 'key', lambda: 1, ttl=0.1) == 1
+    assert store.get('key') == b'1'
+    time.sleep(0.15)
+    assert store.get('key') is None
+    assert result_store.cached(store, 'key', lambda: 2, ttl=60) == 2
+
+
+def test_values_are_json(store):
+    result_store.cached(store, 'key', lambda: {'a': [1.5, None]}, 60)
+    assert store.get('key') == b'{"a": [1.5, null]}'
+
+    # Ein eingeschleuster pickle-Wert wird nicht geladen, sondern lokal neu gerechnet
+    store.set('other', pickle.dumps({'a': 1}), ex=60)
+    stats = result_store.Stats()
+    assert result_store.cached(store, 'other', lambda: 'computed', 60, stats) == 'computed'
+    assert stats.errors == 1
+
+
+def test_expired_lock_of_dead_owner(store):
+    # Sperre eines beendeten Prozesses: nach lock_ttl rechnet der Wartende selbst
+    store.set(result_store.LOCK_PREFIX + 'key', b'other', px=200, nx=True)
+    start = time.monotonic()
+    assert result_store.cached(store, 'key', lambda: 'own', 60, lock_ttl=5) == 'own'
+    assert 0.15 < time.monotonic() - start < 2
+
+
+def test_lock_released_only_by_owner(store):
+    lock = result_store.LOCK_PREFIX + 'key'
+    store.set(lock, b'token', px=60_000, nx=True)
+    assert result_store.release(store, lock, b'other') == 0
+    assert store.get(lock) == b'token'
+    assert result_store.release(store, lock, b'token') == 1
+    assert store.get(lock) is None
+
+    # Nach dem Rechnen bleibt keine Sperre zurück
+    result_store.cached(store, 'key', lambda: 1, 60)
+    assert store.get(lock) is None
+
+
+def test_locks_are_not_evicted_by_size(tmp_path):
+    store = result_store.SQLiteStore(str(tmp_path / 'small.sqlite3'), max_bytes=1000)
+    lock = result_store.LOCK_PREFIX + 'key'
+    store.set(lock, b'token', px=60_000, nx=True)
+    for i in range(20):
+        store.set(f'entry:{i}', b'x' * 200, ex=60)
+    assert store.get(lock) == b'token'
+    assert store.usage()['bytes'] <= 1000